@@ -14,30 +14,67 @@ class Suit(StrEnum):
     UNKNOWN = "U"
 
 
+# Dense key of every card face in deck order: 13 ranks for each suit, then 2 jokers
+KEYS: dict[tuple[Suit, int], int] = {
+    face: key
+    for key, face in enumerate(
+        [(suit, rank) for suit in list(Suit)[:4] for rank in range(1, 14)]
+        + [(Suit.JOKER, 1), (Suit.JOKER, 2)]
+    )
+}
+
+
+# Points of every card face, indexed by card key
+POINTS = tuple(5 if r == 5 else 10 if r == 10 or r == 13 else 0 for _, r in KEYS) + (0,)
+
+# Card codes pack the card id above the 6 bits holding its key
+KEY_BITS = 6
+
+
 class Card:
+    __slots__ = ("id", "suit", "rank", "key", "code")
+
+    # Process-wide flyweight table of interned cards, indexed by code
+    __interned: dict[int, "Card"] = {}
+
     def __init__(self, id: int, suit: Suit, rank: int) -> None:
         self.id = id
         self.suit = suit
         self.rank = rank
+        # Faces that are not in a deck are keyed past the end of all key tables
+        self.key = KEYS.get((suit, rank), len(KEYS))
+        self.code = id << KEY_BITS | self.key
 
     def __eq__(self, other: object) -> bool:
-        return (
-            isinstance(other, Card)
-            and self.id == other.id
-            and self.suit == other.suit
-            and self.rank == other.rank
-        )
+        return isinstance(other, Card) and self.code == other.code
+
+    def __hash__(self) -> int:
+        return self.code
 
     def __str__(self) -> str:
         return f"[ Card ({self.id}) - {self.suit} {self.rank} ]"
 
+    # Unpickled cards are interned, so snapshots of matches share the flyweights
+    def __reduce__(self) -> tuple:
+        return Card.intern, (self.id, self.suit, self.rank)
+
+    # Interned card shared by all games in the process
+    @classmethod
+    def intern(cls, id: int, suit: Suit, rank: int) -> Self:
+        code = id << KEY_BITS | KEYS.get((suit, rank), len(KEYS))
+        if (card := cls.__interned.get(code)) is None:
+            card = cls.__interned[code] = cls(id, suit, rank)
+        return card
+
+    # Interned card if one exists, cards from clients must not grow the table
+    @classmethod
+    def lookup(cls, id: int, suit: Suit, rank: int) -> Self:
+        code = id << KEY_BITS | KEYS.get((suit, rank), len(KEYS))
+        return cls.__interned.get(code) or cls(id, suit, rank)
+
     @property
     def points(self) -> int:
-        if self.rank == 5:
-            return 5
-        if self.rank == 10 or self.rank == 13:
-            return 10
-        return 0
+        return POINTS[self.key]
 
     def json(self, secret=False) -> dict:
         if secret:
@@ -45,7 +82,7 @@ class Card:
         return {"id": self.id, "suit": self.suit, "rank": self.rank}
 
     def matches(self, card: Self) -> bool:
-        return self.suit == card.suit and self.rank == card.rank
+        return self.key == card.key
 
 
 # HTTP
@@ -77,17 +114,21 @@ class CardsEvent(PlayerEvent):
     def __init__(self, sid: str, payload: dict) -> None:
         super().__init__(sid, payload)
         self.cards = [
-            Card(int(card["id"]), Suit(card["suit"]), int(card["rank"]))
+            Card.lookup(int(card["id"]), Suit(card["suit"]), int(card["rank"]))
             for card in payload["cards"]
         ]
 
 
 class Update(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def json(self, secret: bool = False) -> dict: ...
 
 
 class SocketUpdate:
+    __slots__ = ("name", "to", "info", "cast", "echo")
+
     def __init__(self, name: str, to: str, info: Update, cast=False, echo=True) -> None:
         self.name = name
         self.to = to
@@ -101,10 +142,16 @@ class SocketUpdate:
 
 class Room(ABC):
     def __init__(self, event: Event) -> None:
-        self.__room_id = event.match_id
+        # Socket.IO takes falsy rooms for no room, so match 0 must not be room 0
+        self.__room_id = Room.name(event.match_id)
         self.__sid = event.sid
         self.__updates: list[SocketUpdate] = []
 
+    # Socket.IO room of the match
+    @staticmethod
+    def name(match_id: int) -> str:
+        return str(match_id)
+
     def __iter__(self) -> Iterator[SocketUpdate]:
         for update in self.__updates:
             yield update
@@ -133,6 +180,18 @@ class PlayerError(Update, Exception):
         self._message = message
         self._hint_cards = hint_cards
 
+    @property
+    def title(self) -> str:
+        return self._title
+
+    @property
+    def message(self) -> str:
+        return self._message
+
+    @property
+    def hint_cards(self) -> Cards:
+        return self._hint_cards
+
     def json(self, _=False) -> dict:
         return {
             "title": self._title,
@@ -0,0 +1,106 @@
+import gc
+import json
+import platform
+from argparse import ArgumentParser
+from random import Random
+from statistics import median, quantiles
+from time import perf_counter_ns
+
+from benchmarks.stats import compare, mann_whitney
+from benchmarks.suite import CASES, Case
+
+
+# Nanoseconds per operation of one batch of the case, without collections
+def sample(case: Case, seed: int) -> float:
+    batch = case(Random(seed))
+    gc.collect()
+    gc.disable()
+    try:
+        start = perf_counter_ns()
+        for call in batch.calls:
+            call()
+        elapsed = perf_counter_ns() - start
+    finally:
+        gc.enable()
+    return elapsed / batch.ops
+
+
+# Every round runs the same batches, so rounds only differ by noise
+def run(names: list[str], rounds: int, seed: int) -> dict:
+    cases = {}
+    for name in names:
+        sample(CASES[name], seed)
+        cases[name] = [sample(CASES[name], seed) for _ in range(rounds)]
+        print(f"{name:>24}: {summary(cases[name])}")
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "seed": seed,
+        "cases": cases,
+    }
+
+
+def summary(samples: list[float]) -> str:
+    low, _, high = quantiles(samples, n=4) if len(samples) > 1 else samples * 3
+    return (
+        f"{median(samples) / 1000:10.2f}us per op "
+        f"(IQR {low / 1000:.2f}-{high / 1000:.2f}us, {len(samples)} rounds)"
+    )
+
+
+# Print the change of every case and return whether any case got slower
+def report(baseline: dict, current: dict, alpha: float, threshold: float) -> bool:
+    if baseline["python"] != current["python"]:
+        print(f"Warning: baseline ran on Python {baseline['python']}")
+    regressed = False
+    for name, samples in current["cases"].items():
+        if (base := baseline["cases"].get(name)) is None:
+            print(f"{name:>24}: not in baseline")
+            continue
+        change, significant = compare(base, samples, alpha)
+        verdict = "same"
+        if significant and abs(change) >= threshold:
+            verdict = "slower" if change > 0 else "faster"
+            regressed |= change > 0
+        print(
+            f"{name:>24}: {median(base) / 1000:10.2f}us -> "
+            f"{median(samples) / 1000:10.2f}us {change:+7.1%} "
+            f"{verdict} (p={mann_whitney(base, samples):.3f})"
+        )
+    return regressed
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Rules engine benchmark suite.")
+    parser.add_argument("cases", nargs="*", help="Case name prefixes, all if none.")
+    parser.add_argument("--rounds", type=int, default=15, help="Samples per case.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the batches.")
+    parser.add_argument("--save", help="Store the results as a JSON baseline.")
+    parser.add_argument("--compare", help="JSON baseline to compare results with.")
+    parser.add_argument("--results", help="Compare stored results instead of running.")
+    parser.add_argument("--alpha", type=float, default=0.01, help="Significance.")
+    parser.add_argument(
+        "--threshold", type=float, default=0.05, help="Smallest relevant change."
+    )
+    args = parser.parse_args()
+
+    if args.results:
+        with open(args.results) as file:
+            results = json.load(file)
+    else:
+        names = [
+            name
+            for name in CASES
+            if not args.cases or any(name.startswith(case) for case in args.cases)
+        ]
+        results = run(names, args.rounds, args.seed)
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        print(f"Compared with {args.compare}, significance {args.alpha}:")
+        exit(1 if report(baseline, results, args.alpha, args.threshold) else 0)
@@ -0,0 +1,86 @@
+import random
+from argparse import ArgumentParser
+from time import perf_counter_ns
+
+from abstractions import KEYS, Card, Cards, PlayerError, Suit
+from core import Order
+from core.format import FOLLOW_BUDGET, FOLLOWS, Format
+
+DECKS = 4
+
+# Lead, hand and play of a follow
+type Follow = tuple[Cards, Cards, Cards]
+
+
+# Trumps of every deck, grouped by face
+def trumps(order: Order) -> list[Cards]:
+    faces: dict[int, Cards] = {}
+    for i, face in enumerate(list(KEYS) * DECKS):
+        card = Card.intern(i, *face)
+        if order.is_trump(card):
+            faces.setdefault(card.key, []).append(card)
+    return sorted(faces.values(), key=lambda cards: order.of(cards[0]))
+
+
+# Follow with the largest units of the hand first, which resolves the most units
+def follow(order: Order, lead: Cards, hand: Cards) -> Follow:
+    units = Format(order, hand).units
+    return lead, hand, [card for unit in units for card in unit.cards][: len(lead)]
+
+
+# Random toss of trumps against a random trump hand
+def scattered(rng: random.Random, order: Order, lead: int, hand: int) -> Follow:
+    cards = [card for face in trumps(order) for card in face]
+    rng.shuffle(cards)
+    return follow(order, cards[:lead], cards[lead : lead + hand])
+
+
+# Toss of a long tractor against a hand of pairs and tractors, the hardest shapes
+def paired(rng: random.Random, order: Order, lead: int, hand: int) -> Follow:
+    faces = trumps(order)
+    start = rng.randrange(len(faces) - lead // 2)
+    stop = start + lead // 2
+    rest = [card for face in faces[start:stop] for card in face[2:]]
+    rest += [card for face in faces[:start] + faces[stop:] for card in face]
+    rest.sort(key=lambda card: order.of(card))
+    first = rng.randrange(len(rest) - hand)
+    lead_cards = [card for face in faces[start:stop] for card in face[:2]]
+    return follow(order, lead_cards, rest[first : first + hand])
+
+
+# Mean microseconds per validation and the number of plays accepted with lead units
+# left unmatched, which grows as the budget cuts validations short
+def measure(order: Order, follows: list[Follow], budget: int) -> tuple[float, int]:
+    elapsed, unmatched = 0, 0
+    for lead_cards, hand_cards, play in follows:
+        lead = Format(order, lead_cards)
+        FOLLOWS.clear()
+        start = perf_counter_ns()
+        try:
+            lead.validate_follow(play, hand_cards, budget)
+            unmatched += any(unit.match is None for unit in lead.units)
+        except PlayerError:
+            pass
+        elapsed += perf_counter_ns() - start
+        lead.reset()
+    return elapsed / len(follows) / 1000, unmatched
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Follow validation of large tosses.")
+    parser.add_argument("--follows", type=int, default=200, help="Follows per case.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the follows.")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    order = Order(2)
+    order.reset(Suit.SPADE)
+    for name, create in [("scattered", scattered), ("paired", paired)]:
+        for lead, hand in [(20, 30), (24, 36), (30, 40)]:
+            follows = [create(rng, order, lead, hand) for _ in range(args.follows)]
+            for budget in [FOLLOW_BUDGET, 1_000, 200]:
+                mean, unmatched = measure(order, follows, budget)
+                print(
+                    f"{name:>9} {lead} of {hand}, budget {budget}: "
+                    f"{mean:.0f}us per follow, {unmatched} unmatched"
+                )
@@ -0,0 +1,123 @@
+import random
+import sys
+import tracemalloc
+from argparse import ArgumentParser
+from statistics import mean
+
+from abstractions import Card, Cards, CardsEvent, Event, PlayerEvent, Room, Suit
+from core import KITTY_SIZE, Order
+from core.format import Format
+from core.game import Game
+from core.players import Players
+from core.updates import CardsUpdate, GamePhase
+
+NUM_PLAYERS = 4
+
+# Tracing the benchmark itself would count its own snapshots
+FILTERS = [tracemalloc.Filter(False, tracemalloc.__file__)]
+
+
+def event(pid: int, cards: Cards | None = None) -> dict:
+    payload: dict = {"matchId": 0, "playerId": pid}
+    if cards is not None:
+        payload["cards"] = [card.json() for card in cards]
+    return payload
+
+
+# Bytes and blocks held since the given snapshot
+def held(since: tracemalloc.Snapshot) -> tuple[int, int]:
+    stats = (
+        tracemalloc.take_snapshot().filter_traces(FILTERS).compare_to(since, "filename")
+    )
+    return sum(s.size_diff for s in stats), sum(s.count_diff for s in stats)
+
+
+# Deal a game without bids and discard the first cards of the kitty player
+def deal(players: Players, seed: int) -> Game:
+    room = Room(Event("", {"matchId": 0}))
+    lead = players.first().pid
+    game = Game(players, room, lead, rng=random.Random(seed))
+    while game.phase == GamePhase.DRAW:
+        pid = game._active_pid
+        game.draw(PlayerEvent("", event(pid)), Room(Event("", {"matchId": 0})))
+
+    pid = game._active_pid
+    kitty = players[pid].hand[:KITTY_SIZE]
+    game.kitty(CardsEvent("", event(pid, kitty)), Room(Event("", {"matchId": 0})))
+    return game
+
+
+# Play a trick of single cards: the lead plays its first card and follows play
+# their first card in the lead suit, or their first card without one
+def trick(game: Game, players: Players, order: Order, room: Room) -> None:
+    lead: Card | None = None
+    for _ in range(NUM_PLAYERS):
+        player = players[game._active_pid]
+        cards = player.hand
+        if lead is not None:
+            suit = order.cards_in_suit(cards, lead.suit, order.is_trump(lead))
+            cards = suit or cards
+        lead = lead or cards[0]
+        game.play(CardsEvent("", event(player.pid, cards[:1])), room)
+
+
+# Per trick and per game bytes and blocks held, and the peak bytes of a game
+def measure(seed: int) -> tuple[list[tuple[int, int]], tuple[int, int], int]:
+    start = tracemalloc.take_snapshot().filter_traces(FILTERS)
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+
+    players = Players()
+    for i in range(NUM_PLAYERS):
+        players.add(f"Player{i}", "")
+    game = deal(players, seed)
+    order = Order(players.first().level)
+    room = Room(Event("", {"matchId": 0}))
+
+    tricks = []
+    while game.phase == GamePhase.PLAY:
+        before = tracemalloc.take_snapshot().filter_traces(FILTERS)
+        trick(game, players, order, room)
+        tricks.append(held(before))
+    return tricks, held(start), tracemalloc.get_traced_memory()[1] - base
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Memory held by tricks and games.")
+    parser.add_argument("--games", type=int, default=5, help="Games to play.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the decks.")
+    args = parser.parse_args()
+
+    cards = [Card(i, Suit.SPADE, 1) for i in range(2)]
+    instances = [
+        ("Card", cards[0]),
+        ("Format", format := Format(Order(2), cards)),
+        ("Pair", format.pairs[0]),
+        ("Single", format.pairs[0].singles[0]),
+        ("CardsUpdate", CardsUpdate(0, cards)),
+    ]
+    for name, instance in instances:
+        # Instances without slots also hold their attribute dictionary
+        size = sys.getsizeof(instance)
+        if hasattr(instance, "__dict__"):
+            size += sys.getsizeof(instance.__dict__)
+        print(f"{name:>11}: {size} bytes per instance")
+
+    tracemalloc.start()
+    tricks, games, peaks = [], [], []
+    for i in range(args.games):
+        per_trick, per_game, peak = measure(args.seed + i)
+        tricks.extend(per_trick)
+        games.append(per_game)
+        peaks.append(peak)
+    tracemalloc.stop()
+
+    print(
+        f"      trick: {mean(b for b, _ in tricks):.0f} bytes, "
+        f"{mean(c for _, c in tricks):.0f} blocks held"
+    )
+    print(
+        f"       game: {mean(b for b, _ in games):.0f} bytes, "
+        f"{mean(c for _, c in games):.0f} blocks held, "
+        f"{mean(peaks):.0f} bytes at peak"
+    )
@@ -0,0 +1,38 @@
+from math import sqrt
+from statistics import NormalDist, median
+
+
+# Two sided p-value of the Mann-Whitney U test that samples of the two runs come
+# from the same distribution. Uses the normal approximation with tie and
+# continuity corrections, which holds from about 8 samples per run.
+def mann_whitney(a: list[float], b: list[float]) -> float:
+    n, m = len(a), len(b)
+    total = n + m
+    values = sorted([(value, 0) for value in a] + [(value, 1) for value in b])
+
+    # Sum of the ranks of the first run, ties share their average rank
+    rank_sum, ties, i = 0.0, 0, 0
+    while i < total:
+        j = i
+        while j < total and values[j][0] == values[i][0]:
+            j += 1
+        rank = (i + j + 1) / 2
+        rank_sum += rank * sum(1 for _, run in values[i:j] if run == 0)
+        ties += (j - i) ** 3 - (j - i)
+        i = j
+
+    u = rank_sum - n * (n + 1) / 2
+    sigma = sqrt(n * m / 12 * ((total + 1) - ties / (total * (total - 1))))
+    if sigma == 0:
+        return 1.0
+    z = max(abs(u - n * m / 2) - 0.5, 0) / sigma
+    return 2 * (1 - NormalDist().cdf(z))
+
+
+# Change of the median of a run against its baseline, and whether it is
+# significant at the given level
+def compare(
+    baseline: list[float], current: list[float], alpha: float
+) -> tuple[float, bool]:
+    change = median(current) / median(baseline) - 1
+    return change, mann_whitney(baseline, current) < alpha
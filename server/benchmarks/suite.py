@@ -0,0 +1,162 @@
+from functools import partial
+from random import Random
+from typing import Callable, NamedTuple
+
+from abstractions import Cards, Event, PlayerEvent, Suit
+from benchmarks import follow, trick
+from core import KITTY_SIZE, Order, Player
+from core.format import FOLLOWS, PLANS, Format
+from core.game import Game
+from core.legal import Legal
+from core.players import Players
+from core.trick import Trick
+from core.updates import GamePhase
+from simulation import SimulationRoom, Stats, simulate
+
+SUITS = [Suit.SPADE, Suit.HEART, Suit.CLUB, Suit.DIAMOND]
+
+
+# Prepared calls of a benchmark, timed together, and the operations they perform
+class Batch(NamedTuple):
+    calls: list[Callable[[], object]]
+    ops: int
+
+
+type Case = Callable[[Random], Batch]
+
+
+def _order(trump_suit: Suit) -> Order:
+    order = Order(2)
+    order.reset(trump_suit)
+    return order
+
+
+def _players(order: Order, hands: list[Cards]) -> list[Player]:
+    players = []
+    for pid, hand in enumerate(hands):
+        player = Player(pid, "", "")
+        player.draw(hand)
+        player.sort(order)
+        players.append(player)
+    return players
+
+
+def order_reset(rng: Random) -> Batch:
+    order = Order(2)
+    suits = rng.choices(SUITS, k=20_000)
+    return Batch([partial(order.reset, suit) for suit in suits], len(suits))
+
+
+# Formats are planned from scratch, not from the plan cache
+def format_create(rng: Random) -> Batch:
+    def create(order: Order, cards: Cards) -> None:
+        PLANS.clear()
+        Format(order, cards)
+
+    calls = []
+    for _ in range(1_000):
+        trump_suit, _, plays = trick.deal(rng, rng.choice([1, 2]))
+        order = _order(trump_suit)
+        calls += [partial(create, order, cards) for cards in plays]
+    return Batch(calls, len(calls))
+
+
+def _validate(lead: Format, play: Cards, hand: Cards) -> None:
+    FOLLOWS.clear()
+    lead.validate_follow(play, hand)
+    lead.reset()
+
+
+# Follows of single and pair leads in the lead suit, validated from scratch
+# against the cards in the lead suit as in tricks
+def validate_follow(rng: Random) -> Batch:
+    calls = []
+    for _ in range(1_000):
+        trump_suit, hands, plays = trick.deal(rng, rng.choice([1, 2]))
+        order = _order(trump_suit)
+        lead = Format(order, plays[0])
+        for hand, play in zip(hands[1:], plays[1:]):
+            in_suit = order.cards_in_suit(hand, lead.suit, lead.trumps)
+            if all(card in in_suit for card in play):
+                calls.append(partial(_validate, lead, play, in_suit))
+    return Batch(calls, len(calls))
+
+
+# Follows of tosses of 20 trumps, validated from scratch
+def validate_toss(rng: Random) -> Batch:
+    order = _order(Suit.SPADE)
+    calls = []
+    for _ in range(20):
+        lead, hand, play = follow.scattered(rng, order, 20, 30)
+        calls.append(partial(_validate, Format(order, lead), play, hand))
+    return Batch(calls, len(calls))
+
+
+def trick_play(rng: Random) -> Batch:
+    def play(table: Trick, players: list[Player], plays: list[Cards]) -> None:
+        for player, cards in zip(players, plays):
+            table.play(player, cards)
+
+    calls = []
+    for _ in range(1_000):
+        trump_suit, hands, plays = trick.deal(rng, rng.choice([1, 2]))
+        order = _order(trump_suit)
+        table = Trick(trick.NUM_PLAYERS, order)
+        calls.append(partial(play, table, _players(order, hands), plays))
+    return Batch(calls, len(calls) * trick.NUM_PLAYERS)
+
+
+# Legal plays of every player of a trick, leads and follows of single and pair leads
+def legal(rng: Random) -> Batch:
+    def generate(order: Order, players: list[Player], lead: Format) -> None:
+        Legal(order, players[0], None).count()
+        for player in players[1:]:
+            Legal(order, player, lead).count()
+
+    calls = []
+    for _ in range(500):
+        trump_suit, hands, plays = trick.deal(rng, rng.choice([1, 2]))
+        order = _order(trump_suit)
+        players = _players(order, hands)
+        calls.append(partial(generate, order, players, Format(order, plays[0])))
+    return Batch(calls, len(calls) * trick.NUM_PLAYERS)
+
+
+# Every draw of a game, up to and including the kitty
+def game_draw(rng: Random) -> Batch:
+    def draw(game: Game, room: SimulationRoom, events: list[PlayerEvent]) -> None:
+        while game.phase == GamePhase.DRAW:
+            game.draw(events[game.active_pid], room)
+
+    calls, ops = [], 0
+    for _ in range(50):
+        players = Players([Player(pid, "", "") for pid in range(4)])
+        room = SimulationRoom(Event("", {"matchId": 0}), Stats(), 0, rng)
+        game = Game(players, room, 0, rng=Random(rng.random()))
+        events = [PlayerEvent("", {"matchId": 0, "playerId": pid}) for pid in range(4)]
+        calls.append(partial(draw, game, room, events))
+        ops += len(game._deck) - KITTY_SIZE + 1
+    return Batch(calls, ops)
+
+
+# A complete game of the given number of seats, played by the named policies
+def game(seats: int, policy: str, rng: Random) -> Batch:
+    seeds = [rng.getrandbits(32) for _ in range(40 // seats)]
+    return Batch(
+        [partial(simulate, seed, policy, seats, games=1) for seed in seeds],
+        len(seeds),
+    )
+
+
+CASES: dict[str, Case] = {
+    "order.reset": order_reset,
+    "format": format_create,
+    "format.validate_follow": validate_follow,
+    "format.validate_toss": validate_toss,
+    "trick.play": trick_play,
+    "legal": legal,
+    "game.draw": game_draw,
+    "game.4": partial(game, 4, "random"),
+    "game.8": partial(game, 8, "random"),
+    "game.bots": partial(game, 4, "bot"),
+}
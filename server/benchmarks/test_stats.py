@@ -0,0 +1,33 @@
+from unittest import TestCase
+
+from benchmarks.stats import compare, mann_whitney
+
+
+class StatsTests(TestCase):
+    def test_mann_whitney(self) -> None:
+        low = [float(i) for i in range(1, 9)]
+        high = [float(i) for i in range(9, 17)]
+        cases = [
+            # Separated runs
+            (low, high, 0.00094),
+            (high, low, 0.00094),
+            # Interleaved runs
+            (low[::2] + high[::2], low[1::2] + high[1::2], 0.71),
+            # Identical runs
+            ([1.0] * 8, [1.0] * 8, 1.0),
+        ]
+        for a, b, p in cases:
+            with self.subTest(a=a, b=b):
+                self.assertAlmostEqual(p, mann_whitney(a, b), places=2)
+
+    def test_compare(self) -> None:
+        baseline = [10.0, 11.0, 12.0, 10.5, 11.5, 10.2, 11.8, 10.9]
+        slower = [sample * 1.5 for sample in baseline]
+
+        change, significant = compare(baseline, slower, 0.01)
+        self.assertAlmostEqual(0.5, change)
+        self.assertTrue(significant)
+
+        change, significant = compare(baseline, baseline, 0.01)
+        self.assertEqual(0, change)
+        self.assertFalse(significant)
@@ -0,0 +1,96 @@
+import random
+from argparse import ArgumentParser
+from time import perf_counter_ns
+
+from abstractions import KEYS, Card, Cards, Suit
+from core import Order, Player
+from core.trick import Trick
+
+NUM_PLAYERS = 4
+HAND_SIZE = 25
+
+# Trump suit, hands and the plays of a trick, lead first
+type Deal = tuple[Suit, list[Cards], list[Cards]]
+
+
+# Follow a single card or pair lead the way a player would, pairs first
+def follow(order: Order, player: Player, lead: Cards) -> Cards:
+    suit = Suit.JOKER if order.is_trump(lead[0]) else lead[0].suit
+    in_suit = player.cards_in_suit(order, suit, suit == Suit.JOKER)
+    if len(lead) == 2:
+        for card in in_suit:
+            if player.count(card) > 1:
+                return [other for other in in_suit if other.matches(card)][:2]
+    others = [card for card in player.hand if card not in in_suit]
+    return (list(in_suit) + others)[: len(lead)]
+
+
+def deal(rng: random.Random, length: int) -> Deal:
+    deck = [Card.intern(i, *face) for i, face in enumerate(list(KEYS) * 2)]
+    trump_suit = rng.choice([Suit.SPADE, Suit.HEART, Suit.CLUB, Suit.DIAMOND])
+    order = Order(2)
+    order.reset(trump_suit)
+
+    while True:
+        rng.shuffle(deck)
+        hands = [deck[i * HAND_SIZE : (i + 1) * HAND_SIZE] for i in range(NUM_PLAYERS)]
+        leader = sorted(hands[0], key=lambda card: card.key)
+        leads = [
+            leader[i : i + length]
+            for i in range(len(leader) - length + 1)
+            if length == 1 or leader[i].matches(leader[i + 1])
+        ]
+        if leads:
+            break
+
+    plays = [rng.choice(leads)]
+    for hand in hands[1:]:
+        player = Player(0, "", "")
+        player.draw(hand)
+        plays.append(follow(order, player, plays[0]))
+    return trump_suit, hands, plays
+
+
+# Total nanoseconds taken by all follows of the given deals
+def measure(deals: list[Deal], fast: bool) -> int:
+    Trick._fast_follow = fast
+    elapsed = 0
+    for trump_suit, hands, plays in deals:
+        order = Order(2)
+        order.reset(trump_suit)
+        players = []
+        for pid, hand in enumerate(hands):
+            player = Player(pid, "", "")
+            player.draw(hand)
+            player.sort(order)
+            players.append(player)
+
+        trick = Trick(NUM_PLAYERS, order)
+        trick.play(players[0], plays[0])
+        start = perf_counter_ns()
+        for player, cards in zip(players[1:], plays[1:]):
+            trick.play(player, cards)
+        elapsed += perf_counter_ns() - start
+    Trick._fast_follow = True
+    return elapsed
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Per play latency of trick follows.")
+    parser.add_argument("--tricks", type=int, default=2000, help="Tricks per lead.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the deals.")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for name, length in [("single", 1), ("pair", 2)]:
+        deals = [deal(rng, length) for _ in range(args.tricks)]
+        follows = args.tricks * (NUM_PLAYERS - 1)
+
+        measure(deals, True)
+        fast = measure(deals, True) / follows / 1000
+        general = measure(deals, False) / follows / 1000
+
+        print(
+            f"{name:>6}: fast {fast:.2f}us, general {general:.2f}us per play "
+            f"({general / fast:.1f}x)"
+        )
@@ -1,6 +1,8 @@
+from bisect import insort
 from enum import IntEnum
+from typing import Iterable, NamedTuple
 
-from abstractions import Card, Cards, Suit
+from abstractions import KEYS, Card, Cards, Suit
 
 # Level 14 is Aces, Level 15 is the end level
 LEVELS = [2, 5, 10, 13, 14, 15]
@@ -18,73 +20,103 @@ class Trump(IntEnum):
     BIG_JOKER = 4
 
 
-class Order:
-    SUITS = [Suit.SPADE, Suit.HEART, Suit.CLUB, Suit.DIAMOND]
+# Order ranks, trump flags and effective suits of every card face, indexed by card key
+type Table = tuple[tuple[int, ...], tuple[bool, ...], tuple[Suit, ...]]
 
-    def __init__(self, level: int) -> None:
-        # Public
-        self.trump_suit = Suit.JOKER
-        self.trump_rank = level - SUIT_SIZE if level > SUIT_SIZE else level
 
-        # Private
-        self.__order: dict[tuple[Suit, int], int] = {}
-        # Rank order 1, 13, ..., 2, except trump rank
-        self.__all_ranks = [1, 13, 12, 11, 10, 9, 8, 7, 6, 5, 4, 3, 2]
-        self.__all_ranks.remove(self.trump_rank)
-        self.reset(Suit.JOKER)
+def _table(trump_rank: int, trump_suit: Suit) -> Table:
+    non_trump_suits = [suit for suit in Order.SUITS if suit != trump_suit]
+    # Rank order 1, 13, ..., 2, except trump rank
+    all_ranks = [1, 13, 12, 11, 10, 9, 8, 7, 6, 5, 4, 3, 2]
+    all_ranks.remove(trump_rank)
 
-    def reset(self, trump_suit: Suit) -> None:
-        self.trump_suit = trump_suit
-        non_trump_suits = [suit for suit in Order.SUITS if suit != trump_suit]
+    ranks = [0] * len(KEYS)
+    order = 0
 
-        self.__order.clear()
-        order = 0
+    # Jokers
+    ranks[KEYS[(Suit.JOKER, 2)]] = order
+    order += 1
+    ranks[KEYS[(Suit.JOKER, 1)]] = order
+    order += 1
 
-        # Jokers
-        self.__order[(Suit.JOKER, 2)] = order
-        order += 1
-        self.__order[(Suit.JOKER, 1)] = order
+    # Trump suit + rank
+    if trump_suit != Suit.JOKER:
+        ranks[KEYS[(trump_suit, trump_rank)]] = order
         order += 1
 
-        # Trump suit + rank
-        if trump_suit != Suit.JOKER:
-            self.__order[(trump_suit, self.trump_rank)] = order
+    # Trump rank
+    for suit in non_trump_suits:
+        ranks[KEYS[(suit, trump_rank)]] = order
+    order += 1
+
+    # Trump suit
+    if trump_suit != Suit.JOKER:
+        for rank in all_ranks:
+            ranks[KEYS[(trump_suit, rank)]] = order
             order += 1
 
-        # Trump rank
+    # Others
+    for rank in all_ranks:
         for suit in non_trump_suits:
-            self.__order[(suit, self.trump_rank)] = order
+            ranks[KEYS[(suit, rank)]] = order
         order += 1
 
-        # Trump rank
-        if trump_suit != Suit.JOKER:
-            for rank in self.__all_ranks:
-                self.__order[(trump_suit, rank)] = order
-                order += 1
+    trumps = [
+        suit == Suit.JOKER or suit == trump_suit or rank == trump_rank
+        for suit, rank in KEYS
+    ]
+    # Trumps form a single suit, which is keyed by jokers
+    suits = [Suit.JOKER if trump else suit for trump, (suit, _) in zip(trumps, KEYS)]
+    return tuple(ranks), tuple(trumps), tuple(suits)
 
-        # Others
-        for rank in self.__all_ranks:
-            for suit in non_trump_suits:
-                self.__order[(suit, rank)] = order
-            order += 1
+
+class Order:
+    SUITS = [Suit.SPADE, Suit.HEART, Suit.CLUB, Suit.DIAMOND]
+
+    def __init__(self, level: int) -> None:
+        # Public
+        self.trump_suit = Suit.JOKER
+        self.trump_rank = level - SUIT_SIZE if level > SUIT_SIZE else level
+
+        # Private
+        self.__ranks: tuple[int, ...] = ()
+        self.__trumps: tuple[bool, ...] = ()
+        self.__suits: tuple[Suit, ...] = ()
+        self.reset(Suit.JOKER)
+
+    # Tables are shared by the process, so pickled orders only keep the trump
+    def __getstate__(self) -> tuple[Suit, int]:
+        return self.trump_suit, self.trump_rank
+
+    def __setstate__(self, state: tuple[Suit, int]) -> None:
+        trump_suit, self.trump_rank = state
+        self.reset(trump_suit)
+
+    def reset(self, trump_suit: Suit) -> None:
+        self.trump_suit = trump_suit
+        self.__ranks, self.__trumps, self.__suits = TABLES[
+            (self.trump_rank, trump_suit)
+        ]
 
     def of(self, card: Card) -> int:
-        return self.__order[(card.suit, card.rank)]
+        return self.__ranks[card.key]
 
     def is_trump(self, card: Card) -> bool:
-        return (
-            card.suit == Suit.JOKER
-            or card.suit == self.trump_suit
-            or card.rank == self.trump_rank
-        )
+        return self.__trumps[card.key]
 
-    def cards_in_suit(self, cards: Cards, suit: Suit, trump_suit: bool) -> Cards:
+    # Suit the card is played in, trumps are all in Suit.JOKER
+    def suit_of(self, card: Card) -> Suit:
+        return self.__suits[card.key]
+
+    def cards_in_suit(
+        self, cards: Iterable[Card], suit: Suit, trump_suit: bool
+    ) -> Cards:
         if trump_suit:
             return [c for c in cards if self.is_trump(c)]
         return [c for c in cards if not self.is_trump(c) and c.suit == suit]
 
     def same(self, one: Card, two: Card) -> bool:
-        return self.of(one) == self.of(two)
+        return self.__ranks[one.key] == self.__ranks[two.key]
 
     def trump_type(self, cards: Cards) -> Trump:
         if len(cards) == 0 or len(cards) > 2:
@@ -101,6 +133,24 @@ class Order:
             return Trump.PAIR
 
 
+# Shared by all orders in the process, a bid only swaps the table in use
+TABLES: dict[tuple[int, Suit], Table] = {
+    (rank, suit): _table(rank, suit)
+    for rank in range(1, SUIT_SIZE + 1)
+    for suit in [*Order.SUITS, Suit.JOKER]
+}
+
+
+# Orders of the highest single, pair and tractor of each length held in a suit.
+# Tractors are indexed by their number of pairs less two, missing units are LOWEST.
+class Highest(NamedTuple):
+    single: int
+    pair: int
+    tractors: tuple[int, ...]
+
+    LOWEST = len(KEYS) + 1
+
+
 class Player:
     def __init__(self, pid: int, name: str, sid: str) -> None:
         # Inputs
@@ -108,35 +158,114 @@ class Player:
         self.name = name
         self.sid = sid
 
-        # Protected for testing
-        self._hand: Cards = []
+        # Private
+        # Cards in hand by code in draw order, and the number of cards held of
+        # each face
+        self.__cards: dict[int, Card] = {}
+        self.__counts = [0] * (len(KEYS) + 1)
+        # Cards in hand by effective suit sorted by order, and the order used
+        self.__suits: dict[Suit, Cards] = {}
+        self.__order: Order | None = None
+        self.__trump_suit = Suit.UNKNOWN
+        # Highest units by effective suit, dropped when cards in the suit change
+        self.__highest: dict[Suit, Highest] = {}
 
         # Public
         self.level = 2
         self.defender = False
+        # Bots are played by the server and have no socket
+        self.bot = False
+
+    @property
+    def hand(self) -> Cards:
+        return list(self.__cards.values())
 
     def json(self) -> dict:
-        return {"pid": self.pid, "name": self.name, "level": self.level}
+        return {
+            "pid": self.pid,
+            "name": self.name,
+            "level": self.level,
+            "bot": self.bot,
+        }
+
+    def __sorted(self, order: Order | None) -> bool:
+        return order is self.__order and order.trump_suit == self.__trump_suit
+
+    # Rebuild suit buckets for the given order, must be called on trump changes
+    def sort(self, order: Order) -> None:
+        self.__order, self.__trump_suit = order, order.trump_suit
+        self.__suits, self.__highest = {}, {}
+        for card in sorted(self.__cards.values(), key=order.of):
+            self.__suits.setdefault(order.suit_of(card), []).append(card)
 
     def draw(self, cards: Cards) -> None:
-        self._hand.extend(cards)
+        for card in cards:
+            self.__cards[card.code] = card
+            self.__counts[card.key] += 1
+
+        if (order := self.__order) is not None and self.__sorted(order):
+            for card in cards:
+                suit = self.__suits.setdefault(order.suit_of(card), [])
+                insort(suit, card, key=order.of)
+                self.__highest.pop(order.suit_of(card), None)
+
+    # Number of cards held with the same face as the given card
+    def count(self, card: Card) -> int:
+        return self.__counts[card.key]
 
     # If non-empty cards is passed in, checks if the player has the specified cards.
     # If cards is empty, checks if the player has any cards in hand.
     def has_cards(self, cards: Cards | None = None) -> bool:
         if cards is None:
-            return len(self._hand) > 0
+            return len(self.__cards) > 0
 
-        card_ids = set(card.id for card in cards)
-        hand_ids = set(card.id for card in self._hand)
-
-        # Cards are unique and all exist in hand
-        return len(card_ids) == len(cards) and len(card_ids - hand_ids) == 0
+        # Cards all exist in hand, so their ids are dealt ids that can index a
+        # bitset, and are unique
+        mask = 0
+        for card in cards:
+            if card.code not in self.__cards:
+                return False
+            mask |= 1 << card.id
+        return mask.bit_count() == len(cards)
 
+    # Cards are sorted by order and must not be modified
     def cards_in_suit(self, order: Order, suit: Suit, include_trumps: bool) -> Cards:
-        return order.cards_in_suit(self._hand, suit, include_trumps)
+        if not self.__sorted(order):
+            self.sort(order)
+        return self.__suits.get(Suit.JOKER if include_trumps else suit, [])
+
+    # Highest units held in the effective suit, trumps are in Suit.JOKER
+    def highest(self, order: Order, suit: Suit) -> Highest:
+        if not self.__sorted(order):
+            self.sort(order)
+        if (highest := self.__highest.get(suit)) is None:
+            highest = self.__highest[suit] = self.__index(order, suit)
+        return highest
+
+    # Tractors are runs of pairs with consecutive orders. Runs are visited from the
+    # highest, so the first run long enough for a tractor length is its highest.
+    def __index(self, order: Order, suit: Suit) -> Highest:
+        cards = self.__suits.get(suit, [])
+        pairs = sorted({order.of(c) for c in cards if self.__counts[c.key] > 1})
+        tractors: list[int] = []
+        start = 0
+        for i in range(1, len(pairs) + 1):
+            if i == len(pairs) or pairs[i] != pairs[i - 1] + 1:
+                while len(tractors) < i - start - 1:
+                    tractors.append(pairs[start])
+                start = i
+
+        return Highest(
+            order.of(cards[0]) if cards else Highest.LOWEST,
+            pairs[0] if pairs else Highest.LOWEST,
+            tuple(tractors),
+        )
 
     # Always call has_cards before calling play
     def play(self, cards: Cards) -> None:
-        card_ids = set(card.id for card in cards)
-        self._hand = [card for card in self._hand if card.id not in card_ids]
+        for card in cards:
+            if self.__cards.pop(card.code, None) is not None:
+                self.__counts[card.key] -= 1
+                if (order := self.__order) is not None and self.__sorted(order):
+                    self.__suits[order.suit_of(card)].remove(card)
+                    self.__highest.pop(order.suit_of(card), None)
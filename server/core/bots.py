@@ -0,0 +1,104 @@
+from itertools import islice
+
+from abstractions import Card, Cards, Suit
+from core import KITTY_SIZE, Order, Player, Trump
+from core.format import Format
+from core.game import Game
+
+
+# Heuristic decisions of server side bots. Decisions only read the game, so bots
+# keep no state of their own and any seat can be handed to a bot.
+class Bot:
+    # Follows weighed at most. Tosses have too many follows to weigh them all, and
+    # follows are generated lowest first, so the cheapest ones are kept.
+    CANDIDATES = 64
+
+    # Cheaper cards are lower non-trumps, trumps are the most expensive
+    @staticmethod
+    def __cost(order: Order, card: Card) -> int:
+        return (100 if order.is_trump(card) else 0) - order.of(card)
+
+    # Points of the cards, weighted to be given or kept, then their total cost
+    def __value(self, order: Order, cards: Cards, weight: int) -> tuple[int, int]:
+        points = weight * sum(card.points for card in cards)
+        return points, sum(self.__cost(order, card) for card in cards)
+
+    # Bid the first trump rank card of a suit holding a quarter of the hand, if no
+    # one has bid yet
+    def bid(self, game: Game, player: Player) -> Cards:
+        order = game.order
+        if game.trump != Trump.NONE:
+            return []
+        for card in player.hand:
+            if card.rank != order.trump_rank or card.suit == Suit.JOKER:
+                continue
+            suited = player.cards_in_suit(order, card.suit, False)
+            if 4 * (len(suited) + 1) >= len(player.hand):
+                return [card]
+        return []
+
+    # Hide the cheapest cards, keeping points and pairs out of the kitty if possible
+    def kitty(self, game: Game, player: Player) -> Cards:
+        order = game.order
+        cards = sorted(
+            player.hand,
+            key=lambda card: (
+                card.points,
+                player.count(card) > 1,
+                self.__cost(order, card),
+            ),
+        )
+        return cards[:KITTY_SIZE]
+
+    def play(self, game: Game, player: Player) -> Cards:
+        order = game.order
+        if (trick := game.trick) is None or (lead := trick.lead) is None:
+            return self.__lead(game, player)
+
+        # Feed points to a winning partner, otherwise win as cheaply as possible
+        winner = game.players[trick.winner_pid]
+        partner = winner.defender == player.defender
+        suited = player.cards_in_suit(order, lead.suit, lead.trumps)
+
+        if len(suited) < lead.length:
+            if not suited and not partner and not lead.trumps and lead.length <= 2:
+                if (ruff := self.__ruff(order, player, trick.winning_play)) is not None:
+                    return ruff
+            ids = {card.id for card in suited}
+            others = [card for card in player.hand if card.id not in ids]
+            others.sort(
+                key=lambda card: (
+                    order.is_trump(card),
+                    -card.points if partner else card.points,
+                    self.__cost(order, card),
+                )
+            )
+            return list(suited) + others[: lead.length - len(suited)]
+
+        plays = list(islice(game.legal(player.pid), Bot.CANDIDATES))
+        if partner:
+            return min(plays, key=lambda play: self.__value(order, play, -1))
+        winning = trick.winning_play
+        if wins := [play for play in plays if Format(order, play).beats(winning)]:
+            return min(wins, key=lambda play: self.__value(order, play, 0))
+        return min(plays, key=lambda play: self.__value(order, play, 1))
+
+    # Lead the largest unit, non-trumps before trumps, highest first
+    def __lead(self, game: Game, player: Player) -> Cards:
+        order = game.order
+        return min(
+            game.legal(player.pid),
+            key=lambda play: (-len(play), order.is_trump(play[0]), order.of(play[0])),
+        )
+
+    # Lowest trump single or pair beating the winning play of a non-trump lead
+    def __ruff(self, order: Order, player: Player, winning: Format) -> Cards | None:
+        trumps = player.cards_in_suit(order, Suit.JOKER, True)
+        length = winning.length
+        for i in range(len(trumps) - length, -1, -1):
+            play = trumps[i : i + length]
+            if length == 2 and not play[0].matches(play[1]):
+                continue
+            if Format(order, play).beats(winning):
+                return play
+        return None
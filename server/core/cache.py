@@ -0,0 +1,55 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable
+
+
+# Bounded least recently used cache shared across matches
+class Cache[K, V]:
+    def __init__(self, capacity: int) -> None:
+        # Inputs
+        self.__capacity = capacity
+
+        # Private
+        self.__entries: OrderedDict[K, V] = OrderedDict()
+        self.__lock = Lock()
+
+        # Public
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def json(self) -> dict:
+        return {
+            "size": len(self.__entries),
+            "capacity": self.__capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    # Return the cached value for key, creating it on a miss
+    def get(self, key: K, create: Callable[[], V]) -> V:
+        with self.__lock:
+            if key in self.__entries:
+                self.hits += 1
+                self.__entries.move_to_end(key)
+                return self.__entries[key]
+
+        # Create outside of the lock, concurrent misses may create the value twice
+        value = create()
+
+        with self.__lock:
+            self.misses += 1
+            self.__entries[key] = value
+            if len(self.__entries) > self.__capacity:
+                self.__entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+            self.hits = self.misses = self.evictions = 0
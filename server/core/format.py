@@ -1,14 +1,127 @@
+from bisect import insort
 from itertools import chain
-from typing import Self
+from operator import lt
+from typing import Iterable, NamedTuple, Self
 
-from abstractions import Cards, Suit
+from abstractions import Cards, PlayerError, Suit
 from core import Order
-from core.unit import Pair, Single, Tractor
+from core.cache import Cache
+from core.unit import Budget, BudgetExceeded, Pair, Single, Tractor
+
+# Length, tractor lengths, number of pairs and number of singles
+type Shape = tuple[int, tuple[int, ...], int, int]
+
+
+# Decomposition of sorted cards into units, as indices into the cards.
+# Pairs and tractor pairs are given by the index of their first card.
+class Plan(NamedTuple):
+    singles: tuple[int, ...]
+    pairs: tuple[int, ...]
+    tractors: tuple[tuple[int, ...], ...]
+    peers: tuple[tuple[int, tuple[int, ...]], ...]
+
+
+def _plan(order: Order, cards: Cards) -> Plan:
+    singles: list[int] = []
+    pairs: list[int] = []
+    tractors: list[list[int]] = []
+
+    # Resolve singles and pairs
+    i = 0
+    while i < len(cards):
+        if i < len(cards) - 1 and cards[i].matches(cards[i + 1]):
+            pairs.append(i)
+            i += 2
+        else:
+            singles.append(i)
+            i += 1
+
+    # Resolve tractors
+    i = 0
+    all: list[int] = []
+    unique: list[int] = []
+    peers: dict[int, list[int]] = {}
+
+    # Separate duplicate non-trump pairs when resolving tractors
+    for pair in pairs:
+        if unique and order.same(cards[unique[-1]], cards[pair]):
+            all.append(pair)
+            peers.setdefault(unique[-1], []).append(pair)
+        else:
+            unique.append(pair)
+
+    # Resolve tractors using deduped pairs
+    pairs_len = len(unique)
+    while i < pairs_len:
+        j = i
+        tractor_pairs = [unique[j]]
+        while (
+            j < pairs_len - 1
+            and order.of(cards[unique[j + 1]]) - order.of(cards[unique[j]]) == 1
+        ):
+            tractor_pairs.append(unique[j + 1])
+            j += 1
+        if j != i:
+            tractors.append(tractor_pairs)
+            i = j + 1
+        else:
+            all.append(unique[i])
+            i += 1
+
+    tractors.sort(key=lambda t: (-len(t), order.of(cards[t[0]])))
+    all.sort(key=lambda p: order.of(cards[p]))
+
+    return Plan(
+        tuple(singles),
+        tuple(all),
+        tuple(tuple(t) for t in tractors),
+        tuple((pair, tuple(peer)) for pair, peer in peers.items()),
+    )
+
+
+# Outcome of validating a follow, with cards given by position in the hand.
+# Valid follows have the match of each lead unit, invalid ones the error.
+class Follow(NamedTuple):
+    matches: tuple[tuple[int, ...] | None, ...]
+    error: tuple[str, str, tuple[int, ...]] | None
+
+
+# Cards and units examined while validating a follow before the play is accepted
+# unchecked, well above the few hundred of a full trump toss in a four deck game
+FOLLOW_BUDGET = 20_000
+
+# Plans are shared by structurally identical cards under the same trump
+PLANS: Cache[tuple[int, Suit, tuple[int, ...]], Plan] = Cache(4096)
+
+# Follows are shared by structurally identical leads, hands and plays
+FOLLOWS: Cache[tuple, Follow] = Cache(4096)
+
+
+# Cards sorted as planned and their plan
+def plan_cards(order: Order, cards: Cards) -> tuple[Cards, Plan]:
+    cards = sorted(cards, key=lambda card: (order.of(card), card.suit))
+    key = (order.trump_rank, order.trump_suit, tuple(c.key for c in cards))
+    return cards, PLANS.get(key, lambda: _plan(order, cards))
 
 
 # Container class for format of set of cards in a play
 # Assume non-zero number of cards
 class Format:
+    __slots__ = (
+        "__order",
+        "__cards",
+        "trumps",
+        "suit",
+        "suited",
+        "singles",
+        "pairs",
+        "tractors",
+        "units",
+        "is_toss",
+        "shape",
+        "ranks",
+    )
+
     def __init__(self, order: Order, cards: Cards) -> None:
         self.__order = order
         self.__cards = cards
@@ -27,64 +140,51 @@ class Format:
         )
         self.units = list(chain(self.tractors, self.pairs, self.singles))
         self.is_toss = len(self.tractors) + len(self.pairs) + len(self.singles) != 1
+        self.shape, self.ranks = self.__sign()
 
     def __create(self, cards: Cards) -> tuple[list[Single], list[Pair], list[Tractor]]:
+        cards, plan = plan_cards(self.__order, cards)
+
+        # Units are created for every format, cached plans are never mutated
+        pairs = {i: Pair([cards[i], cards[i + 1]]) for i in plan.pairs}
+        for tractor in plan.tractors:
+            pairs.update((i, Pair([cards[i], cards[i + 1]])) for i in tractor)
+        for pair, peers in plan.peers:
+            pairs[pair].peers.extend(pairs[peer] for peer in peers)
+
+        return (
+            [Single(cards[i]) for i in plan.singles],
+            [pairs[i] for i in plan.pairs],
+            [Tractor([pairs[i] for i in tractor]) for tractor in plan.tractors],
+        )
+
+    # Shape is the length, tractor lengths, number of pairs and number of singles.
+    # Ranks are the orders of the highest tractor of each length, pair and single,
+    # which are the only units compared between plays.
+    def __sign(self) -> tuple[Shape, tuple[int, ...]]:
         order = self.__order
-        cards = sorted(cards, key=lambda card: (order.of(card), card.suit))
-        singles: list[Single] = []
-        pairs: list[Pair] = []
-        tractors: list[Tractor] = []
-
-        # Resolve singles and pairs
-        i = 0
-        while i < len(cards):
-            if i < len(cards) - 1 and cards[i].matches(cards[i + 1]):
-                pairs.append(Pair([cards[i], cards[i + 1]]))
-                i += 2
-            else:
-                singles.append(Single(cards[i]))
-                i += 1
-
-        # Resolve tractors
-        i = 0
-        all: list[Pair] = []
-        unique: list[Pair] = []
-
-        # Separate duplicate non-trump pairs when resolving tractors
-        for pair in pairs:
-            if unique and order.same(unique[-1].highest, pair.highest):
-                all.append(pair)
-                unique[-1].peers.append(pair)
-            else:
-                unique.append(pair)
-
-        # Resolve tractors using deduped pairs
-        pairs_len = len(unique)
-        while i < pairs_len:
-            j = i
-            tractor_pairs = [unique[j]]
-            while (
-                j < pairs_len - 1
-                and order.of(unique[j + 1].highest) - order.of(unique[j].highest) == 1
-            ):
-                tractor_pairs.append(unique[j + 1])
-                j += 1
-            if j != i:
-                tractors.append(Tractor(tractor_pairs))
-                i = j + 1
-            else:
-                all.append(unique[i])
-                i += 1
-
-        tractors.sort(key=lambda t: (-t.length, order.of(t.highest)))
-        all.sort(key=lambda p: order.of(p.highest))
-
-        return (singles, all, tractors)
+        lengths = tuple(tractor.length for tractor in self.tractors)
+        ranks = [
+            order.of(tractor.highest)
+            for i, tractor in enumerate(self.tractors)
+            if i == 0 or lengths[i - 1] != tractor.length
+        ]
+        if self.pairs:
+            ranks.append(order.of(self.pairs[0].highest))
+        if self.singles:
+            ranks.append(order.of(self.singles[0].highest))
+        shape = (len(self.__cards), lengths, len(self.pairs), len(self.singles))
+        return shape, tuple(ranks)
 
     @property
     def length(self) -> int:
         return len(self.__cards)
 
+    # Hashable canonical signature of this format
+    @property
+    def signature(self) -> tuple[Shape, tuple[int, ...]]:
+        return self.shape, self.ranks
+
     def reset(self) -> None:
         for tractor in self.tractors:
             tractor.reset()
@@ -100,63 +200,161 @@ class Format:
             self.pairs = [p.match for p in format.pairs if p.match is not None]
             self.singles = [s.match for s in format.singles if s.match is not None]
             self.units = list(chain(self.tractors, self.pairs, self.singles))
+            self.shape, self.ranks = self.__sign()
+
+    # Remove cards from this format. Only units sharing order ranks with the units
+    # losing cards can change, all other units are kept as they are.
+    def remove(self, ids: Iterable[int]) -> None:
+        order, removed = self.__order, set(ids)
+        ranks = {
+            order.of(card)
+            for unit in self.units
+            if any(card.id in removed for card in unit.cards)
+            for card in unit.cards
+        }
+        touched = {
+            unit
+            for unit in self.units
+            if any(order.of(card) in ranks for card in unit.cards)
+        }
+        kept = {card.id for unit in touched for card in unit.cards} - removed
+        remaining = [card for card in self.__cards if card.id in kept]
+        singles, pairs, tractors = self.__create(remaining)
+
+        self.__cards = [card for card in self.__cards if card.id not in removed]
+        self.tractors = [t for t in self.tractors if t not in touched]
+        self.pairs = [p for p in self.pairs if p not in touched]
+        self.singles = [s for s in self.singles if s not in touched]
+        for tractor in tractors:
+            insort(
+                self.tractors, tractor, key=lambda t: (-t.length, order.of(t.highest))
+            )
+        for pair in pairs:
+            insort(self.pairs, pair, key=lambda p: order.of(p.highest))
+        for single in singles:
+            insort(
+                self.singles,
+                single,
+                key=lambda s: (order.of(s.highest), s.highest.suit),
+            )
+        self.units = list(chain(self.tractors, self.pairs, self.singles))
+        self.is_toss = len(self.units) != 1
+        self.shape, self.ranks = self.__sign()
 
     def cards_in_suit(self, suit: Suit, include_trumps: bool) -> Cards:
         return self.__order.cards_in_suit(self.__cards, suit, include_trumps)
 
-    # Ensure the following play follows the lead format
-    def validate_follow(self, played_cards: Cards, hand_cards: Cards) -> None:
-        played_dict = {card.id: card for card in played_cards}
-        hand_dict = {card.id: card for card in hand_cards}
-        stack = [unit for unit in reversed(self.units)]
+    # Ensure the following play follows the lead format. Outcomes are cached by the
+    # lead shape and the hand's relative orders, suits, trumps and played cards, with
+    # cards given by position in the hand sorted by order and suit. Equal cards keep
+    # their order in the hand, which decides the cards matched and hinted among them.
+    def validate_follow(
+        self, played_cards: Cards, hand_cards: Cards, budget: int = FOLLOW_BUDGET
+    ) -> None:
+        order = self.__order
+        played = set(card.id for card in played_cards)
+        hand = sorted(hand_cards, key=lambda card: (order.of(card), card.suit))
+        positions = {card.id: i for i, card in enumerate(hand)}
 
-        while stack:
-            unit = stack.pop()
-            hand_format = Format(self.__order, hand_dict.values())
-            result = unit.resolve(played_dict, hand_format.units, self.__order)
-            if result is None:
-                stack.extend(reversed(unit.decompose()))
-                continue
-            for id in result:
-                del played_dict[id]
-                del hand_dict[id]
+        # Only plays of unique cards from hands of unique cards can be cached
+        unique = len(played) == len(played_cards) and len(positions) == len(hand)
+        if not unique or not played <= positions.keys():
+            return self.__validate_follow(played_cards, hand_cards, Budget(budget))
 
-    def beats(self, other: Self) -> bool:
-        # This check will be obsolete once format matching is completed
-        # For now this is a quick sanity check for prototyping
-        if (
-            self.length != other.length
-            or len(self.tractors) != len(other.tractors)
-            or len(self.pairs) != len(other.pairs)
-            or len(self.singles) != len(other.singles)
-        ):
-            print("Format comparison lost: length mismatch")
-            return False
+        base = order.of(hand[0]) if hand else 0
+        suits: dict[Suit, int] = {}
+        key = (
+            self.shape,
+            budget,
+            tuple(
+                (
+                    order.of(c) - base,
+                    suits.setdefault(c.suit, len(suits)),
+                    order.is_trump(c),
+                    c.id in played,
+                )
+                for c in hand
+            ),
+        )
+        follow = FOLLOWS.get(
+            key, lambda: self.__follow(played_cards, hand, positions, Budget(budget))
+        )
 
-        order = self.__order
-        tractor_length = 0
-
-        for tractor, other_tractor in zip(self.tractors, other.tractors):
-            if tractor.length != other_tractor.length:
-                print("Format comparison lost: tractor length mismatch")
-                return False
-            if tractor.length != tractor_length:
-                tractor_length = tractor.length
-                # Highest tractor of a given length, compare highest cards
-                if order.of(tractor.highest) >= order.of(other_tractor.highest):
-                    print("Format comparison lost: tractor order")
-                    return False
-
-        if len(self.pairs) > 0 and order.of(self.pairs[0].highest) >= order.of(
-            other.pairs[0].highest
-        ):
-            print("Format comparison lost: pair order")
-            return False
+        if follow.error is not None:
+            title, message, hints = follow.error
+            raise PlayerError(title, message, [hand[i] for i in hints])
 
-        if len(self.singles) > 0 and order.of(self.singles[0].highest) >= order.of(
-            other.singles[0].highest
-        ):
-            print("Format comparison lost: single order")
-            return False
+        for unit, match in zip(self.units, follow.matches):
+            unit._match = (
+                None if match is None else unit._create([hand[i] for i in match])
+            )
+
+    def __follow(
+        self,
+        played_cards: Cards,
+        hand_cards: Cards,
+        positions: dict[int, int],
+        budget: Budget,
+    ) -> Follow:
+        try:
+            self.__validate_follow(played_cards, hand_cards, budget)
+        except PlayerError as error:
+            hints = tuple(positions[card.id] for card in error.hint_cards)
+            return Follow((), (error.title, error.message, hints))
+
+        return Follow(
+            tuple(
+                (
+                    None
+                    if unit.match is None
+                    else tuple(positions[c.id] for c in unit.match.cards)
+                )
+                for unit in self.units
+            ),
+            None,
+        )
+
+    # Lead units are matched greedily from the highest, decomposing unmatched units.
+    # With L lead cards and H hand cards this is polynomial, O(L^3 * H) at worst:
+    # - A unit of n cards decomposes into units of fewer cards down to singles, so
+    #   at most 2L units are resolved.
+    # - Each resolve enumerates O(L * H) views of the hand units, the windows of
+    #   every hand tractor and their peer pair variants, each checked in O(L).
+    # - Each match removes its cards from the hand format in O(H).
+    # The budget counts the hand cards formatted and removed from, and the cards and
+    # hand units examined. Follows must match the lead's length and cannot be split,
+    # so once it is exceeded the play is accepted without matching the lead's units,
+    # instead of stalling the server on a pathological payload.
+    def __validate_follow(
+        self, played_cards: Cards, hand_cards: Cards, budget: Budget
+    ) -> None:
+        played_ids = {card.id: card for card in played_cards}
+        played_dict: dict[int, Cards] = {}
+        for card in played_ids.values():
+            played_dict.setdefault(card.key, []).append(card)
+        hand_dict = {card.id: card for card in hand_cards}
+        stack = [unit for unit in reversed(self.units)]
+
+        try:
+            budget.spend(len(hand_dict))
+            hand_format = Format(self.__order, list(hand_dict.values()))
+            while stack:
+                unit = stack.pop()
+                budget.spend(len(hand_format.units))
+                result = unit.resolve(
+                    played_dict, hand_format.units, self.__order, budget
+                )
+                if result is None:
+                    stack.extend(reversed(unit.decompose()))
+                    continue
+                for id in result:
+                    card = played_ids[id]
+                    played_dict[card.key].remove(card)
+                budget.spend(len(hand_dict))
+                hand_format.remove(result)
+        except BudgetExceeded:
+            self.reset()
 
-        return True
+    # A play beats another of the same shape if each compared unit is higher
+    def beats(self, other: Self) -> bool:
+        return self.shape == other.shape and all(map(lt, self.ranks, other.ranks))
@@ -1,18 +1,32 @@
-import random
 from bisect import bisect_left, bisect_right
+from random import Random
 
-from abstractions import Card, Cards, CardsEvent, PlayerError, PlayerEvent, Room, Suit
-from core import DECK_SIZE, DECK_THRESHOLD, KITTY_SIZE, LEVELS, SUIT_SIZE, Order, Trump
+from abstractions import KEYS, Card, Cards, CardsEvent, PlayerError, PlayerEvent, Room
+from core import DECK_SIZE, DECK_THRESHOLD, KITTY_SIZE, LEVELS, Order, Trump
+from core.legal import Legal
 from core.players import Players
+from core.trace import Tracer
 from core.trick import Trick
 from core.updates import CardsUpdate, EndUpdate, GamePhase, StartUpdate, TeamUpdate
 
+# Faces of a single deck, games with more decks repeat them
+FACES = tuple(KEYS)
+
 
 class Game:
-    def __init__(self, players: Players, room: Room, lead: int, bid_team=False) -> None:
+    def __init__(
+        self,
+        players: Players,
+        room: Room,
+        lead: int,
+        bid_team=False,
+        tracer: Tracer | None = None,
+        rng: Random | None = None,
+    ) -> None:
         # Inputs
         self.__players = players
         self.__bid_team = bid_team
+        self.__tracer = tracer
 
         # Protected for testing
         self._kitty_pid = lead
@@ -33,25 +47,61 @@ class Game:
         self.phase = GamePhase.DRAW
         self.next_pid = -1
 
+        # Card ids are deck positions, so a single permutation of the faces both
+        # shuffles the deck and hides the faces of the ids
         indices = list(range(self.__decks * DECK_SIZE))
-        random.shuffle(indices)  # Pre-shuffle indices it won't match card order
-        suits = list(Suit)
-
-        for i, index in enumerate(indices):
-            suit, rank = divmod(i % DECK_SIZE, SUIT_SIZE)
-            self._deck.append(Card(index, suits[suit], rank + 1))
-        random.shuffle(self._deck)
-
+        (rng or Random()).shuffle(indices)
+        self._deck = [
+            Card.intern(id, *FACES[index % DECK_SIZE])
+            for id, index in enumerate(indices)
+        ]
+
+        for player in self.__players:
+            player.sort(self.__order)
         self.__players.assign_fixed_team(lead)
         room.public("start", StartUpdate(lead, len(indices), self.__order.trump_rank))
         room.public("team", TeamUpdate(lead, self.__players.defenders()))
 
+    @property
+    def players(self) -> Players:
+        return self.__players
+
+    @property
+    def active_pid(self) -> int:
+        return self._active_pid
+
+    @property
+    def order(self) -> Order:
+        return self.__order
+
+    # Highest bid so far, Trump.NONE before any bid
+    @property
+    def trump(self) -> Trump:
+        return self.__trump
+
+    @property
+    def ready_pids(self) -> frozenset[int]:
+        return frozenset(self.__ready_pids)
+
+    # Trick being played, if any cards have been played since the last one ended
+    @property
+    def trick(self) -> Trick | None:
+        if self._tricks and not self._tricks[-1].ended:
+            return self._tricks[-1]
+        return None
+
     def __ensure_valid_event(self, phase: GamePhase, pid: int | None = None) -> None:
         if phase != self.phase:
             raise PlayerError("Invalid action", "You can't do that right now.")
         if pid is not None and pid != self._active_pid:
             raise PlayerError("Invalid action", "It's not your turn.")
 
+    # Legal plays of the player for the current trick, if it is their turn
+    def legal(self, pid: int) -> Legal:
+        self.__ensure_valid_event(GamePhase.PLAY, pid)
+        lead = None if (trick := self.trick) is None else trick.lead
+        return Legal(self.__order, self.__players[pid], lead)
+
     def draw(self, event: PlayerEvent, room: Room) -> None:
         self.__ensure_valid_event(GamePhase.DRAW, event.pid)
 
@@ -95,6 +145,8 @@ class Game:
 
         # Update states
         self.__order.reset(event.cards[0].suit)
+        for player in self.__players:
+            player.sort(self.__order)
         self.__trump, self.__bidder_pid = trump, event.pid
 
         if self.__bid_team:
@@ -163,7 +215,9 @@ class Game:
 
         # Create new trick if needed
         if len(self._tricks) == 0 or self._tricks[-1].ended:
-            self._tricks.append(Trick(len(self.__players), self.__order))
+            self._tricks.append(
+                Trick(len(self.__players), self.__order, self.__players, self.__tracer)
+            )
 
         # Process play event and play cards from player's hands
         player = self.__players[event.pid]
@@ -0,0 +1,249 @@
+from itertools import combinations
+from random import Random
+from typing import Iterator
+
+from abstractions import Cards, Suit
+from core import Order, Player
+from core.format import Format, Plan, plan_cards
+
+# Lead units are given by their number of pairs: 0 for a single, 1 for a pair and
+# the number of pairs of a tractor
+type Unit = int
+
+# Cards of a candidate match and the views passed over before it, which must not be
+# matched by the play as the engine matches the first view it finds
+type Step = tuple[Cards, list[Cards]]
+
+
+def _decompose(unit: Unit) -> list[Unit]:
+    if unit > 2:
+        return [unit - 1, 1]
+    return [unit - 1, unit - 1]
+
+
+# Views of the hand units matching a lead unit, in the order the engine resolves
+# them: by order of their highest card, then tractors, pairs and singles
+def _views(order: Order, cards: Cards, plan: Plan, unit: Unit) -> list[Cards]:
+    peers = dict(plan.peers)
+    views: list[Cards] = []
+    for tractor in plan.tractors:
+        if unit > 1 and len(tractor) >= unit:
+            for i in range(len(tractor) - unit + 1):
+                window = tractor[i : i + unit]
+                views.append([cards[k] for p in window for k in (p, p + 1)])
+                for j, pair in enumerate(window):
+                    for peer in peers.get(pair, ()):
+                        substituted = window[:j] + (peer,) + window[j + 1 :]
+                        views.append(
+                            [cards[k] for p in substituted for k in (p, p + 1)]
+                        )
+        elif unit == 1:
+            views.extend([cards[p], cards[p + 1]] for p in tractor)
+        elif unit == 0:
+            views.extend([cards[k]] for p in tractor for k in (p, p + 1))
+    for pair in plan.pairs:
+        if unit == 1:
+            views.append([cards[pair], cards[pair + 1]])
+        elif unit == 0:
+            views.extend([[cards[pair]], [cards[pair + 1]]])
+    if unit == 0:
+        views.extend([cards[single]] for single in plan.singles)
+    views.sort(key=lambda view: order.of(view[0]))
+    # Copies of a single are interchangeable, only the first one is a view
+    if unit == 0:
+        faces = {view[0].key: view for view in reversed(views)}
+        views = [view for view in views if faces[view[0].key] is view]
+    return views
+
+
+# Plays of the hand cards that match the lead units the way follows are validated.
+# Each lead unit is matched with one of its views in the hand, or decomposed when
+# there are none. Choosing a view rules out plays matching an earlier view. Views
+# are tried in a random order when given a generator.
+def _follows(
+    order: Order,
+    hand: Cards,
+    units: list[Unit],
+    steps: list[Step],
+    rng: Random | None = None,
+) -> Iterator[Cards]:
+    if not units:
+        yield [card for cards, _ in steps for card in cards]
+        return
+
+    unit, rest = units[-1], units[:-1]
+    cards, plan = plan_cards(order, hand)
+    views = _views(order, cards, plan, unit)
+    if not views:
+        if unit > 0:
+            units = rest + _decompose(unit)[::-1]
+            yield from _follows(order, hand, units, steps, rng)
+        return
+
+    indices = list(range(len(views)))
+    if rng is not None:
+        rng.shuffle(indices)
+    for i in indices:
+        steps.append((views[i], views[:i]))
+        if _allowed(steps):
+            ids = {card.id for card in views[i]}
+            remaining = [card for card in hand if card.id not in ids]
+            yield from _follows(order, remaining, rest, steps, rng)
+        steps.pop()
+
+
+# Views passed over at each step must not be part of the cards matched from it on
+def _allowed(steps: list[Step]) -> bool:
+    matched: set[int] = set()
+    for cards, passed in reversed(steps):
+        matched.update(card.id for card in cards)
+        if any(all(card.id in matched for card in view) for view in passed):
+            return False
+    return True
+
+
+# Faces of the cards in their order, plays are identified by their faces
+def _faces(cards: Cards) -> tuple[int, ...]:
+    return tuple(sorted(card.key for card in cards))
+
+
+# Legal plays of a player's turn. Plays with the same faces are equivalent and are
+# generated once, with the first cards of each face in hand order. Leads are single
+# units: singles, pairs and tractors, tosses are not generated.
+class Legal:
+    # Follows in suit of leads with pairs or tractors generated at most, as tosses
+    # of several units have too many follows to enumerate
+    LIMIT = 256
+
+    def __init__(self, order: Order, player: Player, lead: Format | None) -> None:
+        # Private
+        # Plays of leads and of follows in suit
+        self.__plays: list[Cards] = []
+        # Whether follows were cut at the limit, they are then sampled by a random
+        # search of the follows, with the order and units they were generated by
+        self.__capped = False
+        self.__order = order
+        self.__suited: Cards = []
+        self.__units: list[Unit] = []
+        # Follows short of the lead suit play all the cards in suit, completed with
+        # any cards of the other faces, and follows of singles in suit are any cards
+        # in suit. Ways of completing them with n cards from the i-th face on are
+        # counted for all n up to the cards missing.
+        self.__fixed: Cards = []
+        self.__faces: list[Cards] = []
+        self.__ways: list[list[int]] = []
+        self.__missing = 0
+
+        if lead is None:
+            self.__plays = self.__leads(order, player)
+            return
+
+        suited = player.cards_in_suit(order, lead.suit, lead.trumps)
+        if len(suited) < lead.length:
+            self.__fixed = list(suited)
+            ids = {card.id for card in suited}
+            faces: dict[int, Cards] = {}
+            for card in sorted(player.hand, key=lambda c: (order.of(c), c.suit)):
+                if card.id not in ids:
+                    faces.setdefault(card.key, []).append(card)
+            self.__faces = list(faces.values())
+            self.__missing = lead.length - len(suited)
+            self.__ways = self.__count_ways()
+        elif len(lead.units) == 1 and lead.length <= 2:
+            self.__plays = self.__simple(suited, lead.length)
+        elif not lead.pairs and not lead.tractors:
+            faces = {}
+            for card in sorted(suited, key=lambda c: order.of(c)):
+                faces.setdefault(card.key, []).append(card)
+            self.__faces = list(faces.values())
+            self.__missing = lead.length
+            self.__ways = self.__count_ways()
+        else:
+            units = [len(t.pairs) for t in lead.tractors]
+            units += [1] * len(lead.pairs) + [0] * len(lead.singles)
+            self.__suited, self.__units = suited, units[::-1]
+            plays: dict[tuple[int, ...], Cards] = {}
+            for play in _follows(order, suited, self.__units, []):
+                key = _faces(play)
+                if key not in plays and len(plays) == Legal.LIMIT:
+                    self.__capped = True
+                    break
+                plays.setdefault(key, play)
+            self.__plays = list(plays.values())
+
+    # Follows of a single card or pair lead, any pair in suit must be played
+    def __simple(self, suited: Cards, length: int) -> list[Cards]:
+        faces: dict[int, Cards] = {}
+        for card in suited:
+            faces.setdefault(card.key, []).append(card)
+        if length == 1:
+            return [cards[:1] for cards in faces.values()]
+        if pairs := [cards[:2] for cards in faces.values() if len(cards) > 1]:
+            return pairs
+        return [list(cards) for cards in combinations(suited, 2)]
+
+    def __leads(self, order: Order, player: Player) -> list[Cards]:
+        plays: dict[tuple[int, ...], Cards] = {}
+        for suit in Order.SUITS + [Suit.JOKER]:
+            suited = player.cards_in_suit(order, suit, suit == Suit.JOKER)
+            cards, plan = plan_cards(order, suited)
+            for card in cards:
+                plays.setdefault((card.key,), [card])
+            longest = len(plan.tractors[0]) if plan.tractors else 1
+            for unit in range(1, longest + 1):
+                for view in _views(order, cards, plan, unit):
+                    plays.setdefault(_faces(view), view)
+        return list(plays.values())
+
+    # Number of ways to complete follows with n cards from the i-th face on
+    def __count_ways(self) -> list[list[int]]:
+        ways = [[1] + [0] * self.__missing]
+        for cards in reversed(self.__faces):
+            after = ways[-1]
+            ways.append(
+                [
+                    sum(after[n - k] for k in range(min(n, len(cards)) + 1))
+                    for n in range(self.__missing + 1)
+                ]
+            )
+        return ways[::-1]
+
+    def __complete(self, i: int, n: int) -> Iterator[Cards]:
+        if n == 0:
+            yield []
+            return
+        if i == len(self.__faces):
+            return
+        for k in range(min(n, len(self.__faces[i])), -1, -1):
+            for rest in self.__complete(i + 1, n - k):
+                yield self.__faces[i][:k] + rest
+
+    def __iter__(self) -> Iterator[Cards]:
+        yield from self.__plays
+        if self.__missing:
+            for cards in self.__complete(0, self.__missing):
+                yield self.__fixed + cards
+
+    # Number of legal plays, up to the limit for follows of pairs or tractors
+    def count(self) -> int:
+        if self.__missing:
+            return self.__ways[0][self.__missing]
+        return len(self.__plays)
+
+    # Uniformly random legal play, or any legal play when follows were cut
+    def sample(self, rng: Random) -> Cards:
+        if self.__capped:
+            return next(_follows(self.__order, self.__suited, self.__units, [], rng))
+        if not self.__missing:
+            return rng.choice(self.__plays)
+
+        cards, n = list(self.__fixed), self.__missing
+        for i, face in enumerate(self.__faces):
+            pick = rng.randrange(self.__ways[i][n])
+            for k in range(min(n, len(face)) + 1):
+                if pick < (ways := self.__ways[i + 1][n - k]):
+                    break
+                pick -= ways
+            cards += face[:k]
+            n -= k
+        return cards
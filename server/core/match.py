@@ -1,8 +1,23 @@
-from abstractions import CardsEvent, JoinEvent, PlayerError, PlayerEvent, Response, Room
+from math import isfinite
+from random import Random
+from secrets import randbits
+from typing import Any, Callable
+
+from abstractions import (
+    Cards,
+    CardsEvent,
+    JoinEvent,
+    PlayerError,
+    PlayerEvent,
+    Response,
+    Room,
+)
 from core import LEVELS
+from core.bots import Bot
 from core.game import Game
 from core.players import Players
-from core.updates import MatchPhase, MatchUpdate, PlayerUpdate
+from core.trace import Tracer
+from core.updates import GamePhase, MatchPhase, MatchUpdate, PlayerUpdate
 
 
 class MatchSettings:
@@ -10,12 +25,21 @@ class MatchSettings:
         self.seats = json["seats"] if "seats" in json else 4
         self.debug = json["debug"] if "debug" in json else False
         self.logs = json["logs"] if "logs" in json else False
+        # Seats filled by bots when the first player joins, and seconds bots think,
+        # up to a minute
+        self.bots = int(json["bots"]) if "bots" in json else 0
+        think_time = float(json["thinkTime"]) if "thinkTime" in json else 1.0
+        self.think_time = (
+            min(max(think_time, 0.0), 60.0) if isfinite(think_time) else 1.0
+        )
 
     def json(self) -> dict:
         return {
             "seats": self.seats,
             "debug": self.debug,
             "logs": self.logs,
+            "bots": self.bots,
+            "thinkTime": self.think_time,
         }
 
 
@@ -34,20 +58,50 @@ class MatchResponse(Response):
 
 
 class Match:
-    def __init__(self, id: int, settings: MatchSettings) -> None:
+    def __init__(
+        self, id: int, settings: MatchSettings, seed: int | None = None
+    ) -> None:
         # Inputs
         self.__id = id
         self.__settings = settings
 
+        # Games are dealt by a generator owned by the match, replayable from the seed.
+        # Decks are reproducible from the seed, so it must never come from or be sent
+        # to players, only simulations, tests and logs choose it.
+        seed = randbits(64) if seed is None else seed
+
         # Private
         self.__phase = MatchPhase.CREATED
         self.__games: list[Game] = []
+        self.__tracer = Tracer(id) if settings.logs else None
+        self.__rng = Random(seed)
+        self.__bot = Bot()
 
         # Public
+        self.seed = seed
         self.players = Players()
 
-    def __add_player(self, name: str, sid: str, room: Room) -> None:
-        room.public("join", PlayerUpdate(self.players.add(name, sid)))
+    @property
+    def id(self) -> int:
+        return self.__id
+
+    @property
+    def settings(self) -> MatchSettings:
+        return self.__settings
+
+    @property
+    def phase(self) -> MatchPhase:
+        return self.__phase
+
+    # Game being played, None before the match starts
+    @property
+    def game(self) -> Game | None:
+        return self.__games[-1] if self.__games else None
+
+    def __add_player(self, name: str, sid: str, room: Room, bot=False) -> None:
+        player = self.players.add(name, sid)
+        player.bot = bot
+        room.public("join", PlayerUpdate(player))
 
     def __ensure_cards(self, event: CardsEvent) -> None:
         if not self.players[event.pid].has_cards(event.cards):
@@ -63,15 +117,22 @@ class Match:
 
         self.__add_player(event.player_name, event.sid, room)
 
-        # Add mock players for debug mode
-        if self.__settings.debug and len(self.players) == 1:
-            for i in range(len(self.players), self.__settings.seats):
-                self.__add_player(f"Mock{i}", event.sid, room)
+        # Add bots when the first player joins, bots fill every seat in debug mode
+        if len(self.players) == 1:
+            seats = self.__settings.seats
+            bots = (
+                seats - 1
+                if self.__settings.debug
+                else min(self.__settings.bots, seats - 1)
+            )
+            for i in range(1, bots + 1):
+                self.__add_player(f"Bot{i}", "", room, True)
 
         # Start the game if all players have joined
         if len(self.players) == self.__settings.seats:
             # In the first game, the bidder is the kitty player
-            new_game = Game(self.players, room, self.players.first().pid, True)
+            lead = self.players.first().pid
+            new_game = Game(self.players, room, lead, True, self.__tracer, self.__rng)
             self.__games.append(new_game)
             self.__phase = MatchPhase.STARTED
             room.public("match", MatchUpdate(self.__phase))
@@ -103,8 +164,82 @@ class Match:
             self.__phase = MatchPhase.ENDED
             room.public("match", MatchUpdate(self.__phase))
 
+    # In debug mode the next game starts when a player is ready, bots only get ready
+    # so that players see the end of the game
     def next(self, event: PlayerEvent, room: Room) -> None:
         game = self.__games[-1]
-        if self.__settings.debug or game.ready(event.pid):
-            new_game = Game(self.players, room, game.next_pid)
+        debug = self.__settings.debug and not self.players[event.pid].bot
+        if debug or game.ready(event.pid):
+            new_game = Game(
+                self.players, room, game.next_pid, False, self.__tracer, self.__rng
+            )
             self.__games.append(new_game)
+
+    # Bots getting ready for the next game once the game ends
+    def __unready_bots(self, game: Game) -> list[int]:
+        return [
+            player.pid
+            for player in self.players
+            if player.bot
+            and player.pid not in game.ready_pids
+            and player.level < LEVELS[-1]
+        ]
+
+    # Whether bot_events has events, without deciding the bots' kitties and plays
+    def bots_can_act(self) -> bool:
+        if self.__phase != MatchPhase.STARTED:
+            return False
+        game, bot = self.__games[-1], self.__bot
+        active = self.players[game.active_pid]
+        if game.phase == GamePhase.DRAW:
+            bids = (p for p in self.players if p.bot and bot.bid(game, p))
+            return active.bot or any(bids)
+        if game.phase == GamePhase.KITTY or game.phase == GamePhase.PLAY:
+            return active.bot
+        if game.phase == GamePhase.END:
+            return len(self.__unready_bots(game)) > 0
+        return False
+
+    # Events of the bots that can act now. Bots draw, hide the kitty and play on
+    # their turns, bid while drawing and get ready for the next game.
+    def bot_events(self) -> list[tuple[str, PlayerEvent]]:
+        if self.__phase != MatchPhase.STARTED:
+            return []
+
+        def event(pid: int, cards: Cards | None = None) -> PlayerEvent:
+            payload = {"matchId": self.__id, "playerId": pid}
+            if cards is None:
+                return PlayerEvent("", payload)
+            payload["cards"] = [card.json() for card in cards]
+            return CardsEvent("", payload)
+
+        game, bot = self.__games[-1], self.__bot
+        active = self.players[game.active_pid]
+        if game.phase == GamePhase.DRAW:
+            events = []
+            for player in self.players:
+                if player.bot and (cards := bot.bid(game, player)):
+                    events.append(("bid", event(player.pid, cards)))
+                    break
+            if active.bot:
+                events.append(("draw", event(active.pid)))
+            return events
+        if game.phase == GamePhase.KITTY and active.bot:
+            return [("kitty", event(active.pid, bot.kitty(game, active)))]
+        if game.phase == GamePhase.PLAY and active.bot:
+            return [("play", event(active.pid, bot.play(game, active)))]
+        if game.phase == GamePhase.END:
+            return [("next", event(pid)) for pid in self.__unready_bots(game)]
+        return []
+
+
+# Calls of the events players and bots send, by event name
+EVENTS: dict[str, Callable[[Match, Any, Room], None]] = {
+    "join": Match.join,
+    "leave": Match.leave,
+    "draw": Match.draw,
+    "bid": Match.bid,
+    "kitty": Match.kitty,
+    "play": Match.play,
+    "next": Match.next,
+}
@@ -1,4 +1,3 @@
-from itertools import count
 from typing import Iterator
 
 from core import Player
@@ -6,10 +5,23 @@ from core import Player
 
 class Players:
     def __init__(self, players: list[Player] | None = None) -> None:
-        # Monotonically increasing ids
-        self.__player_ids: Iterator[int] = count()
+        # Monotonically increasing ids, a counter rather than an iterator so that
+        # players can be pickled
+        self.__next_pid = 0
         self.__players = {} if players is None else {p.pid: p for p in players}
 
+        # Seating ring in join order: seat of each pid, pid of each seat and the
+        # next pid of each pid, rebuilt when players join or leave
+        self.__seats: dict[int, int] = {}
+        self.__pids: list[int] = []
+        self.__ring: dict[int, int] = {}
+
+        # Teams, rebuilt when players join or leave and when teams are assigned
+        self.__attackers: frozenset[int] = frozenset()
+        self.__defenders: frozenset[int] = frozenset()
+
+        self.__seat()
+
     def __len__(self) -> int:
         return len(self.__players)
 
@@ -19,16 +31,37 @@ class Players:
     def __getitem__(self, pid: int) -> Player:
         return self.__players[pid]
 
+    def __iter__(self) -> Iterator[Player]:
+        return iter(self.__players.values())
+
+    def __seat(self) -> None:
+        self.__pids = list(self.__players.keys())
+        self.__seats = {pid: seat for seat, pid in enumerate(self.__pids)}
+        self.__ring = {
+            pid: self.__pids[(seat + 1) % len(self.__pids)]
+            for seat, pid in enumerate(self.__pids)
+        }
+        self.__team()
+
+    def __team(self) -> None:
+        players = self.__players.values()
+        self.__attackers = frozenset(p.pid for p in players if not p.defender)
+        self.__defenders = frozenset(p.pid for p in players if p.defender)
+
     def json(self) -> list[dict]:
         return [player.json() for player in self.__players.values()]
 
     def add(self, name: str, sid: str) -> Player:
-        player = Player(next(self.__player_ids), name, sid)
+        player = Player(self.__next_pid, name, sid)
+        self.__next_pid += 1
         self.__players[player.pid] = player
+        self.__seat()
         return player
 
     def remove(self, pid: int) -> Player:
-        return self.__players.pop(pid)
+        player = self.__players.pop(pid)
+        self.__seat()
+        return player
 
     def first(self) -> Player:
         return next(iter(self.__players.values()))
@@ -36,16 +69,18 @@ class Players:
     def next(self, pid: int, increment=1) -> int:
         if pid not in self.__players:
             raise KeyError(f"No player found for pid: {pid}.")
-        pids = list(self.__players.keys())
-        return pids[(pids.index(pid) + increment) % len(self.__players)]
+        if increment == 1:
+            return self.__ring[pid]
+        return self.__pids[(self.__seats[pid] + increment) % len(self.__pids)]
 
     def assign_fixed_team(self, pid: int):
         for i in range(len(self.__players)):
             self[pid].defender = i % 2 == 0
             pid = self.next(pid)
+        self.__team()
 
-    def attackers(self) -> list[int]:
-        return [player.pid for player in self.__players.values() if not player.defender]
+    def attackers(self) -> frozenset[int]:
+        return self.__attackers
 
-    def defenders(self) -> list[int]:
-        return [player.pid for player in self.__players.values() if player.defender]
+    def defenders(self) -> frozenset[int]:
+        return self.__defenders
@@ -0,0 +1,115 @@
+from unittest import TestCase
+
+from abstractions import CardsEvent, Event, JoinEvent, PlayerEvent, Room
+from core import Player
+from core.bots import Bot
+from core.game import Game
+from core.match import Match, MatchSettings
+from core.players import Players
+from core.trick import Trick
+from core.updates import GamePhase
+from testing import initialize
+from testing.hearts import H4, H5, H6, H7
+from testing.spades import S2, S3, S4, S5, S6, S7, S8, S9, SA, SJ, SK, SQ, ST
+
+
+class BotTests(TestCase):
+    def game(self, hand: list) -> tuple[Game, Player]:
+        players = Players([Player(i, "", "") for i in range(4)])
+        game = Game(players, Room(Event("", {"matchId": 0})), 0)
+        players[0].draw(initialize(hand))
+        return game, players[0]
+
+    def test_bot_bid(self) -> None:
+        cases = [
+            # Trump rank card of a long suit
+            ([S2, S3, S4, H5], [0]),
+            # Suit too short for a quarter of the hand
+            ([S2, S3, H4, H5, H6, H7, H4, H5, H6, H7, H4, H5, H6], []),
+            # No trump rank card
+            ([S3, S4, H5], []),
+        ]
+        for hand, bid in cases:
+            with self.subTest(hand=hand):
+                game, player = self.game(hand)
+                cards = Bot().bid(game, player)
+                self.assertListEqual(bid, [card.id for card in cards])
+
+    def test_bot_kitty(self) -> None:
+        # Points, pairs and then the highest cards are kept
+        hand = [S3, S3, S4, S6, S7, S8, S9, SK, S5, SA, H4, H6, H7]
+        game, player = self.game(hand)
+        kitty = Bot().kitty(game, player)
+        self.assertSetEqual({2, 3, 4, 5, 6, 10, 11, 12}, {card.id for card in kitty})
+
+    def test_bot_follows_toss(self) -> None:
+        # Toss of a pair and singles, with thousands of follows in suit
+        faces = [S3, S4, S5, S6, S7, S8, S9, ST, SJ, SQ, SK]
+        lead = [SA, SA, SK, SQ, SJ, ST, S9, S8]
+        game, _ = self.game([])
+        cards = initialize([face for face in faces for _ in range(2)] + lead)
+        leader, player = game.players[0], game.players[1]
+        leader.draw(cards[22:])
+        player.draw(cards[:22])
+
+        game.phase = GamePhase.PLAY
+        game._active_pid = 1
+        trick = Trick(4, game.order)
+        trick.play(leader, cards[22:])
+        game._tricks.append(trick)
+        trick.play(player, Bot().play(game, player))
+
+    def test_bots_play_match(self) -> None:
+        for debug in [False, True]:
+            with self.subTest(debug=debug):
+                self.play_match(debug)
+
+    def play_match(self, debug: bool) -> None:
+        settings = MatchSettings({"seats": 4, "bots": 3, "debug": debug})
+        match = Match(0, settings, 0)
+        room = Room(Event("", {"matchId": 0}))
+        match.join(JoinEvent("human", {"matchId": 0, "playerName": "Human"}), room)
+
+        # Bots fill the other seats and have no socket
+        self.assertListEqual(
+            [(False, "human"), (True, ""), (True, ""), (True, "")],
+            [(player.bot, player.sid) for player in match.players],
+        )
+
+        calls = {
+            "draw": match.draw,
+            "bid": match.bid,
+            "kitty": match.kitty,
+            "play": match.play,
+            "next": match.next,
+        }
+        bot, human = Bot(), match.players[0]
+        game = match.game
+        while game.phase != GamePhase.END:
+            # Bots act on their own, the human acts like a bot when bots wait
+            events = match.bot_events()
+            self.assertEqual(bool(events), match.bots_can_act())
+            if events:
+                name, event = events[0]
+                calls[name](event, room)
+                continue
+            self.assertEqual(human.pid, game.active_pid)
+            payload = {"matchId": 0, "playerId": human.pid}
+            if game.phase == GamePhase.DRAW:
+                match.draw(PlayerEvent("human", payload), room)
+            elif game.phase == GamePhase.KITTY:
+                payload["cards"] = [c.json() for c in bot.kitty(game, human)]
+                match.kitty(CardsEvent("human", payload), room)
+            else:
+                payload["cards"] = [c.json() for c in bot.play(game, human)]
+                match.play(CardsEvent("human", payload), room)
+
+        # Bots get ready for the next game, which waits for the human, also in debug
+        # mode where the human's next starts it
+        self.assertTrue(match.bots_can_act())
+        self.assertListEqual(["next"] * 3, [name for name, _ in match.bot_events()])
+        for name, event in match.bot_events():
+            calls[name](event, room)
+        self.assertFalse(match.bots_can_act())
+        self.assertListEqual([], match.bot_events())
+        self.assertIs(game, match.game)
@@ -0,0 +1,28 @@
+from unittest import TestCase
+
+from core.cache import Cache
+
+
+class CacheTests(TestCase):
+    def test_cache_get(self) -> None:
+        cache: Cache[int, str] = Cache(2)
+
+        self.assertEqual("0", cache.get(0, lambda: "0"))
+        self.assertEqual("0", cache.get(0, lambda: "zero"))
+        self.assertEqual("1", cache.get(1, lambda: "1"))
+        self.assertDictEqual(
+            {"size": 2, "capacity": 2, "hits": 1, "misses": 2, "evictions": 0},
+            cache.json(),
+        )
+
+    def test_cache_evicts_least_recently_used(self) -> None:
+        cache: Cache[int, str] = Cache(2)
+        cache.get(0, lambda: "0")
+        cache.get(1, lambda: "1")
+        cache.get(0, lambda: "0")
+        cache.get(2, lambda: "2")
+
+        self.assertEqual(2, len(cache))
+        self.assertEqual(1, cache.evictions)
+        self.assertEqual("0", cache.get(0, lambda: "zero"))
+        self.assertEqual("one", cache.get(1, lambda: "one"))
@@ -4,10 +4,10 @@ from unittest import TestCase
 
 from abstractions import Card, Cards, PlayerError, Suit
 from core import Order
-from core.format import Format
+from core.format import FOLLOWS, PLANS, Format
 from core.unit import Pair, Single, Tractor
 from testing import JB, JR, initialize
-from testing.diamonds import D2, D3, D4, D5, D6, D7, D8, D9
+from testing.diamonds import D2, D3, D4, D5, D6, D7, D8, D9, DK
 from testing.hearts import H2, H3, H4, H5, H6, H7, H8, HA, HK
 from testing.spades import S2, S3, S4, S5, S6, S7, S8, S9, SA, SJ, SK, ST
 
@@ -274,7 +274,123 @@ class FormatCreateTests(TestCase):
                     self.assertTrue(highest.matches(single.highest))
 
 
+class FormatCacheTests(TestCase):
+    def test_format_create_shares_plans(self) -> None:
+        order = Order(2)
+        order.reset(Suit.SPADE)
+        PLANS.clear()
+
+        # Same faces with different ids, then the same faces under a different trump
+        one = Format(order, initialize([S3, S3, S4, S4, S6]))
+        two = Format(order, initialize([S6, S4, S3, S4, S3]))
+        self.assertEqual(1, PLANS.hits)
+        self.assertEqual(1, PLANS.misses)
+        order.reset(Suit.HEART)
+        Format(order, initialize([S3, S3, S4, S4, S6]))
+        self.assertEqual(2, PLANS.misses)
+
+        # Units are never shared between formats
+        self.assertEqual(1, len(one.tractors))
+        self.assertEqual(1, len(two.tractors))
+        self.assertIsNot(one.tractors[0], two.tractors[0])
+        self.assertIsNot(one.tractors[0].pairs[0], two.tractors[0].pairs[0])
+        self.assertEqual(1, two.tractors[0].highest.id)
+
+    def test_format_validate_follow_shares_outcomes(self) -> None:
+        order = Order(2)
+        order.reset(Suit.JOKER)
+        FOLLOWS.clear()
+
+        # Structurally identical follows in different suits share the outcome
+        for suit in [
+            [S3, S3, S8, S8, S7, S7, S5, S5, S4],
+            [H3, H3, H8, H8, H7, H7, H5, H5, H4],
+        ]:
+            cards = initialize(suit)
+            lead, hand = Format(order, cards[:2]), cards[2:]
+
+            with self.assertRaises(PlayerError) as context:
+                lead.validate_follow(hand[1:3], hand)
+            self.assertListEqual(hand[0:-1], context.exception.hint_cards)
+
+            lead.validate_follow(hand[2:4], hand)
+            self.assertListEqual(hand[2:4], lead.pairs[0].match.cards)
+            lead.reset()
+
+        self.assertEqual(2, FOLLOWS.hits)
+        self.assertEqual(2, FOLLOWS.misses)
+
+    def test_format_validate_follow_keeps_trumps(self) -> None:
+        order = Order(2)
+        order.reset(Suit.HEART)
+        FOLLOWS.clear()
+
+        # Hands of the same relative orders and suits, but only one of trumps
+        cards = initialize([S3, S3, S2, HA, SA, DK])
+        lead = Format(order, cards[:2])
+        lead.validate_follow(cards[2:4], cards[2:4])
+        lead.reset()
+        with self.assertRaises(PlayerError):
+            lead.validate_follow(cards[4:], cards[4:])
+        self.assertEqual(0, FOLLOWS.hits)
+
+
+class FormatRemoveTests(TestCase):
+    def test_format_remove(self) -> None:
+        order = Order(2)
+        order.reset(Suit.SPADE)
+
+        cases = [
+            # Pair removed from the middle of a tractor
+            ([S3, S3, S4, S4, S5, S5, S6, S6, S8, S8, S9], [4, 5]),
+            # Single removed from a tractor
+            ([S3, S3, S4, S4, S5, S5, S8, S8, S9], [2]),
+            # Trump rank pair removed, a peer pair joins the tractor
+            ([H2, H2, D2, D2, SA, SA, SK, S9], [0, 1]),
+            # Singles re-paired with the remainder of a pair
+            ([S3, S3, S3, S4, S4, S9], [1]),
+        ]
+
+        for setup in cases:
+            with self.subTest(setup=setup):
+                (raw_cards, removed) = setup
+                cards = initialize(raw_cards)
+                format = Format(order, cards)
+                format.remove(removed)
+                expected = Format(order, [c for c in cards if c.id not in removed])
+
+                self.assertEqual(expected.length, format.length)
+                for expected_units, units in [
+                    (expected.tractors, format.tractors),
+                    (expected.pairs, format.pairs),
+                    (expected.singles, format.singles),
+                ]:
+                    self.assertEqual(len(expected_units), len(units))
+                    for expected_unit, unit in zip(expected_units, units):
+                        self.assertEqual(expected_unit.length, unit.length)
+                        self.assertTrue(expected_unit.highest.matches(unit.highest))
+
+
 class FormatBeatTests(TestCase):
+    def test_format_signature(self) -> None:
+        order = Order(2)
+        order.reset(Suit.SPADE)
+
+        cases = [
+            ([H3], ((1, (), 0, 1), (27,))),
+            ([H3, H3, H5, H5, H7], ((5, (), 2, 1), (25, 23))),
+            (
+                [JR, JR, JB, JB, S9, S9, S8, S8, H2, H2, SA],
+                ((11, (4, 4), 1, 1), (0, 3, 4)),
+            ),
+        ]
+
+        for setup, expected in cases:
+            with self.subTest(setup=setup, expected=expected):
+                format = Format(order, initialize(setup))
+                self.assertEqual(expected, format.signature)
+                self.assertEqual(expected, Format(order, initialize(setup)).signature)
+
     def test_format_beat_length_mismatch(self) -> None:
         order = Order(2)
         order.reset(Suit.SPADE)
@@ -518,11 +634,11 @@ class FormatResolvePlayTests(TestCase):
 
                 with self.assertRaises(PlayerError) as context:
                     lead.validate_follow(play, hand)
-                self.assertEqual("Illegal format for pair", context.exception._title)
+                self.assertEqual("Illegal format for pair", context.exception.title)
                 self.assertEqual(
-                    "There are available pairs to play.", context.exception._message
+                    "There are available pairs to play.", context.exception.message
                 )
-                self.assertListEqual(hand[0:-1], context.exception._hint_cards)
+                self.assertListEqual(hand[0:-1], context.exception.hint_cards)
 
     def test_format_validate_follow_tractor_with_complement(self) -> None:
         order = Order(2)
@@ -621,6 +737,20 @@ class FormatResolvePlayTests(TestCase):
 
                 with self.assertRaises(PlayerError) as context:
                     lead.validate_follow(play, hand)
-                self.assertEqual("Illegal format for tractor", context.exception._title)
-                self.assertEqual(message, context.exception._message)
-                self.assertListEqual(hint, context.exception._hint_cards)
+                self.assertEqual("Illegal format for tractor", context.exception.title)
+                self.assertEqual(message, context.exception.message)
+                self.assertListEqual(hint, context.exception.hint_cards)
+
+    def test_format_validate_follow_budget(self) -> None:
+        order = Order(2)
+        lead = Format(order, initialize([S3, S3, S4, S4, S6, S7, S8]))
+        hand = initialize([SK, SK, SJ, SJ, S9, S8, S7, S6, S5])
+        play = [hand[i] for i in [0, 1, 2, 3, 4, 5, 6]]
+
+        # The same follow matches the lead's singles within the budget, and is
+        # accepted without matching any unit past it, as follows cannot be split
+        lead.validate_follow(play, hand)
+        self.assertTrue(all(single.match is not None for single in lead.singles))
+        lead.reset()
+        lead.validate_follow(play, hand, 10)
+        self.assertTrue(all(unit.match is None for unit in lead.units))
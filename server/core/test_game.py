@@ -1,6 +1,8 @@
+from collections import Counter
+from random import Random
 from unittest import TestCase
 
-from abstractions import Event, Room
+from abstractions import KEYS, Event, Room
 from core import Order, Player
 from core.format import Format
 from core.game import Game
@@ -11,6 +13,23 @@ from testing.spades import S2, S5
 
 
 class GameTests(TestCase):
+    def test_game_deck(self) -> None:
+        def deck(seed: int) -> list[tuple[int, int]]:
+            players = Players([Player(i, "", "") for i in range(4)])
+            game = Game(players, Room(Event("", {"matchId": 0})), 0, rng=Random(seed))
+            return [(card.id, card.key) for card in game._deck]
+
+        # Two full decks with ids in deck order
+        cards = deck(0)
+        self.assertListEqual(list(range(108)), [id for id, _ in cards])
+        self.assertEqual(
+            Counter({key: 2 for key in KEYS.values()}), Counter(k for _, k in cards)
+        )
+
+        # Decks are reproducible from the seed
+        self.assertListEqual(cards, deck(0))
+        self.assertNotEqual(cards, deck(1))
+
     def test_end_players_level_up(self) -> None:
         cases = [
             # Attackers + 4
@@ -0,0 +1,140 @@
+from random import Random
+from unittest import TestCase
+
+from abstractions import Cards, Suit
+from core import Order, Player
+from core.format import Format
+from core.legal import Legal
+from core.trick import Trick
+from testing import JB, initialize
+from testing.diamonds import D2, D3, D9
+from testing.hearts import H3, H5, HA
+from testing.spades import S2, S3, S4, S5, S6, S7, S8, S9, SA, SJ, SK, SQ, ST
+
+
+class LegalTests(TestCase):
+    def player(self, id: int, cards: Cards) -> Player:
+        player = Player(id, "", "")
+        player.draw(cards)
+        return player
+
+    # Plays by the positions of their cards
+    def positions(self, legal: Legal) -> set[tuple[int, ...]]:
+        return {tuple(sorted(card.id for card in play)) for play in legal}
+
+    def test_legal_leads(self) -> None:
+        order = Order(2)
+        order.reset(Suit.HEART)
+        cases = [
+            # Singles of each face and pairs
+            ([S3, S3, H5, JB], {(0,), (2,), (3,), (0, 1)}),
+            # Pairs and tractors, but not tosses
+            (
+                [S3, S3, S4, S4, S6, S6],
+                {(0,), (2,), (4,), (0, 1), (2, 3), (4, 5), (0, 1, 2, 3)},
+            ),
+            # Trump rank pairs of different suits are not tractors, but each forms
+            # tractors with the next trump
+            ([H3, H3, D2, D2, S2, S2], {(0,), (2,), (4,), (0, 1), (2, 3), (4, 5)}),
+            (
+                [D2, D2, S2, S2, HA, HA],
+                {(0,), (2,), (4,), (0, 1), (2, 3), (4, 5), (0, 1, 4, 5), (2, 3, 4, 5)},
+            ),
+        ]
+        for raw_cards, plays in cases:
+            with self.subTest(raw_cards=raw_cards):
+                legal = Legal(order, self.player(0, initialize(raw_cards)), None)
+                self.assertSetEqual(plays, self.positions(legal))
+                self.assertEqual(len(plays), legal.count())
+
+    def test_legal_follows(self) -> None:
+        order = Order(2)
+        order.reset(Suit.HEART)
+        cases = [
+            # Single followed in suit, or by any card
+            ([S3], [S4, S4, S6, H3], {(0,), (2,)}),
+            ([S3], [D3, H3], {(0,), (1,)}),
+            # Pair followed by a pair, or by any cards in suit
+            ([S3, S3], [S4, S6, S6, H3], {(1, 2)}),
+            ([S3, S3], [S4, S6, S7, H3], {(0, 1), (0, 2), (1, 2)}),
+            # Partial follow completed by any cards
+            ([S3, S3], [S4, D3, D3, H3], {(0, 1), (0, 3)}),
+            # Tractor followed by a tractor, then by pairs, then by singles
+            ([S3, S3, S4, S4], [S6, S6, S7, S7, S9, S9], {(0, 1, 2, 3)}),
+            ([S3, S3, S4, S4], [S6, S6, S8, S8, S9], {(0, 1, 2, 3)}),
+            (
+                [S3, S3, S4, S4],
+                [S6, S6, S8, S9, SK],
+                {(0, 1, 2, 3), (0, 1, 2, 4), (0, 1, 3, 4)},
+            ),
+            # Toss followed by its units
+            (
+                [SA, SA, SK],
+                [S6, S6, S7, S8, S8],
+                {(0, 3, 4), (2, 3, 4), (0, 1, 2), (0, 1, 3)},
+            ),
+        ]
+        for lead, hand, plays in cases:
+            with self.subTest(lead=lead, hand=hand):
+                cards = initialize(hand + lead)
+                format = Format(order, cards[len(hand) :])
+                legal = Legal(order, self.player(1, cards[: len(hand)]), format)
+                self.assertSetEqual(plays, self.positions(legal))
+                self.assertEqual(len(plays), legal.count())
+
+                # Every play is accepted by tricks, samples are legal plays
+                for play in legal:
+                    trick = Trick(2, order)
+                    trick.play(self.player(0, cards[len(hand) :]), cards[len(hand) :])
+                    trick.play(self.player(1, cards[: len(hand)]), play)
+                rng = Random(0)
+                for _ in range(10):
+                    sample = legal.sample(rng)
+                    self.assertIn(tuple(sorted(card.id for card in sample)), plays)
+
+    def test_legal_partial_follow_counts(self) -> None:
+        order = Order(2)
+        order.reset(Suit.HEART)
+        cards = initialize([S3, S3, S4, S4, S6, D3, D3, S8, S8, S9])
+        lead = Format(order, cards[:5])
+        legal = Legal(order, self.player(1, cards[5:]), lead)
+
+        # All cards in suit, completed by 2 of the 2 diamonds
+        self.assertEqual(1, legal.count())
+        self.assertListEqual(
+            [cards[5:]], [sorted(play, key=lambda c: c.id) for play in legal]
+        )
+
+        # Without cards in suit, any 3 cards of the 3 faces
+        cards = initialize([S3, S3, S4, D3, D3, D9, D9, H5])
+        lead = Format(order, cards[:3])
+        legal = Legal(order, self.player(1, cards[3:]), lead)
+        self.assertEqual(5, legal.count())
+        self.assertEqual(5, len(set(self.positions(legal))))
+
+    def test_legal_toss_follows(self) -> None:
+        order = Order(2)
+        order.reset(Suit.HEART)
+        pairs = [S3, S4, S5, S6, S7, S8, S9, ST, SJ, SQ, SK, SA]
+        cases = [
+            # Singles followed by any cards in suit, counted without generating them:
+            # any 6 cards of 10 pairs, and any 8 cards of 12 pairs
+            ([SA, SK, SQ, SJ, ST, S9], pairs[:10], 2850),
+            ([SA, SK, SQ, SJ, ST, S9, S8, S7], pairs, 28314),
+            # Follows of a pair and singles are generated up to the limit
+            ([SA, SA, SK, SQ, SJ, ST, S9, S8], pairs[:11], Legal.LIMIT),
+        ]
+        for lead, faces, count in cases:
+            with self.subTest(lead=lead):
+                hand = [face for face in faces for _ in range(2)]
+                cards = initialize(hand + lead)
+                format = Format(order, cards[len(hand) :])
+                legal = Legal(order, self.player(1, cards[: len(hand)]), format)
+                self.assertEqual(count, legal.count())
+
+                # Samples are accepted by tricks
+                rng = Random(0)
+                for _ in range(10):
+                    trick = Trick(2, order)
+                    trick.play(self.player(0, cards[len(hand) :]), cards[len(hand) :])
+                    trick.play(self.player(1, cards[: len(hand)]), legal.sample(rng))
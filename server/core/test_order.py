@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+from abstractions import Suit
+from core import Order
+from testing import JB, JR, initialize
+from testing.diamonds import D2, DA
+from testing.hearts import H2, H3, HA
+from testing.spades import S2, S3, SA
+
+
+class OrderTests(TestCase):
+    def test_order_of(self) -> None:
+        cases = [
+            # No trump suit
+            (Suit.JOKER, [JR, JB, S2, SA, S3], [0, 1, 2, 3, 14]),
+            # Trump suit
+            (Suit.SPADE, [JR, JB, S2, H2, SA, S3, HA, H3], [0, 1, 2, 3, 4, 15, 16, 27]),
+        ]
+
+        for setup in cases:
+            with self.subTest(setup=setup):
+                (trump_suit, raw_cards, expected) = setup
+                order = Order(2)
+                order.reset(trump_suit)
+                cards = initialize(raw_cards)
+                self.assertListEqual(expected, [order.of(card) for card in cards])
+
+    def test_order_is_trump_and_same(self) -> None:
+        order = Order(2)
+        order.reset(Suit.HEART)
+        [JBCard, H3Card, S2Card, D2Card, DACard, SACard] = initialize(
+            [JB, H3, S2, D2, DA, SA]
+        )
+
+        self.assertTrue(order.is_trump(JBCard))
+        self.assertTrue(order.is_trump(H3Card))
+        self.assertTrue(order.is_trump(S2Card))
+        self.assertFalse(order.is_trump(DACard))
+        self.assertTrue(order.same(S2Card, D2Card))
+        self.assertTrue(order.same(SACard, DACard))
+        self.assertFalse(order.same(H3Card, DACard))
+
+    def test_order_reset(self) -> None:
+        order = Order(2)
+        [HACard, SACard] = initialize([HA, SA])
+
+        order.reset(Suit.SPADE)
+        self.assertTrue(order.is_trump(SACard))
+        self.assertEqual(4, order.of(SACard))
+        order.reset(Suit.HEART)
+        self.assertFalse(order.is_trump(SACard))
+        self.assertEqual(4, order.of(HACard))
+        self.assertEqual(16, order.of(SACard))
@@ -0,0 +1,106 @@
+from unittest import TestCase
+
+from abstractions import Card, Suit
+from core import Highest, Order, Player
+from testing import JB, initialize
+from testing.hearts import H2, H3, HA
+from testing.spades import S3, S4, S5, S6, S7, S9, SA, SK
+
+
+class PlayerTests(TestCase):
+    def test_player_has_cards(self) -> None:
+        cards = initialize([S3, S3, S4, H3])
+        player = Player(0, "", "")
+        self.assertFalse(player.has_cards())
+        player.draw(cards)
+
+        cases = [
+            # Cards in hand
+            (cards[0:2], True),
+            (cards, True),
+            # Duplicate cards
+            ([cards[0], cards[0]], False),
+            # Card not in hand
+            ([Card(4, Suit.SPADE, 3)], False),
+            # Card id in hand with a different face
+            ([Card(3, Suit.SPADE, 3)], False),
+            # Card ids sent by clients outside of the deck
+            ([Card(-1, Suit.SPADE, 3)], False),
+            ([Card(10**9, Suit.SPADE, 3)], False),
+            ([cards[0], Card(-1, Suit.SPADE, 3)], False),
+        ]
+
+        for setup, expected in cases:
+            with self.subTest(setup=setup, expected=expected):
+                self.assertTrue(player.has_cards())
+                self.assertEqual(expected, player.has_cards(setup))
+
+    def test_player_play(self) -> None:
+        cards = initialize([S3, S3, S4, S5])
+        player = Player(0, "", "")
+        player.draw(cards)
+        self.assertEqual(2, player.count(cards[0]))
+
+        player.play([cards[1], cards[3]])
+        self.assertListEqual([cards[0], cards[2]], player.hand)
+        self.assertEqual(1, player.count(cards[0]))
+        self.assertEqual(0, player.count(cards[3]))
+        self.assertFalse(player.has_cards([cards[1]]))
+        self.assertTrue(player.has_cards([cards[0], cards[2]]))
+
+        player.play([cards[0], cards[2]])
+        self.assertFalse(player.has_cards())
+
+    def test_player_cards_in_suit(self) -> None:
+        [JBCard, H2Card, H3Card, HACard, S3Card, SACard] = cards = initialize(
+            [JB, H2, H3, HA, S3, SA]
+        )
+        order = Order(2)
+        player = Player(0, "", "")
+        player.draw(cards[0:3])
+
+        # Buckets are sorted by order and maintained on draw and play
+        self.assertListEqual(
+            [JBCard, H2Card], player.cards_in_suit(order, Suit.HEART, True)
+        )
+        self.assertListEqual([H3Card], player.cards_in_suit(order, Suit.HEART, False))
+        player.draw(cards[3:])
+        player.play([JBCard])
+        self.assertListEqual([H2Card], player.cards_in_suit(order, Suit.HEART, True))
+        self.assertListEqual(
+            [HACard, H3Card], player.cards_in_suit(order, Suit.HEART, False)
+        )
+        self.assertListEqual(
+            [SACard, S3Card], player.cards_in_suit(order, Suit.SPADE, False)
+        )
+
+        # Buckets are rebuilt on trump changes
+        order.reset(Suit.SPADE)
+        self.assertListEqual(
+            [H2Card, SACard, S3Card], player.cards_in_suit(order, Suit.SPADE, True)
+        )
+        self.assertListEqual([], player.cards_in_suit(order, Suit.SPADE, False))
+        self.assertListEqual(
+            [HACard, H3Card], player.cards_in_suit(order, Suit.HEART, False)
+        )
+
+    def test_player_highest(self) -> None:
+        cards = initialize([S3, S3, S4, S4, S5, S5, S7, S7, S9, SK, H3, H3, JB])
+        order = Order(2)
+        order.reset(Suit.HEART)
+        player = Player(0, "", "")
+        player.draw(cards)
+        lowest = Highest.LOWEST
+
+        # Tractors of each length are indexed from the highest run of pairs
+        self.assertEqual(Highest(17, 23, (25, 25)), player.highest(order, Suit.SPADE))
+        self.assertEqual(Highest(1, 15, ()), player.highest(order, Suit.JOKER))
+        self.assertEqual(Highest(lowest, lowest, ()), player.highest(order, Suit.CLUB))
+
+        # Indexes are updated when cards in the suit change
+        player.play(cards[4:5])
+        self.assertEqual(Highest(17, 23, (26,)), player.highest(order, Suit.SPADE))
+        player.draw(initialize([S6, S6]))
+        self.assertEqual(Highest(17, 23, (23,)), player.highest(order, Suit.SPADE))
+        player.play(cards[7:8])
+        self.assertEqual(Highest(17, 24, (26,)), player.highest(order, Suit.SPADE))
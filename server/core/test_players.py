@@ -0,0 +1,45 @@
+from unittest import TestCase
+
+from core.players import Players
+
+
+class PlayersTests(TestCase):
+    def test_players_next(self) -> None:
+        players = Players()
+        for _ in range(4):
+            players.add("", "")
+
+        cases = [
+            # Next seat wraps around the ring
+            ((0, 1), 1),
+            ((3, 1), 0),
+            # Seats further away
+            ((1, 2), 3),
+            ((3, 3), 2),
+        ]
+        for setup, expected in cases:
+            with self.subTest(setup=setup, expected=expected):
+                self.assertEqual(expected, players.next(*setup))
+
+        # Ring is rebuilt when players leave and join
+        players.remove(1)
+        self.assertEqual(2, players.next(0))
+        players.add("", "")
+        self.assertEqual(4, players.next(3))
+        self.assertEqual(0, players.next(4))
+        with self.assertRaises(KeyError):
+            players.next(1)
+
+    def test_players_teams(self) -> None:
+        players = Players()
+        for _ in range(4):
+            players.add("", "")
+
+        players.assign_fixed_team(1)
+        self.assertSetEqual({1, 3}, players.defenders())
+        self.assertSetEqual({0, 2}, players.attackers())
+
+        # Teams are updated when players leave
+        players.remove(3)
+        self.assertSetEqual({1}, players.defenders())
+        self.assertSetEqual({0, 2}, players.attackers())
@@ -0,0 +1,64 @@
+from unittest import TestCase
+
+from abstractions import Cards, Suit
+from core import Order, Player
+from core.trace import DRAIN, Decision, Tracer
+from core.trick import Trick
+from testing import initialize
+from testing.hearts import H3, H4
+from testing.spades import S3, S4, S5
+
+
+class TracerTests(TestCase):
+    def player(self, id: int, cards: Cards) -> Player:
+        player = Player(id, "", "")
+        player.draw(cards)
+        return player
+
+    def test_tracer_trick_decisions(self) -> None:
+        order = Order(2)
+        order.reset(Suit.SPADE)
+        tracer = Tracer(0)
+        trick = Trick(4, order, tracer=tracer)
+        plays = [[H4, H4], [H3, S3], [S4, S4], [S3, S5]]
+
+        for pid, play in enumerate(plays):
+            cards = initialize(play)
+            trick.play(self.player(pid, cards), cards)
+
+        self.assertListEqual(
+            [
+                (0, Decision.LEAD, (26,), (26,)),
+                (1, Decision.LOSE_MIXED, (), (26,)),
+                (2, Decision.WIN, (14,), (26,)),
+                (3, Decision.LOSE_SHAPE, (13,), (14,)),
+            ],
+            [
+                (record.pid, record.decision, record.ranks, record.winning_ranks)
+                for record in tracer.drain()
+            ],
+        )
+        self.assertEqual(0, len(tracer))
+
+        # Tricks of a match are numbered in order
+        self.assertEqual(1, tracer.trick())
+
+    def test_tracer_bounded(self) -> None:
+        tracer = Tracer(0, 2)
+        for pid in range(3):
+            tracer.trace(0, pid, Decision.LEAD)
+
+        self.assertEqual(1, tracer.dropped)
+        self.assertListEqual([1, 2], [record.pid for record in tracer.drain()])
+
+    def test_tracer_drain_to_log(self) -> None:
+        tracer = Tracer(7)
+
+        # Records are logged by this flush, or by a background flush it waits for
+        with self.assertLogs(level="INFO") as logs:
+            tracer.trace(0, 1, Decision.WIN, (2,), (3,))
+            DRAIN.flush()
+        output = [line for line in logs.output if "Match 7 trace:" in line]
+        self.assertEqual(1, len(output))
+        self.assertIn('"decision": "win"', output[0])
+        self.assertEqual(0, len(tracer))
@@ -2,17 +2,18 @@ from unittest import TestCase
 
 from abstractions import Card, Cards, PlayerError, Suit
 from core import Order, Player
+from core.players import Players
 from core.trick import Trick
 from testing import JB, initialize
-from testing.diamonds import D3, D4
-from testing.hearts import H3, H4, H5, H6, H7
+from testing.diamonds import D2, D3, D4, D5, D6, D7
+from testing.hearts import H2, H3, H4, H5, H6, H7
 from testing.spades import S2, S3, S4, S5, S6, S7, S8, S9, SA, SJ, SK, SQ, ST
 
 
 class TrickPlayTests(TestCase):
     def player(self, id: int, cards: Cards) -> Player:
         player = Player(id, "", "")
-        player._hand = cards
+        player.draw(cards)
         return player
 
     def test_trick_play_enforce_non_empty(self) -> None:
@@ -103,6 +104,102 @@ class TrickPlayTests(TestCase):
                     with self.assertRaises(PlayerError):
                         trick.play(self.player(1, player), play)
 
+    def test_trick_play_enforce_toss(self) -> None:
+        order = Order(2)
+        order.reset(Suit.HEART)
+        cases = [
+            # No other player can beat any unit
+            (([SA, SK, SK], [S9, S9, S8]), None),
+            # Single beaten by a higher single
+            (([SK, S9, S9], [SA, S8, S8]), [0]),
+            # Pair beaten by a higher pair
+            (([SA, S8, S8], [S9, S9, S7]), [1, 2]),
+            # Tractor beaten by a higher tractor of the same length
+            (([SA, S7, S7, S6, S6], [S9, S9, S8, S8]), [1, 2, 3, 4]),
+            # Tractor not beaten by a longer lower tractor or a higher pair
+            (([SA, S8, S8, S7, S7], [S9, S9, S6, S6, S5, S5, S4, S4]), None),
+            # Trump toss beaten by a trump pair
+            (([JB, H3, H3], [H2, H2]), [1, 2]),
+        ]
+        for setup, expected in cases:
+            with self.subTest(setup=setup, expected=expected):
+                (lead, other) = setup
+                cards = initialize(lead + other)
+                lead, other = cards[: len(lead)], cards[len(lead) :]
+                players = Players([self.player(0, lead), self.player(1, other)])
+                trick = Trick(2, order, players)
+                if expected is None:
+                    self.assertIsNone(trick.play(players[0], lead))
+                else:
+                    with self.assertRaises(PlayerError) as context:
+                        trick.play(players[0], lead)
+                    self.assertEqual("Invalid toss", context.exception.title)
+                    self.assertListEqual(
+                        [lead[i] for i in expected], context.exception.hint_cards
+                    )
+
+    def test_trick_play_fast_follow(self) -> None:
+        order = Order(2)
+        order.reset(Suit.SPADE)
+        cases = [
+            # Single followed in suit, off suit and trumped
+            ([H3], [H4, S5], [0]),
+            ([H3], [H4, S5], [1]),
+            ([H3], [D3, S5], [1]),
+            # Pair followed by a pair, singles and must follow pair
+            ([H3, H3], [H5, H5, H6], [0, 1]),
+            ([H3, H3], [H5, H6, S5], [0, 1]),
+            ([H3, H3], [H5, H5, H6], [1, 2]),
+            # Pair followed with partial suit, trumps and must follow suit
+            ([H3, H3], [H5, D3, D4], [0, 1]),
+            ([H3, H3], [S5, S6, D3], [0, 1]),
+            ([H3, H3], [H5, S5, S6], [1, 2]),
+            # Trump pair followed by a peer pair, must follow pair
+            ([S3, S3], [H2, H2, D2], [0, 1]),
+            ([S3, S3], [H2, H2, D2], [0, 2]),
+            # Trump rank pair followed without trumps, in the suit of the lead
+            ([D2, D2], [D5, D6, D7, D7], [0, 1]),
+            # Pair followed by any two cards of a triple
+            ([H3, H3], [H5, H5, H5, H6], [1, 2]),
+            ([H3, H3], [H5, H5, H5, H6], [0, 2]),
+            ([H3, H3], [H5, H5, H5, H6], [2, 3]),
+        ]
+        for setup in cases:
+            with self.subTest(setup=setup):
+                (lead, hand, play) = setup
+                outcomes = []
+                for fast in [True, False]:
+                    Trick._fast_follow = fast
+                    cards = initialize(lead + hand)
+                    trick = Trick(4, order)
+                    trick.play(self.player(0, cards[: len(lead)]), cards[: len(lead)])
+                    hand_cards = cards[len(lead) :]
+                    try:
+                        trick.play(
+                            self.player(1, hand_cards), [hand_cards[i] for i in play]
+                        )
+                        outcomes.append((trick.winner_pid, trick.winning_play.shape))
+                    except PlayerError as error:
+                        outcomes.append((error.message, error.hint_cards))
+                Trick._fast_follow = True
+                self.assertEqual(outcomes[0], outcomes[1])
+
+    def test_trick_play_follow_trump_rank_lead(self) -> None:
+        order = Order(2)
+        order.reset(Suit.HEART)
+        cards = initialize([D2, D2, D2, D5, D6, D7, D7])
+        lead, hand = cards[:3], cards[3:]
+        players = Players([self.player(0, lead), self.player(1, hand)])
+
+        # Trump rank cards of a non-trump suit lead trumps, so cards of their suit
+        # follow them without matching their format, as any other non-trumps
+        for play in [[0, 1, 2], [0, 2, 3]]:
+            with self.subTest(play=play):
+                trick = Trick(2, order, players)
+                trick.play(players[0], lead)
+                trick.play(players[1], [hand[i] for i in play])
+                self.assertEqual(0, trick.winner_pid)
+
     def test_trick_winner_resolution(self) -> None:
         order = Order(2)
         order.reset(Suit.SPADE)
@@ -1,5 +1,7 @@
 from unittest import TestCase
 
+from abstractions import Card
+from core import Order
 from core.unit import Pair, Single, Tractor, Unit
 from testing import initialize
 from testing.spades import S3, S4, S5, S6, S7
@@ -83,3 +85,41 @@ class UnitTests(TestCase):
                 self.assertEqual(len(expected), len(actual))
                 for expected_unit, actual_unit in zip(expected, actual):
                     self.assertEqual(expected_unit.highest, actual_unit.highest)
+
+    def test_format_unit_matches_in_order(self) -> None:
+        [S3Card, S4Card, S5Card, S6Card, S7Card] = initialize([S3, S4, S5, S6, S7])
+        order = Order(2)
+        hand: list[Unit] = [
+            Tractor([Pair([S7Card, S7Card]), Pair([S6Card, S6Card])]),
+            Pair([S4Card, S4Card]),
+            Single(S5Card),
+            Single(S3Card),
+        ]
+
+        cases: list[tuple[Unit, list[Card]]] = [
+            (Single(S3Card), [S7Card, S7Card, S6Card, S6Card, S5Card, S4Card]),
+            (Pair([S3Card, S3Card]), [S7Card, S6Card, S4Card]),
+            (Tractor([Pair([S4Card, S4Card]), Pair([S3Card, S3Card])]), [S7Card]),
+        ]
+
+        for setup, expected in cases:
+            with self.subTest(setup=setup, expected=expected):
+                matches = setup._matches(hand, order)
+                for card in expected:
+                    view = next(matches)
+                    self.assertEqual(card, view.cards[view.start])
+
+    def test_format_unit_resolve(self) -> None:
+        [S5Card, S6Card, S7Card] = initialize([S5, S6, S7])
+        order = Order(2)
+        hand: list[Unit] = [
+            Tractor(
+                [Pair([S7Card, S7Card]), Pair([S6Card, S6Card]), Pair([S5Card, S5Card])]
+            )
+        ]
+        unit = Pair([S5Card, S5Card])
+        play = {S6Card.key: [S6Card, S6Card]}
+
+        self.assertListEqual([S6Card.id, S6Card.id], unit.resolve(play, hand, order))
+        self.assertIsInstance(unit.match, Pair)
+        self.assertEqual(S6Card, unit.match.highest)
@@ -0,0 +1,126 @@
+import json
+import logging
+from collections import deque
+from enum import StrEnum
+from threading import Lock, Thread
+from time import sleep
+from typing import NamedTuple
+from weakref import WeakSet
+
+
+# Rules engine decisions on a play
+class Decision(StrEnum):
+    LEAD = "lead"
+    WIN = "win"
+    LOSE_MIXED = "lose_mixed"  # Follow with mixed suits
+    LOSE_TRUMPS = "lose_trumps"  # Trumps followed with non-trumps
+    LOSE_SUIT = "lose_suit"  # Non-trumps followed with another non-trump suit
+    LOSE_SHAPE = "lose_shape"  # Format shape differs from the winning play
+    LOSE_RANK = "lose_rank"  # Format is not higher than the winning play
+
+
+class Record(NamedTuple):
+    trick: int
+    pid: int
+    decision: Decision
+    # Compared ranks of the play and the winning play, lower is higher
+    ranks: tuple[int, ...]
+    winning_ranks: tuple[int, ...]
+
+    def json(self) -> dict:
+        return {
+            "trick": self.trick,
+            "pid": self.pid,
+            "decision": self.decision,
+            "ranks": self.ranks,
+            "winningRanks": self.winning_ranks,
+        }
+
+
+# Per match bounded buffer of decisions, the oldest are dropped when full.
+# Rules code only traces if it is given a tracer, so disabled tracing is free.
+class Tracer:
+    def __init__(self, match_id: int, capacity: int = 4096) -> None:
+        # Inputs
+        self.match_id = match_id
+
+        # Private
+        self.__records: deque[Record] = deque(maxlen=capacity)
+        self.__next_trick = 0
+
+        # Public
+        self.dropped = 0
+
+        DRAIN.add(self)
+
+    def __len__(self) -> int:
+        return len(self.__records)
+
+    # Unpickled tracers of recovered matches drain like new ones
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        DRAIN.add(self)
+
+    # Unique id within the match of a new trick
+    def trick(self) -> int:
+        trick = self.__next_trick
+        self.__next_trick += 1
+        return trick
+
+    def trace(
+        self,
+        trick: int,
+        pid: int,
+        decision: Decision,
+        ranks: tuple[int, ...] = (),
+        winning_ranks: tuple[int, ...] = (),
+    ) -> None:
+        if len(self.__records) == self.__records.maxlen:
+            self.dropped += 1
+        self.__records.append(Record(trick, pid, decision, ranks, winning_ranks))
+
+    # Remove and return all buffered records, safe to call while tracing
+    def drain(self) -> list[Record]:
+        records = []
+        while self.__records:
+            records.append(self.__records.popleft())
+        return records
+
+
+# Drains the buffers of all live tracers to the log on a background thread
+class Drain:
+    def __init__(self, interval: float) -> None:
+        # Inputs
+        self.__interval = interval
+
+        # Private
+        self.__tracers: WeakSet[Tracer] = WeakSet()
+        self.__lock = Lock()
+        # Flushes run one at a time, so records drained are logged once it returns
+        self.__flushing = Lock()
+        self.__thread: Thread | None = None
+
+    def add(self, tracer: Tracer) -> None:
+        with self.__lock:
+            self.__tracers.add(tracer)
+            if self.__thread is None:
+                self.__thread = Thread(target=self.__run, name="trace", daemon=True)
+                self.__thread.start()
+
+    def __run(self) -> None:
+        while True:
+            sleep(self.__interval)
+            self.flush()
+
+    def flush(self) -> None:
+        with self.__lock:
+            tracers = list(self.__tracers)
+        with self.__flushing:
+            for tracer in tracers:
+                for record in tracer.drain():
+                    logging.info(
+                        f"Match {tracer.match_id} trace: {json.dumps(record.json())}"
+                    )
+
+
+DRAIN = Drain(1.0)
@@ -1,17 +1,57 @@
 from abstractions import Cards, PlayerError, Suit
-from core import Order, Player
+from core import Highest, Order, Player
 from core.format import Format
+from core.players import Players
+from core.trace import Decision, Tracer
+from core.unit import Pair, Tractor, Unit
+
+
+# Whether a play beats the winning play: suited, following its trumps or suit, or
+# trumping it, and higher in the same shape
+def _wins(format: Format, winner: Format) -> bool:
+    if not format.suited or (winner.trumps and not format.trumps):
+        return False
+    if not winner.trumps and not format.trumps and winner.suit != format.suit:
+        return False
+    return format.beats(winner)
+
+
+# Decision on a play that follows the winning play, only resolved when traced
+def _decision(format: Format, winner: Format, won: bool) -> Decision:
+    if won:
+        return Decision.WIN
+    if not format.suited:
+        return Decision.LOSE_MIXED
+    if winner.trumps and not format.trumps:
+        return Decision.LOSE_TRUMPS
+    if not winner.trumps and not format.trumps and winner.suit != format.suit:
+        return Decision.LOSE_SUIT
+    if format.shape != winner.shape:
+        return Decision.LOSE_SHAPE
+    return Decision.LOSE_RANK
 
 
 # Logic for managing tricks comprising of a play from each player
 class Trick:
-    def __init__(self, num_players: int, order: Order) -> None:
+    # Protected for testing, resolve single card and pair follows with lookups
+    _fast_follow = True
+
+    def __init__(
+        self,
+        num_players: int,
+        order: Order,
+        players: Players | None = None,
+        tracer: Tracer | None = None,
+    ) -> None:
         # Inputs
         self.__num_players = num_players
         self.__order = order
+        self.__players = players
+        self.__tracer = tracer
 
         # Private
         self.__lead_pid = -1
+        self.__id = -1 if tracer is None else tracer.trick()
 
         # Protected for testing
         self._plays: dict[int, Format] = {}
@@ -24,6 +64,10 @@ class Trick:
     def ended(self) -> bool:
         return len(self._plays) == self.__num_players
 
+    @property
+    def lead(self) -> Format | None:
+        return self._plays.get(self.__lead_pid)
+
     @property
     def winning_play(self) -> Format:
         return self._plays[self.winner_pid]
@@ -41,7 +85,9 @@ class Trick:
             if not format.suited:
                 raise PlayerError("Invalid play", "Leading play must be suited.")
 
-            # TODO: Enforce toss rules
+            # Enforce toss rules
+            if format.is_toss and self.__players is not None:
+                self.__ensure_toss(self.__players, player, format)
 
             return format
 
@@ -51,6 +97,11 @@ class Trick:
         if len(cards) != lead.length:
             raise PlayerError("Invalid play", "Wrong number of cards.")
 
+        # Single card and pair leads, fall back for errors needing format hints
+        if self._fast_follow and len(lead.units) == 1 and lead.length <= 2:
+            if (format := self.__resolve_simple(player, lead, cards)) is not None:
+                return format
+
         # Enforce follow suit
         hand_cards = player.cards_in_suit(self.__order, lead.suit, lead.trumps)
         required_suit_cards = min(len(hand_cards), lead.length)
@@ -63,8 +114,13 @@ class Trick:
         if not (
             # Need to check if format is all trumps
             format.trumps
-            # Need to check if format matches lead suit and suit is not Suit.UNKNOWN
-            or (format.suit == lead.suit and format.suit != Suit.UNKNOWN)
+            # Need to check if format matches a non-trump lead suit and suit is not
+            # Suit.UNKNOWN, trump rank cards of a trump lead share their suits
+            or (
+                not lead.trumps
+                and format.suit == lead.suit
+                and format.suit != Suit.UNKNOWN
+            )
         ):
             return format
 
@@ -88,6 +144,52 @@ class Trick:
         lead.reset()
         return format
 
+    # A toss is only allowed if no other player can beat any of its units
+    def __ensure_toss(self, players: Players, player: Player, format: Format) -> None:
+        suit = Suit.JOKER if format.trumps else format.suit
+        for other in players:
+            if other.pid == player.pid:
+                continue
+            highest = other.highest(self.__order, suit)
+            for unit in format.units:
+                if self.__beaten(unit, highest):
+                    raise PlayerError(
+                        "Invalid toss",
+                        "Other players can beat part of your toss.",
+                        unit.cards,
+                    )
+
+    # Higher units have lower orders
+    def __beaten(self, unit: Unit, highest: Highest) -> bool:
+        rank = self.__order.of(unit.highest)
+        if isinstance(unit, Tractor):
+            length = len(unit.pairs) - 2
+            return length < len(highest.tractors) and highest.tractors[length] < rank
+        if isinstance(unit, Pair):
+            return highest.pair < rank
+        return highest.single < rank
+
+    # Resolve follows of a single card or pair lead with order lookups. Returns None
+    # when a pair lead is not followed by a pair, the general path raises the error.
+    def __resolve_simple(
+        self, player: Player, lead: Format, cards: Cards
+    ) -> Format | None:
+        order = self.__order
+        suit = Suit.JOKER if lead.trumps else lead.suit
+        hand_cards = player.cards_in_suit(order, lead.suit, lead.trumps)
+        followed = sum(1 for card in cards if order.suit_of(card) == suit)
+
+        # Enforce follow suit
+        if followed < min(len(hand_cards), lead.length):
+            raise PlayerError("Invalid play", "Must follow suit.", hand_cards)
+
+        # Enforce follow pair, any pair in suit must be played
+        if followed == 2 and not cards[0].matches(cards[1]):
+            if any(player.count(card) > 1 for card in hand_cards):
+                return None
+
+        return Format(order, cards)
+
     # Checks legality and update trick states
     def play(self, player: Player, cards: Cards) -> None:
         # Resolve format
@@ -104,16 +206,21 @@ class Trick:
         if self.__lead_pid == -1:
             self.__lead_pid = player.pid
             self.winner_pid = player.pid
-            print("Leading play")
+            if self.__tracer is not None:
+                self.__tracer.trace(
+                    self.__id, player.pid, Decision.LEAD, format.ranks, format.ranks
+                )
         else:
             # Resolve winning hand
             winner = self._plays[self.winner_pid]
-            if not format.suited:
-                print("Losing play: mixed suits")
-            elif winner.trumps and not format.trumps:
-                print("Losing play: did not follow trumps")
-            elif not winner.trumps and not format.trumps and winner.suit != format.suit:
-                print("Losing play: did not follow non trump suit")
-            elif format.beats(winner):
-                print("Winning play")
+            won = _wins(format, winner)
+            if won:
                 self.winner_pid = player.pid
+            if self.__tracer is not None:
+                self.__tracer.trace(
+                    self.__id,
+                    player.pid,
+                    _decision(format, winner, won),
+                    format.ranks,
+                    winner.ranks,
+                )
@@ -1,22 +1,55 @@
 from abc import ABC, abstractmethod
-from itertools import chain
-from typing import Self, TypeVar
+from heapq import merge
+from typing import Iterator, NamedTuple, Self, TypeVar
 
 from abstractions import Card, Cards, PlayerError
 from core import Order
 
 TUnit = TypeVar("TUnit", bound="Unit")
-type CardsDict = dict[int, Card]
+# Cards by their key, copies of a card are interchangeable in a play
+type CardsDict = dict[int, Cards]
 type ints_ = list[int] | None
 
 
+# Candidate match of cards[start:stop], the cards are not copied until matched
+class View(NamedTuple):
+    cards: Cards
+    start: int
+    stop: int
+
+
+# Raised once the work allowed while validating a play is spent
+class BudgetExceeded(Exception):
+    pass
+
+
+# Work allowed while validating a play, counted in cards examined
+class Budget:
+    def __init__(self, limit: int) -> None:
+        # Inputs
+        self.__limit = limit
+
+        # Public
+        self.spent = 0
+
+    def spend(self, work: int) -> None:
+        self.spent += work
+        if self.spent > self.__limit:
+            raise BudgetExceeded
+
+
 class Unit(ABC):
+    __slots__ = ("_cards", "_highest", "_length", "_match", "_root")
+
+    # Name of the unit type in errors
+    _name = "unit"
+
     def __init__(self, cards: Cards) -> None:
         self._cards = cards
         self._highest = cards[0]
         self._length = len(cards)
         self._match: Self | None = None
-        self._name = type(self).__name__.lower()
+        # Name of the lead unit this unit was decomposed from in errors
         self._root = self._name
 
     @property
@@ -35,87 +68,128 @@ class Unit(ABC):
     def match(self) -> Self | None:
         return self._match
 
-    def _matches(self, hand: list[TUnit], order: Order) -> list[Self]:
-        matches: list[Self] = []
-        for unit in hand:
-            matches.extend(unit.decompose_into(self))
-        matches.sort(key=lambda s: order.of(s.highest))
-        return matches
+    # Lazily enumerate matches from all hand units, in order
+    def _matches(self, hand: list[TUnit], order: Order) -> Iterator[View]:
+        views = [unit._views(self) for unit in hand]
+        return merge(*views, key=lambda view: order.of(view.cards[view.start]))
 
-    # Decompose this unit into units of the given type
+    # Create a unit of this type from matched cards
+    @classmethod
     @abstractmethod
-    def decompose_into[T: TUnit](self, unit: T) -> list[T]:
+    def _create(cls, cards: Cards) -> Self:
+        raise NotImplementedError
+
+    # Views of this unit decomposed into units of the given type, in order
+    @abstractmethod
+    def _views(self, unit: "Unit") -> Iterator[View]:
         raise NotImplementedError
 
+    # Decompose this unit into units of the given type
+    def decompose_into[T: TUnit](self, unit: T) -> list[T]:
+        return [unit._create(v.cards[v.start : v.stop]) for v in self._views(unit)]
+
     # Decompose this unit into smaller units of a lower class
     @abstractmethod
     def decompose(self) -> list[TUnit]:
         raise NotImplementedError
 
     # Generate card hints for a given set of matches
-    @abstractmethod
-    def generate_hints(self, matches: list[Self]) -> Cards:
-        raise NotImplementedError
+    def generate_hints(self, views: list[View]) -> Cards:
+        ids = set()
+        cards = [card for cards, start, stop in views for card in cards[start:stop]]
+        return [ids.add(card.id) or card for card in cards if card.id not in ids]
 
-    # Default resolution implementation
-    def _resolve(self, play: CardsDict, matches: list[Self]) -> ints_:
-        for match in matches:
-            ids = [card.id for card in match.cards]
-            if all(id in play for id in ids):
-                self._match = match
-                return ids
+    # Played copies matching the cards of a view, or None if there are too few
+    def _played(self, play: CardsDict, cards: Cards) -> Cards | None:
+        taken: dict[int, int] = {}
+        played: Cards = []
+        for card in cards:
+            copies = play.get(card.key, [])
+            i = taken[card.key] = taken.get(card.key, -1) + 1
+            if i >= len(copies):
+                return None
+            played.append(copies[i])
+        return played
+
+    # Resolution stops at the first match, matches after it are never created.
+    # Views are matched by the keys of the played cards, so any played copies of
+    # the view's cards match it. Without any matches, units that can be decomposed
+    # resolve to None.
+    def resolve(
+        self,
+        play: CardsDict,
+        hand: list[TUnit],
+        order: Order,
+        budget: Budget | None = None,
+    ) -> ints_:
+        views: list[View] = []
+        for view in self._matches(hand, order):
+            cards, start, stop = view
+            if budget is not None:
+                budget.spend(stop - start)
+            if (played := self._played(play, cards[start:stop])) is not None:
+                self._match = self._create(played)
+                return [card.id for card in played]
+            views.append(view)
+
+        if not views and not isinstance(self, Single):
+            return None
 
         raise PlayerError(
             f"Illegal format for {self._root}",
             f"There are available {self._name}s to play.",
-            self.generate_hints(matches),
+            self.generate_hints(views),
         )
 
-    def resolve(self, play: CardsDict, hand: list[TUnit], order: Order) -> ints_:
-        return self._resolve(play, self._matches(hand, order))
-
     def reset(self) -> None:
         self._match = None
 
 
 class Single(Unit):
+    __slots__ = ()
+
+    _name = "single"
+
     def __init__(self, card: Card) -> None:
         super().__init__([card])
 
-    def decompose_into(self, unit: Unit) -> list[Self]:
-        return [self] if isinstance(unit, Single) else []
+    @classmethod
+    def _create(cls, cards: Cards) -> Self:
+        return cls(cards[0])
+
+    def _views(self, unit: Unit) -> Iterator[View]:
+        if isinstance(unit, Single):
+            yield View(self._cards, 0, 1)
 
     # This should never be called
     def decompose(self) -> list[Unit]:
         raise RuntimeWarning(f"{self._name} cannot be decomposed.")
 
-    def generate_hints(self, matches: list[Self]) -> Cards:
-        return [s.highest for s in matches]
-
 
 class Pair(Unit):
+    __slots__ = ("singles", "peers")
+
+    _name = "pair"
+
     def __init__(self, cards: Cards) -> None:
         super().__init__(cards)
         self.singles = [Single(card) for card in cards]
         self.peers: list[Self] = []
 
-    def decompose_into(self, unit: Unit) -> list[Self]:
+    @classmethod
+    def _create(cls, cards: Cards) -> Self:
+        return cls(cards)
+
+    def _views(self, unit: Unit) -> Iterator[View]:
         if isinstance(unit, Pair):
-            return [self]
-        if isinstance(unit, Single):
-            return self.singles
-        return []
+            yield View(self._cards, 0, 2)
+        elif isinstance(unit, Single):
+            yield View(self._cards, 0, 1)
+            yield View(self._cards, 1, 2)
 
     def decompose(self) -> list[Unit]:
         return self.singles
 
-    def generate_hints(self, matches: list[Self]) -> Cards:
-        return [card for pair in matches for card in pair.cards]
-
-    def resolve(self, play: CardsDict, hand: list[Unit], order: Order) -> ints_:
-        if len(matches := self._matches(hand, order)) > 0:
-            return self._resolve(play, matches)
-
     def reset(self) -> None:
         self._match = None
         for single in self.singles:
@@ -123,52 +197,47 @@ class Pair(Unit):
 
 
 class Tractor(Unit):
+    __slots__ = ("pairs",)
+
+    _name = "tractor"
+
     def __init__(self, pairs: list[Pair]) -> None:
         super().__init__([card for pair in pairs for card in pair.cards])
         self.pairs = pairs
         for pair in pairs:
             pair._root = self._name
 
-    def decompose_into(self, unit: Unit) -> list[Self]:
+    @classmethod
+    def _create(cls, cards: Cards) -> Self:
+        return cls([Pair(cards[i : i + 2]) for i in range(0, len(cards), 2)])
+
+    def _views(self, unit: Unit) -> Iterator[View]:
+        cards = self._cards
         if isinstance(unit, Tractor) and self.length >= unit.length:
-            return [
-                Tractor(self.pairs[i : i + len(unit.pairs)])
-                for i in range(len(self.pairs) - len(unit.pairs) + 1)
-            ]
-        if isinstance(unit, Pair):
-            return self.pairs
-        if isinstance(unit, Single):
-            return [Single(card) for card in self.cards]
-        return []
+            length = len(unit.pairs)
+            for i in range(len(self.pairs) - length + 1):
+                yield View(cards, 2 * i, 2 * (i + length))
+                # There can only be one set of equivalent pairs in any suit:
+                # non-trump suit trump rank pairs. We need to substitute the
+                # pair. This implementation isn't robust and must be updated
+                # if two or more equivalent pairs exist in a single Tractor.
+                for j in range(i, i + length):
+                    for peer in self.pairs[j].peers:
+                        peers = cards[2 * i : 2 * j] + peer.cards
+                        peers += cards[2 * (j + 1) : 2 * (i + length)]
+                        yield View(peers, 0, len(peers))
+        elif isinstance(unit, Pair):
+            for i in range(0, self.length, 2):
+                yield View(cards, i, i + 2)
+        elif isinstance(unit, Single):
+            for i in range(self.length):
+                yield View(cards, i, i + 1)
 
     def decompose(self) -> list[Unit]:
         if len(self.pairs) == 2:
             return self.pairs
         return [Tractor(self.pairs[0:-1]), self.pairs[-1]]
 
-    def generate_hints(self, matches: list[Self]) -> Cards:
-        ids = set()
-        cards = [card for tractor in matches for card in tractor.cards]
-        return [ids.add(card.id) or card for card in cards if card.id not in ids]
-
-    def __peers(self) -> list[Self]:
-        peers = [self]
-        for index, pair in enumerate(self.pairs):
-            # There can only be one set of equivalent pairs in any suit:
-            # non-trump suit trump rank pairs. We need to substitute the
-            # pair. This implementation isn't robust and must be updated
-            # if two or more equivalent pairs exist in a single Tractor.
-            for peer in pair.peers:
-                new_match = [p for p in self.pairs]
-                new_match[index] = peer
-                peers.append(Tractor(new_match))
-        return peers
-
-    def resolve(self, play: CardsDict, hand: list[Unit], order: Order) -> ints_:
-        matches = list(chain(*[c.__peers() for c in self._matches(hand, order)]))
-        if len(matches) > 0:
-            return self._resolve(play, matches)
-
     def reset(self) -> None:
         self._match = None
         for pair in self.pairs:
@@ -1,4 +1,5 @@
 from enum import IntEnum
+from typing import Iterable
 
 from abstractions import Cards, Update
 from core import Player
@@ -38,9 +39,10 @@ class StartUpdate(Update):
 
 
 class TeamUpdate(Update):
-    def __init__(self, kitty_pid: int, defenders: list[int]) -> None:
+    def __init__(self, kitty_pid: int, defenders: Iterable[int]) -> None:
         self.kitty_pid = kitty_pid
-        self.defenders = defenders
+        # Pids increase in join order, so sorted pids are in seat order
+        self.defenders = sorted(defenders)
 
     def json(self, _=False) -> dict:
         return {"kittyPid": self.kitty_pid, "defenders": self.defenders}
@@ -55,6 +57,8 @@ class MatchUpdate(Update):
 
 
 class CardsUpdate(Update):
+    __slots__ = ("pid", "next_pid", "cards", "hint_pid", "phase", "score")
+
     def __init__(
         self,
         pid: int,
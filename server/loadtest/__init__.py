@@ -0,0 +1,262 @@
+from random import Random
+from statistics import quantiles
+from threading import Event as Signal
+from threading import Lock
+from time import perf_counter_ns
+
+import engineio
+import socketio
+from abstractions import Card, Cards, Suit
+from core import KITTY_SIZE, Order, Player, Trump
+from core.format import Format
+from core.legal import Legal
+from core.updates import GamePhase, MatchPhase
+
+EVENTS = ["join", "draw", "bid", "kitty", "play", "next"]
+NAMESPACE = "/match"
+
+
+# Latencies and errors of the events sent by load clients, merged across clients
+class Latencies:
+    def __init__(self) -> None:
+        # Nanoseconds from sending each event to the update answering it
+        self.samples: dict[str, list[int]] = {event: [] for event in EVENTS}
+        # Events the server answered with an error, or never answered
+        self.errors = {event: 0 for event in EVENTS}
+        self.lost = {event: 0 for event in EVENTS}
+
+    def merge(self, other: "Latencies") -> None:
+        for event in EVENTS:
+            self.samples[event] += other.samples[event]
+            self.errors[event] += other.errors[event]
+            self.lost[event] += other.lost[event]
+
+    @property
+    def events(self) -> int:
+        return sum(len(samples) for samples in self.samples.values())
+
+    # 50th, 95th and 99th percentiles of the event in milliseconds
+    def percentiles(self, event: str) -> tuple[float, float, float]:
+        if not (samples := self.samples[event]):
+            return 0.0, 0.0, 0.0
+        cuts = quantiles(samples, n=100) if len(samples) > 1 else samples * 99
+        return cuts[49] / 1e6, cuts[94] / 1e6, cuts[98] / 1e6
+
+
+# Updates answering each event sent by a client, events without one are answered
+# by their acknowledgement only
+RESPONSES = {
+    "join": {"join"},
+    "draw": {"draw"},
+    "bid": {"bid"},
+    "kitty": {"kitty"},
+    "play": {"play"},
+    "next": set(),
+}
+
+
+# Event sent by a client, completed once acknowledged and answered
+class Pending:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.start = perf_counter_ns()
+        self.acked = False
+        self.answered = False
+
+
+# Engine.IO client handling messages on its read loop. Clients mirror the game from
+# updates, which must be handled in the order they arrive rather than each on a
+# thread of its own.
+class _OrderedEngineIO(engineio.Client):
+    def _trigger_event(self, event, *args, run_async=False):
+        return super()._trigger_event(event, *args)
+
+
+class _OrderedSocketIO(socketio.Client):
+    def _engineio_client_class(self):
+        return _OrderedEngineIO
+
+
+# Socket client playing one seat of a match the way the webapp does, from the
+# updates it receives only. Hands, trumps and tricks are mirrored with the rules
+# engine, so plays are legal plays of the mirrored hand. Clients have at most one
+# event in flight and act again once it is both acknowledged and answered.
+class LoadClient:
+    def __init__(
+        self, url: str, match_id: int, name: str, seats: int, games: int, rng: Random
+    ) -> None:
+        # Inputs
+        self.__url = url
+        self.__match_id = match_id
+        self.__name = name
+        self.__seats = seats
+        self.__games = games
+        self.__rng = rng
+
+        # Private
+        self.__sio = _OrderedSocketIO(reconnection=False)
+        self.__lock = Lock()
+        self.__pending: Pending | None = None
+        self.__pid = -1
+        self.__player: Player | None = None
+        self.__order = Order(2)
+        self.__phase = GamePhase.DRAW
+        self.__active_pid = -1
+        self.__bid = False
+        self.__drawn: Cards = []
+        self.__lead: Format | None = None
+        self.__trick_plays = 0
+        self.__ended = 0
+        self.__ready = False
+
+        # Public
+        self.latencies = Latencies()
+        self.done = Signal()
+
+        for name in ["join", "start", "draw", "bid", "kitty", "play", "end", "error"]:
+            self.__sio.on(name, self.__handler(name), namespace=NAMESPACE)
+        self.__sio.on("match", self.__on_match, namespace=NAMESPACE)
+
+    def start(self) -> None:
+        self.__sio.connect(self.__url, namespaces=[NAMESPACE], transports=["websocket"])
+        with self.__lock:
+            self.__send("join", {"playerName": self.__name})
+
+    def stop(self) -> None:
+        with self.__lock:
+            if self.__pending is not None:
+                self.latencies.lost[self.__pending.name] += 1
+                self.__pending = None
+        self.__sio.disconnect()
+
+    def __send(self, name: str, payload: dict) -> None:
+        payload["matchId"] = self.__match_id
+        if self.__pid != -1:
+            payload["playerId"] = self.__pid
+        pending = self.__pending = Pending(name)
+        self.__sio.emit(
+            name, payload, namespace=NAMESPACE, callback=lambda *_: self.__ack(pending)
+        )
+
+    def __send_cards(self, name: str, cards: Cards) -> None:
+        self.__send(name, {"cards": [card.json() for card in cards]})
+
+    def __ack(self, pending: Pending) -> None:
+        with self.__lock:
+            pending.acked = True
+            if not RESPONSES[pending.name]:
+                self.__answer(pending.name)
+            self.__act()
+
+    # Record the latency of the event in flight if the update answers it
+    def __answer(self, name: str, error=False) -> None:
+        if (pending := self.__pending) is None or pending.answered:
+            return
+        if error or not RESPONSES[pending.name] or name in RESPONSES[pending.name]:
+            pending.answered = True
+            self.latencies.samples[pending.name].append(
+                perf_counter_ns() - pending.start
+            )
+            self.latencies.errors[pending.name] += error
+
+    def __on_match(self, json: dict) -> None:
+        if json["phase"] == MatchPhase.ENDED:
+            self.done.set()
+
+    def __handler(self, name: str):
+        update = getattr(self, f"_LoadClient__update_{name}")
+
+        def handle(json: dict) -> None:
+            with self.__lock:
+                update(json)
+                self.__act()
+
+        return handle
+
+    # Send the next event of the player, if any
+    def __act(self) -> None:
+        if (pending := self.__pending) is not None:
+            if not (pending.acked and pending.answered):
+                return
+            self.__pending = None
+        if self.__player is None or self.done.is_set():
+            return
+        player = self.__player
+        if self.__drawn:
+            drawn, self.__drawn = self.__drawn, []
+            if not self.__bid and self.__order.trump_type(drawn[-1:]) == Trump.SINGLE:
+                return self.__send_cards("bid", drawn[-1:])
+        if self.__phase == GamePhase.END:
+            if not self.__ready:
+                self.__ready = True
+                self.__send("next", {})
+            return
+        if self.__active_pid != self.__pid:
+            return
+        if self.__phase == GamePhase.DRAW:
+            self.__send("draw", {})
+        elif self.__phase == GamePhase.KITTY:
+            self.__send_cards("kitty", self.__rng.sample(player.hand, KITTY_SIZE))
+        elif self.__phase == GamePhase.PLAY:
+            legal = Legal(self.__order, player, self.__lead)
+            self.__send_cards("play", legal.sample(self.__rng))
+
+    def __cards(self, json: dict) -> Cards:
+        return [
+            Card.intern(int(card["id"]), Suit(card["suit"]), int(card["rank"]))
+            for card in json["cards"]
+        ]
+
+    def __update_join(self, json: dict) -> None:
+        if self.__pid == -1 and json["name"] == self.__name:
+            self.__pid = int(json["pid"])
+            self.__answer("join")
+
+    def __update_start(self, json: dict) -> None:
+        self.__player = Player(self.__pid, self.__name, "")
+        self.__order = Order(int(json["rank"]))
+        self.__phase, self.__active_pid = GamePhase.DRAW, int(json["activePid"])
+        self.__bid, self.__ready, self.__drawn = False, False, []
+        self.__lead, self.__trick_plays = None, 0
+
+    def __update_draw(self, json: dict) -> None:
+        self.__phase = GamePhase(json["phase"])
+        self.__active_pid = int(json["nextPID"])
+        if int(json["pid"]) == self.__pid and self.__player is not None:
+            self.__drawn = self.__cards(json)
+            self.__player.draw(self.__drawn)
+            self.__answer("draw")
+
+    def __update_bid(self, json: dict) -> None:
+        self.__bid = True
+        self.__order.reset(self.__cards(json)[0].suit)
+        if int(json["pid"]) == self.__pid:
+            self.__answer("bid")
+
+    def __update_kitty(self, json: dict) -> None:
+        self.__phase = GamePhase(json["phase"])
+        if int(json["pid"]) == self.__pid and self.__player is not None:
+            self.__player.play(self.__cards(json))
+            self.__answer("kitty")
+
+    def __update_play(self, json: dict) -> None:
+        cards = self.__cards(json)
+        if self.__trick_plays == 0:
+            self.__lead = Format(self.__order, cards)
+        self.__trick_plays += 1
+        if self.__trick_plays == self.__seats:
+            self.__lead, self.__trick_plays = None, 0
+        self.__active_pid = int(json["nextPID"])
+        if int(json["pid"]) == self.__pid and self.__player is not None:
+            self.__player.play(cards)
+            self.__answer("play")
+
+    def __update_end(self, json: dict) -> None:
+        self.__update_play(json["play"])
+        self.__phase = GamePhase.END
+        self.__ended += 1
+        if self.__games and self.__ended >= self.__games:
+            self.done.set()
+
+    def __update_error(self, _: dict) -> None:
+        self.__answer("error", True)
@@ -0,0 +1,81 @@
+import json
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from random import Random
+from time import perf_counter, sleep
+from urllib.request import Request, urlopen
+
+from loadtest import EVENTS, Latencies, LoadClient
+
+
+# Create a match through the HTTP API and return its id
+def create(url: str, seats: int) -> int:
+    request = Request(
+        f"{url}/match",
+        data=json.dumps({"seats": seats}).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    with urlopen(request) as response:
+        return int(json.load(response)["id"])
+
+
+def report(latencies: Latencies, elapsed: float) -> None:
+    print(
+        f"{latencies.events} events in {elapsed:.2f}s: "
+        f"{latencies.events / elapsed:.1f} events/s"
+    )
+    for event in EVENTS:
+        sent = len(latencies.samples[event]) + latencies.lost[event]
+        if not sent:
+            continue
+        p50, p95, p99 = latencies.percentiles(event)
+        errors = latencies.errors[event] + latencies.lost[event]
+        print(
+            f"{event:>6}: {sent} sent, p50 {p50:.2f}ms, p95 {p95:.2f}ms, "
+            f"p99 {p99:.2f}ms, {100 * errors / sent:.1f}% errors "
+            f"({latencies.lost[event]} unacknowledged)"
+        )
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Socket load generator for a local server.")
+    parser.add_argument("--url", default="http://localhost:5001", help="Server URL.")
+    parser.add_argument("--matches", type=int, default=10, help="Concurrent matches.")
+    parser.add_argument("--seats", type=int, default=4, help="Clients per match.")
+    parser.add_argument("--games", type=int, default=1, help="Games per match.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the clients.")
+    parser.add_argument("--timeout", type=float, default=300, help="Seconds to run.")
+    args = parser.parse_args()
+
+    rng = Random(args.seed)
+    match_ids = [create(args.url, args.seats) for _ in range(args.matches)]
+    clients = [
+        LoadClient(
+            args.url,
+            match_id,
+            f"Load{match_id}-{seat}",
+            args.seats,
+            args.games,
+            Random(rng.random()),
+        )
+        for match_id in match_ids
+        for seat in range(args.seats)
+    ]
+
+    start = perf_counter()
+    for client in clients:
+        client.start()
+    deadline = start + args.timeout
+    while perf_counter() < deadline and not all(c.done.is_set() for c in clients):
+        sleep(0.1)
+    elapsed = perf_counter() - start
+
+    # Disconnects wait for the server to close each socket, so they are concurrent
+    with ThreadPoolExecutor(32) as pool:
+        list(pool.map(LoadClient.stop, clients))
+    latencies = Latencies()
+    for client in clients:
+        latencies.merge(client.latencies)
+    finished = sum(client.done.is_set() for client in clients) // args.seats
+    print(f"{finished} of {args.matches} matches finished")
+    report(latencies, elapsed)
@@ -0,0 +1,30 @@
+from unittest import TestCase
+
+from loadtest import Latencies
+
+
+class LatenciesTests(TestCase):
+    def test_percentiles(self) -> None:
+        latencies = Latencies()
+        latencies.samples["play"] = [i * 1_000_000 for i in range(1, 101)]
+
+        p50, p95, p99 = latencies.percentiles("play")
+        self.assertAlmostEqual(50.5, p50)
+        self.assertAlmostEqual(95.95, p95)
+        self.assertAlmostEqual(99.99, p99)
+
+        # Events without samples and with a single sample
+        self.assertTupleEqual((0.0, 0.0, 0.0), latencies.percentiles("draw"))
+        latencies.samples["draw"] = [2_000_000]
+        self.assertTupleEqual((2.0, 2.0, 2.0), latencies.percentiles("draw"))
+
+    def test_merge(self) -> None:
+        one, two = Latencies(), Latencies()
+        one.samples["draw"], one.errors["draw"] = [1, 2], 1
+        two.samples["draw"], two.lost["next"] = [3], 2
+
+        one.merge(two)
+        self.assertListEqual([1, 2, 3], one.samples["draw"])
+        self.assertEqual(1, one.errors["draw"])
+        self.assertEqual(2, one.lost["next"])
+        self.assertEqual(3, one.events)
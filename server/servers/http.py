@@ -25,7 +25,7 @@ class MatchGet(MethodView):
             abort(404)
         else:
             return (
-                response.json(),
+                response,
                 200,
                 {
                     "Cache-Control": "no-cache, no-store, must-revalidate",
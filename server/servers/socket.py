@@ -1,18 +1,46 @@
 import logging
+from queue import Queue
+from threading import Lock
+from typing import Callable, Iterator
 
-from abstractions import CardsEvent, JoinEvent, PlayerEvent, Room
+from abstractions import CardsEvent, Event, JoinEvent, PlayerEvent, Room
 from flask import Flask, request
 from flask_socketio import Namespace, SocketIO, emit, join_room
+from services.bus import Bus
 from services.match import MatchService
+from socketio import PubSubManager
+
+type Room_ = MatchService.Room_
+
+
+# Shares emits, rooms and disconnects of the sockets of every worker over the bus
+class BusManager(PubSubManager):
+    name = "bus"
+
+    def __init__(self, bus: Bus, channel="socketio") -> None:
+        super().__init__(channel)
+        self.__bus = bus
+        self.__messages: Queue[dict] = Queue()
+        bus.subscribe(channel, self.__messages.put)
+
+    def _publish(self, data: dict) -> None:
+        self.__bus.publish(self.channel, data)
+
+    def _listen(self) -> Iterator[dict]:
+        while True:
+            yield self.__messages.get()
 
 
 class MatchNamespace(Namespace):
     def __init__(self, namespace: str, service: MatchService) -> None:
         super(MatchNamespace, self).__init__(namespace)
         self.__service = service
+        # Matches with a background task driving their bots
+        self.__driven: set[int] = set()
+        self.__lock = Lock()
 
-    def __update(self, room: Room | None) -> None:
-        for update in room or []:
+    def __update[T: Event](self, event: T, call: Callable[[T], Room_]) -> None:
+        for update in call(event) or []:
             emit(
                 update.name,
                 update.json(),
@@ -20,6 +48,40 @@ class MatchNamespace(Namespace):
                 broadcast=update.cast,
                 include_self=update.echo,
             )
+        self.__schedule(event.match_id)
+
+    # Updates of bot events are sent from background tasks, outside of any request.
+    # Replies to bots are dropped as bots have no socket.
+    def __broadcast(self, room: Room_) -> None:
+        for update in room or []:
+            if update.cast:
+                self.socketio.emit(
+                    update.name, update.json(), to=update.to, namespace=self.namespace
+                )
+
+    # Start driving the bots of the match, unless they are already driven
+    def __schedule(self, match_id: int) -> None:
+        if not self.__service.bots(match_id):
+            return
+        with self.__lock:
+            if match_id in self.__driven:
+                return
+            self.__driven.add(match_id)
+        self.socketio.start_background_task(self.__drive, match_id)
+
+    # Act for the bots of the match, one event per think time, until none can act
+    def __drive(self, match_id: int) -> None:
+        try:
+            while self.__service.bots(match_id):
+                self.socketio.sleep(self.__service.think_time(match_id))
+                self.__broadcast(self.__service.act(match_id))
+        finally:
+            # Bots failing to act can be driven again by the next event
+            with self.__lock:
+                self.__driven.discard(match_id)
+        # Events processed since bots last checked may have been scheduled while the
+        # match was still driven
+        self.__schedule(match_id)
 
     def on_connected(self) -> None:
         """event listener when client connects to the server"""
@@ -32,35 +94,46 @@ class MatchNamespace(Namespace):
     def on_join(self, payload) -> None:
         """event listener when client joins a match"""
         event = JoinEvent(request.sid, payload)
-        join_room(event.match_id)
-        self.__update(self.__service.join(event))
+        join_room(Room.name(event.match_id))
+        self.__update(event, self.__service.join)
 
     def on_leave(self, payload) -> None:
         """event listener when client leaves a match"""
-        self.__update(self.__service.leave(PlayerEvent(request.sid, payload)))
+        self.__update(PlayerEvent(request.sid, payload), self.__service.leave)
 
     def on_draw(self, payload) -> None:
         """event listener when client draws a card"""
-        self.__update(self.__service.draw(PlayerEvent(request.sid, payload)))
+        self.__update(PlayerEvent(request.sid, payload), self.__service.draw)
 
     def on_bid(self, payload) -> None:
         """event listener when client bid trumps"""
-        self.__update(self.__service.bid(CardsEvent(request.sid, payload)))
+        self.__update(CardsEvent(request.sid, payload), self.__service.bid)
 
     def on_kitty(self, payload) -> None:
         """event listener when client hides kitty"""
-        self.__update(self.__service.kitty(CardsEvent(request.sid, payload)))
+        self.__update(CardsEvent(request.sid, payload), self.__service.kitty)
 
     def on_play(self, payload) -> None:
         """event listener when client plays a card"""
-        self.__update(self.__service.play(CardsEvent(request.sid, payload)))
+        self.__update(CardsEvent(request.sid, payload), self.__service.play)
 
     def on_next(self, payload) -> None:
         """event listener when client is ready for the next game"""
-        self.__update(self.__service.next(PlayerEvent(request.sid, payload)))
+        self.__update(PlayerEvent(request.sid, payload), self.__service.next)
 
 
-def init_sockets(app: Flask, match_service: MatchService) -> SocketIO:
-    socketio = SocketIO(app, cors_allowed_origins="*", logger=True)
+def init_sockets(
+    app: Flask,
+    match_service: MatchService,
+    async_mode="threading",
+    bus: Bus | None = None,
+) -> SocketIO:
+    socketio = SocketIO(
+        app,
+        async_mode=async_mode,
+        cors_allowed_origins="*",
+        logger=True,
+        client_manager=BusManager(bus) if bus is not None else None,
+    )
     socketio.on_namespace(MatchNamespace("/match", match_service))
     return socketio
@@ -0,0 +1,45 @@
+from collections import deque
+from concurrent.futures import Executor, Future
+from threading import Lock
+from typing import Callable
+
+
+# Serialized queue of calls on shared workers. Calls of an actor run one at a time
+# in submission order, calls of different actors run concurrently on the workers.
+class Actor:
+    # Calls run before the actor yields its worker to other actors
+    BATCH = 16
+
+    def __init__(self, executor: Executor) -> None:
+        # Inputs
+        self.__executor = executor
+
+        # Private
+        self.__lock = Lock()
+        self.__queue: deque[tuple[Callable[[], object], Future]] = deque()
+        # Whether a worker is draining the queue
+        self.__running = False
+
+    def submit[T](self, call: Callable[[], T]) -> Future[T]:
+        future: Future[T] = Future()
+        with self.__lock:
+            self.__queue.append((call, future))
+            if self.__running:
+                return future
+            self.__running = True
+        self.__executor.submit(self.__drain)
+        return future
+
+    def __drain(self) -> None:
+        for _ in range(Actor.BATCH):
+            with self.__lock:
+                if not self.__queue:
+                    self.__running = False
+                    return
+                call, future = self.__queue.popleft()
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(call())
+                except BaseException as error:
+                    future.set_exception(error)
+        self.__executor.submit(self.__drain)
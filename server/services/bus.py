@@ -0,0 +1,199 @@
+import hmac
+import pickle
+import socket
+import struct
+from abc import ABC, abstractmethod
+from os import urandom
+from threading import Lock, Thread
+from typing import Any, Callable
+
+type Handler = Callable[[str, Any], Any]
+type Subscriber = Callable[[Any], None]
+type Address = tuple[str, int]
+
+
+# Messaging between the workers of a deployment. Workers serve the calls addressed
+# to them and receive the messages published on channels they subscribe to,
+# including their own. Calls and messages must be picklable.
+class Bus(ABC):
+    @abstractmethod
+    def serve(self, worker: int, handler: Handler) -> None: ...
+
+    @abstractmethod
+    def call(self, worker: int, method: str, payload: Any) -> Any: ...
+
+    @abstractmethod
+    def publish(self, channel: str, message: Any) -> None: ...
+
+    @abstractmethod
+    def subscribe(self, channel: str, subscriber: Subscriber) -> None: ...
+
+
+# Bus of workers sharing a process, for tests and single process deployments.
+# Calls and messages are copied through pickle as they would be between processes.
+class LocalBus(Bus):
+    def __init__(self) -> None:
+        self.__lock = Lock()
+        self.__handlers: dict[int, Handler] = {}
+        self.__subscribers: dict[str, list[Subscriber]] = {}
+
+    def serve(self, worker: int, handler: Handler) -> None:
+        with self.__lock:
+            self.__handlers[worker] = handler
+
+    def call(self, worker: int, method: str, payload: Any) -> Any:
+        handler = self.__handlers[worker]
+        return _copy(handler(method, _copy(payload)))
+
+    def publish(self, channel: str, message: Any) -> None:
+        with self.__lock:
+            subscribers = list(self.__subscribers.get(channel, []))
+        for subscriber in subscribers:
+            subscriber(_copy(message))
+
+    def subscribe(self, channel: str, subscriber: Subscriber) -> None:
+        with self.__lock:
+            self.__subscribers.setdefault(channel, []).append(subscriber)
+
+
+def _copy[T](value: T) -> T:
+    return pickle.loads(pickle.dumps(value))
+
+
+# Socket sending pickled messages prefixed by their length. Plain sockets are used
+# rather than multiprocessing connections, which gevent cannot make cooperative.
+class _Channel:
+    HEADER = struct.Struct("!I")
+
+    def __init__(self, sock: socket.socket) -> None:
+        self.__socket = sock
+        self.__reader = sock.makefile("rb")
+
+    def send(self, message: Any) -> None:
+        self.send_bytes(pickle.dumps(message))
+
+    def send_bytes(self, data: bytes) -> None:
+        self.__socket.sendall(_Channel.HEADER.pack(len(data)) + data)
+
+    def recv(self) -> Any:
+        return pickle.loads(self.recv_bytes())
+
+    def recv_bytes(self) -> bytes:
+        header = self.__reader.read(_Channel.HEADER.size)
+        if len(header) < _Channel.HEADER.size:
+            raise EOFError
+        (size,) = _Channel.HEADER.unpack(header)
+        data = self.__reader.read(size)
+        if len(data) < size:
+            raise EOFError
+        return data
+
+    def close(self) -> None:
+        self.__reader.close()
+        self.__socket.close()
+
+
+# Bus of workers in separate processes, connected by sockets. The i-th worker
+# listens at the i-th address, and messages are published to every other worker,
+# the publisher delivers them to its own subscribers. Connections must answer a
+# challenge with the key before they are unpickled.
+class SocketBus(Bus):
+    def __init__(self, addresses: list[Address], authkey: bytes) -> None:
+        # Inputs
+        self.__addresses = addresses
+        self.__authkey = authkey
+
+        # Private
+        self.__lock = Lock()
+        # Worker served by this bus, if any
+        self.__worker: int | None = None
+        self.__handler: Handler | None = None
+        self.__subscribers: dict[str, list[Subscriber]] = {}
+        # Idle connections to each worker, calls open one when none are idle
+        self.__idle: list[list[_Channel]] = [[] for _ in addresses]
+
+    def serve(self, worker: int, handler: Handler) -> None:
+        self.__worker, self.__handler = worker, handler
+        listener = socket.create_server(self.__addresses[worker])
+        Thread(target=self.__accept, args=(listener,), daemon=True).start()
+
+    def call(self, worker: int, method: str, payload: Any) -> Any:
+        return self.__request(worker, ("call", method, payload))
+
+    def publish(self, channel: str, message: Any) -> None:
+        for worker in range(len(self.__addresses)):
+            if worker == self.__worker:
+                self.__deliver(channel, message)
+            else:
+                self.__request(worker, ("publish", channel, message))
+
+    def subscribe(self, channel: str, subscriber: Subscriber) -> None:
+        with self.__lock:
+            self.__subscribers.setdefault(channel, []).append(subscriber)
+
+    def __digest(self, challenge: bytes) -> bytes:
+        return hmac.digest(self.__authkey, challenge, "sha256")
+
+    def __connect(self, worker: int) -> _Channel:
+        channel = _Channel(socket.create_connection(self.__addresses[worker]))
+        try:
+            channel.send_bytes(self.__digest(channel.recv_bytes()))
+        except BaseException:
+            channel.close()
+            raise
+        return channel
+
+    # Connections are reused once answered, and closed when a request fails
+    def __request(self, worker: int, request: tuple[str, str, Any]) -> Any:
+        with self.__lock:
+            idle = self.__idle[worker]
+            channel = idle.pop() if idle else None
+        if channel is None:
+            channel = self.__connect(worker)
+        answered = False
+        try:
+            channel.send(request)
+            ok, result = channel.recv()
+            answered = True
+        finally:
+            if answered:
+                with self.__lock:
+                    self.__idle[worker].append(channel)
+            else:
+                channel.close()
+        if not ok:
+            raise result
+        return result
+
+    def __deliver(self, channel: str, message: Any) -> None:
+        with self.__lock:
+            subscribers = list(self.__subscribers.get(channel, []))
+        for subscriber in subscribers:
+            subscriber(message)
+
+    def __accept(self, listener: socket.socket) -> None:
+        while True:
+            sock, _ = listener.accept()
+            Thread(target=self.__receive, args=(_Channel(sock),), daemon=True).start()
+
+    # Serve the requests of a connection, errors of calls are raised by the caller
+    def __receive(self, channel: _Channel) -> None:
+        try:
+            challenge = urandom(32)
+            channel.send_bytes(challenge)
+            if not hmac.compare_digest(self.__digest(challenge), channel.recv_bytes()):
+                return
+            while True:
+                kind, name, payload = channel.recv()
+                try:
+                    if kind == "publish":
+                        self.__deliver(name, payload)
+                        channel.send((True, None))
+                    elif self.__handler is not None:
+                        channel.send((True, self.__handler(name, payload)))
+                except Exception as error:
+                    channel.send((False, error))
+        except (EOFError, OSError, pickle.UnpicklingError):
+            return
+        finally:
+            channel.close()
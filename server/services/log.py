@@ -0,0 +1,237 @@
+import logging
+import os
+import os.path as PATH
+import pickle
+import struct
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from threading import Condition, Thread
+from time import perf_counter
+from typing import Any, Callable, Iterator
+
+from abstractions import Event, PlayerError, Room
+from core.match import EVENTS, Match, MatchSettings
+
+# Records are prefixed by their length and checksum, so that a record torn by a crash
+# at the end of a log is detected and dropped
+HEADER = struct.Struct("!II")
+
+# Sequence number in the match, event name and event. Matches start with a record
+# of their creation, numbered 0, holding their id, settings and seed.
+type Record = tuple[int, str, Any]
+
+
+def _frame(record: Record) -> bytes:
+    data = pickle.dumps(record, pickle.HIGHEST_PROTOCOL)
+    return HEADER.pack(len(data), zlib.crc32(data)) + data
+
+
+def _records(path: str) -> Iterator[Record]:
+    with open(path, "rb") as file:
+        while len(header := file.read(HEADER.size)) == HEADER.size:
+            size, checksum = HEADER.unpack(header)
+            data = file.read(size)
+            if len(data) < size or zlib.crc32(data) != checksum:
+                return
+            yield pickle.loads(data)
+
+
+# Match of the snapshot and log in the directory, and the sequence number of its last
+# event. Events up to the snapshot may still be logged if a crash interrupted the
+# compaction, they are skipped.
+def _replay(directory: str, match_id: int) -> tuple[int, Match] | None:
+    seq, match = 0, None
+    snapshot = PATH.join(directory, f"{match_id}.snap")
+    if PATH.exists(snapshot):
+        with open(snapshot, "rb") as file:
+            seq, match = pickle.load(file)
+    for record_seq, name, payload in _records(PATH.join(directory, f"{match_id}.wal")):
+        if name == "create":
+            if match is None:
+                id, json, seed = payload
+                match = Match(id, MatchSettings(json), seed)
+            continue
+        if match is None or record_seq <= seq:
+            continue
+        try:
+            EVENTS[name](match, payload, Room(payload))
+        except PlayerError:
+            pass
+        seq = record_seq
+    return None if match is None else (seq, match)
+
+
+# Run blocking file operations on a thread of the gevent hub when threads are patched,
+# where the writer is a greenlet and would otherwise stall the event loop. Gevent is
+# only imported once loaded, as servers in threading mode run without it.
+def _blocking(call: Callable[[], None]) -> None:
+    if "gevent" in sys.modules:
+        from gevent import get_hub, monkey
+
+        if monkey.is_module_patched("threading"):
+            get_hub().threadpool.apply(call)
+            return
+    call()
+
+
+def _replay_all(directory: str, ids: list[int]) -> list[tuple[int, int, Match]]:
+    return [
+        (match_id, *replayed)
+        for match_id in ids
+        if (replayed := _replay(directory, match_id)) is not None
+    ]
+
+
+# Per match write-ahead log of accepted events. Records are written and synced by a
+# background writer, which commits every record appended since its last write at
+# once. Logs are compacted into a snapshot of their match every few records.
+class MatchLog:
+    # Matches each recovery process replays at least, as starting processes for
+    # fewer matches costs more than it saves
+    CHUNK = 64
+
+    def __init__(
+        self,
+        directory: str,
+        fsync: bool = True,
+        snapshot: int = 500,
+        processes: int | None = None,
+    ) -> None:
+        # Inputs
+        self.__directory = directory
+        self.__fsync = fsync
+        # Records of a match logged between its snapshots
+        self.__snapshot = snapshot
+        # Processes replaying logs on recovery, one per CPU by default
+        self.__processes = processes or os.cpu_count() or 1
+
+        # Private
+        self.__condition = Condition()
+        # Writes appended but not yet committed, in order: match id, record frame or
+        # snapshot, and whether it is a snapshot
+        self.__pending: list[tuple[int, bytes, bool]] = []
+        # Number of writes appended and committed
+        self.__appended = 0
+        self.__committed = 0
+        # Error that stopped the writer. Later writes would leave gaps in the logs,
+        # so the log stays failed and syncs raise it.
+        self.__failure: BaseException | None = None
+        # Sequence numbers of the last record and last snapshot of each match
+        self.__seqs: dict[int, int] = {}
+        self.__snapshots: dict[int, int] = {}
+
+        os.makedirs(directory, exist_ok=True)
+        Thread(target=self.__write, name="log", daemon=True).start()
+
+    def __path(self, match_id: int, extension: str) -> str:
+        return PATH.join(self.__directory, f"{match_id}.{extension}")
+
+    def __enqueue(self, match_id: int, data: bytes, snapshot=False) -> None:
+        with self.__condition:
+            if self.__failure is None:
+                self.__pending.append((match_id, data, snapshot))
+            self.__appended += 1
+            self.__condition.notify_all()
+
+    def create(self, match: Match) -> None:
+        self.__seqs[match.id] = self.__snapshots[match.id] = 0
+        record = (match.id, match.settings.json(), match.seed)
+        self.__enqueue(match.id, _frame((0, "create", record)))
+
+    # Log an event accepted by the match, called by the match's actor in the order
+    # events are processed
+    def append(self, match: Match, name: str, event: Event) -> None:
+        seq = self.__seqs[match.id] = self.__seqs[match.id] + 1
+        self.__enqueue(match.id, _frame((seq, name, event)))
+        if seq - self.__snapshots[match.id] >= self.__snapshot:
+            self.__snapshots[match.id] = seq
+            snapshot = pickle.dumps((seq, match), pickle.HIGHEST_PROTOCOL)
+            self.__enqueue(match.id, snapshot, True)
+
+    # Wait until every write appended so far is committed, raises if writes failed
+    def sync(self) -> None:
+        with self.__condition:
+            target = self.__appended
+            self.__condition.wait_for(
+                lambda: self.__committed >= target or self.__failure is not None
+            )
+            if self.__failure is not None:
+                raise RuntimeError("Match log writes failed") from self.__failure
+
+    def __write(self) -> None:
+        while True:
+            with self.__condition:
+                self.__condition.wait_for(lambda: self.__pending)
+                pending, self.__pending = self.__pending, []
+                target = self.__appended
+
+            writes: dict[int, list[tuple[bytes, bool]]] = {}
+            for match_id, data, snapshot in pending:
+                writes.setdefault(match_id, []).append((data, snapshot))
+            try:
+                _blocking(lambda: self.__commit_all(writes))
+            except Exception as error:
+                logging.exception("Match log writes failed")
+                with self.__condition:
+                    self.__failure = error
+                    self.__condition.notify_all()
+                return
+
+            with self.__condition:
+                self.__committed = target
+                self.__condition.notify_all()
+
+    def __commit_all(self, writes: dict[int, list[tuple[bytes, bool]]]) -> None:
+        for match_id, match_writes in writes.items():
+            self.__commit(match_id, match_writes)
+
+    # Write the snapshot last appended, then replace the log with the records after it
+    def __commit(self, match_id: int, writes: list[tuple[bytes, bool]]) -> None:
+        mode = "ab"
+        for i in reversed(range(len(writes))):
+            data, snapshot = writes[i]
+            if snapshot:
+                path = self.__path(match_id, "snap")
+                self.__save(path + ".tmp", "wb", [data])
+                os.replace(path + ".tmp", path)
+                mode, writes = "wb", writes[i + 1 :]
+                break
+        self.__save(self.__path(match_id, "wal"), mode, [data for data, _ in writes])
+
+    def __save(self, path: str, mode: str, chunks: list[bytes]) -> None:
+        with open(path, mode) as file:
+            file.writelines(chunks)
+            if self.__fsync:
+                file.flush()
+                os.fsync(file.fileno())
+
+    # Rebuild the matches of the logs, replayed by processes in parallel. Matches are
+    # kept once they end, as they are by the service, so their ids are never reused.
+    def recover(self) -> dict[int, Match]:
+        start = perf_counter()
+        names = os.listdir(self.__directory)
+        ids = sorted(int(name[:-4]) for name in names if name.endswith(".wal"))
+        processes = min(self.__processes, len(ids) // MatchLog.CHUNK)
+        if processes > 1:
+            # Processes are spawned, as forking copies the locks held by threads
+            chunks = [ids[i::processes] for i in range(processes)]
+            context = get_context("spawn")
+            with ProcessPoolExecutor(processes, mp_context=context) as executor:
+                directories = [self.__directory] * processes
+                parts = list(executor.map(_replay_all, directories, chunks))
+        else:
+            parts = [_replay_all(self.__directory, ids)]
+
+        matches: dict[int, Match] = {}
+        for match_id, seq, match in (replayed for part in parts for replayed in part):
+            matches[match_id] = match
+            self.__seqs[match_id] = self.__snapshots[match_id] = seq
+
+        elapsed = perf_counter() - start
+        logging.info(
+            f"Recovered {len(matches)} of {len(ids)} matches in {elapsed:.3f}s, "
+            f"{1000 * elapsed / max(len(ids), 1):.3f}s per 1000 matches"
+        )
+        return matches
@@ -1,62 +1,205 @@
+from concurrent.futures import ThreadPoolExecutor
 from itertools import count
-from typing import Callable, Iterator
+from threading import Lock
+from typing import Any, Callable, Iterable, Iterator
 
-from abstractions import CardsEvent, Event, JoinEvent, PlayerError, PlayerEvent, Room
-from core.match import Match, MatchResponse, MatchSettings
+from abstractions import (
+    CardsEvent,
+    Event,
+    JoinEvent,
+    PlayerError,
+    PlayerEvent,
+    Room,
+    SocketUpdate,
+    Update,
+)
+from core.match import EVENTS, Match, MatchResponse, MatchSettings
+from services.actor import Actor
+from services.bus import Bus
+from services.log import MatchLog
 
 
-class MatchService:
-    type EventCall[T: Event] = Callable[[T, Room], None]
-    type Room_ = Room | None
+# Update serialized by the worker owning the match, for the worker that forwarded
+# the event to send
+class ForwardedUpdate(Update):
+    __slots__ = ("__json",)
+
+    def __init__(self, json: dict) -> None:
+        self.__json = json
+
+    def json(self, _=False) -> dict:
+        return self.__json
+
+
+# Names of the calls workers forward to the owner of the match
+_routes: set[str] = set()
+
+
+# Calls of a match made on a worker that does not own it run on its owner
+def _routed[T, R](method: Callable[["MatchService", T], R]):
+    _routes.add(method.__name__)
+
+    def route(self: "MatchService", arg: T) -> R:
+        match_id = arg.match_id if isinstance(arg, Event) else arg
+        if self.owner(match_id) == self.worker:
+            return method(self, arg)
+        return self._forward(match_id, method.__name__, arg)
 
-    def __init__(self) -> None:
-        # Monotonically increasing ids
-        self.__match_id: Iterator[int] = count()
-        self.__matches: dict[int, Match] = dict()
+    route.__name__ = method.__name__
+    return route
 
-    def _try[T: Event](self, event: T, room: Room, call: EventCall[T]) -> Room_:
+
+class MatchService:
+    type Room_ = Iterable[SocketUpdate] | None
+
+    def __init__(
+        self,
+        threads: int | None = None,
+        worker: int = 0,
+        workers: int = 1,
+        bus: Bus | None = None,
+        log: MatchLog | None = None,
+    ) -> None:
+        # Inputs
+        self.__workers = workers
+        self.__bus = bus
+        self.__log = log
+
+        # Public
+        self.worker = worker
+
+        # Private
+        # Live matches of the log, if any, are recovered before serving
+        self.__matches: dict[int, Match] = {} if log is None else log.recover()
+        # Monotonically increasing ids, owned by the worker they are congruent to
+        last_id = max(self.__matches, default=worker - workers)
+        self.__match_id: Iterator[int] = count(last_id + workers, workers)
+        # Events of a match are processed one at a time by its actor, actors of all
+        # matches share the threads
+        self.__executor = ThreadPoolExecutor(threads, thread_name_prefix="match")
+        self.__actors = {id: Actor(self.__executor) for id in self.__matches}
+        self.__lock = Lock()
+        if bus is not None:
+            bus.serve(worker, self.__serve)
+
+    # Worker owning the match
+    def owner(self, match_id: int) -> int:
+        return match_id % self.__workers
+
+    def _forward(self, match_id: int, method: str, arg: Any) -> Any:
+        if self.__bus is None:
+            return None
+        return self.__bus.call(self.owner(match_id), method, arg)
+
+    # Run a call forwarded by another worker. Updates are serialized here, as
+    # matches and their players only exist on this worker.
+    def __serve(self, method: str, arg: Any) -> Any:
+        if method not in _routes:
+            raise ValueError(f"Unknown method {method}")
+        result = getattr(self, method)(arg)
+        if not isinstance(result, Room):
+            return result
+        return [
+            SocketUpdate(u.name, u.to, ForwardedUpdate(u.json()), u.cast, u.echo)
+            for u in result
+        ]
+
+    # Process the event, accepted events are logged
+    def _try(self, match: Match, name: str, event: Event) -> Room:
+        room = Room(event)
         try:
-            call(event, room)
+            EVENTS[name](match, event, room)
         except PlayerError as error:
             room.reply("error", error)
+        else:
+            if self.__log is not None:
+                self.__log.append(match, name, event)
         return room
 
-    def _call[T: Event](self, event: T, call: Callable[[Match], EventCall[T]]) -> Room_:
-        if event.match_id not in self.__matches:
+    # Run the call on the actor of the match and wait for its result
+    def _run[T](self, match_id: int, call: Callable[[Match], T]) -> T | None:
+        if (actor := self.__actors.get(match_id)) is None:
             return None
-
-        match = self.__matches[event.match_id]
-        if event.pid in match.players:
-            return self._try(event, Room(event), call(match))
-
-    def create(self, json: dict) -> MatchResponse:
-        match_id = next(self.__match_id)
-        new_match = Match(match_id, MatchSettings(json))
-        self.__matches[match_id] = new_match
-        return new_match.response()
-
-    def get(self, match_id: int) -> MatchResponse | None:
-        if match_id in self.__matches:
-            return self.__matches[match_id].response()
-
+        match = self.__matches[match_id]
+        return actor.submit(lambda: call(match)).result()
+
+    # Updates are sent once the events they result from are committed to the log
+    def _commit[T](self, result: T) -> T:
+        if self.__log is not None:
+            self.__log.sync()
+        return result
+
+    def _call(self, name: str, event: PlayerEvent) -> Room_:
+        def run(match: Match) -> MatchService.Room_:
+            if event.pid in match.players:
+                return self._try(match, name, event)
+
+        return self._commit(self._run(event.match_id, run))
+
+    # Matches of players are seeded by the service, seeds are only given by tests
+    def create(self, json: dict, seed: int | None = None) -> MatchResponse:
+        with self.__lock:
+            match_id = next(self.__match_id)
+            new_match = Match(match_id, MatchSettings(json), seed)
+            self.__matches[match_id] = new_match
+            self.__actors[match_id] = Actor(self.__executor)
+            if self.__log is not None:
+                self.__log.create(new_match)
+        return self._commit(new_match.response())
+
+    # Match as JSON, serialized by its actor
+    @_routed
+    def get(self, match_id: int) -> dict | None:
+        return self._run(match_id, lambda match: match.response().json())
+
+    @_routed
     def join(self, event: JoinEvent) -> Room_:
-        if event.match_id in self.__matches:
-            return self._try(event, Room(event), self.__matches[event.match_id].join)
+        def run(match: Match) -> MatchService.Room_:
+            return self._try(match, "join", event)
+
+        return self._commit(self._run(event.match_id, run))
 
+    @_routed
     def leave(self, event: PlayerEvent) -> Room_:
-        return self._call(event, lambda match: match.leave)
+        return self._call("leave", event)
 
+    @_routed
     def draw(self, event: PlayerEvent) -> Room_:
-        return self._call(event, lambda match: match.draw)
+        return self._call("draw", event)
 
+    @_routed
     def bid(self, event: CardsEvent) -> Room_:
-        return self._call(event, lambda match: match.bid)
+        return self._call("bid", event)
 
+    @_routed
     def kitty(self, event: CardsEvent) -> Room_:
-        return self._call(event, lambda match: match.kitty)
+        return self._call("kitty", event)
 
+    @_routed
     def play(self, event: CardsEvent) -> Room_:
-        return self._call(event, lambda match: match.play)
+        return self._call("play", event)
 
+    @_routed
     def next(self, event: PlayerEvent) -> Room_:
-        return self._call(event, lambda match: match.next)
+        return self._call("next", event)
+
+    # Whether bots of the match can act now, their events are decided when they act
+    @_routed
+    def bots(self, match_id: int) -> bool:
+        return self._run(match_id, lambda match: match.bots_can_act()) or False
+
+    # Seconds bots of the match wait before acting
+    @_routed
+    def think_time(self, match_id: int) -> float:
+        return self.__matches[match_id].settings.think_time
+
+    # Process the first event of the bots of the match that can act, if any
+    @_routed
+    def act(self, match_id: int) -> Room_:
+        def run(match: Match) -> MatchService.Room_:
+            if not (events := match.bot_events()):
+                return None
+            name, event = events[0]
+            return self._try(match, name, event)
+
+        return self._commit(self._run(match_id, run))
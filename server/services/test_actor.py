@@ -0,0 +1,76 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Lock, Thread
+from unittest import TestCase
+
+from services.actor import Actor
+
+
+class ActorTests(TestCase):
+    def test_actor_serializes_calls(self) -> None:
+        executor = ThreadPoolExecutor(8)
+        actor, lock = Actor(executor), Lock()
+        calls: list[tuple[int, int]] = []
+        running = [0, 0]
+
+        def call(thread: int, i: int) -> None:
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            calls.append((thread, i))
+            with lock:
+                running[0] -= 1
+
+        def submit(thread: int) -> None:
+            for i in range(100):
+                actor.submit(lambda i=i: call(thread, i))
+
+        threads = [Thread(target=submit, args=(thread,)) for thread in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        actor.submit(lambda: None).result(timeout=5)
+
+        # Calls never overlap and run in submission order of each thread
+        self.assertEqual(1, running[1])
+        self.assertEqual(400, len(calls))
+        for thread in range(4):
+            order = [i for t, i in calls if t == thread]
+            self.assertListEqual(list(range(100)), order)
+        executor.shutdown()
+
+    def test_actors_run_concurrently(self) -> None:
+        executor = ThreadPoolExecutor(2)
+        one, two = Actor(executor), Actor(executor)
+        ready = Event()
+
+        # A call of one actor waits for a call of the other
+        waiting = one.submit(lambda: ready.wait(timeout=5))
+        two.submit(ready.set)
+        self.assertTrue(waiting.result(timeout=5))
+        executor.shutdown()
+
+    def test_actor_errors(self) -> None:
+        executor = ThreadPoolExecutor(1)
+        actor = Actor(executor)
+
+        # Errors are raised by the call's future, later calls still run
+        failed = actor.submit(lambda: 1 // 0)
+        self.assertEqual(2, actor.submit(lambda: 2).result(timeout=5))
+        self.assertRaises(ZeroDivisionError, failed.result)
+        executor.shutdown()
+
+    def test_actor_yields_worker(self) -> None:
+        executor = ThreadPoolExecutor(1)
+        busy, other = Actor(executor), Actor(executor)
+        gate, order = Event(), []
+
+        # Calls of another actor run after a batch of a busy actor's calls
+        busy.submit(lambda: gate.wait(timeout=5))
+        futures = [busy.submit(lambda i=i: order.append(i)) for i in range(40)]
+        futures.append(other.submit(lambda: order.append("other")))
+        gate.set()
+        for future in futures:
+            future.result(timeout=5)
+        self.assertEqual(Actor.BATCH - 1, order.index("other"))
+        executor.shutdown()
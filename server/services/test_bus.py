@@ -0,0 +1,123 @@
+import hmac
+import socket
+from threading import current_thread
+from unittest import TestCase
+
+from abstractions import JoinEvent, PlayerEvent
+from services.bus import LocalBus, SocketBus, _Channel
+from services.match import ForwardedUpdate, MatchService
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+class BusTests(TestCase):
+    def test_buses(self) -> None:
+        addresses = [("localhost", free_port()) for _ in range(2)]
+        for name, buses in [
+            ("local", [LocalBus()] * 2),
+            ("socket", [SocketBus(addresses, b"key") for _ in range(2)]),
+        ]:
+            with self.subTest(name):
+                received: list[tuple[int, dict]] = []
+                for worker, bus in enumerate(buses):
+                    bus.serve(worker, lambda method, payload, w=worker: (w, method))
+                    bus.subscribe(
+                        "updates", lambda m, w=worker: received.append((w, m))
+                    )
+
+                # Calls run on the worker they are addressed to
+                self.assertEqual((1, "get"), buses[0].call(1, "get", 7))
+                self.assertEqual((0, "get"), buses[1].call(0, "get", 7))
+
+                # Messages are received by every worker, including the publisher
+                buses[0].publish("updates", {"id": 1})
+                self.assertCountEqual([(0, {"id": 1}), (1, {"id": 1})], received)
+
+    def test_socket_bus_publish(self) -> None:
+        addresses = [("localhost", free_port()) for _ in range(2)]
+        buses = [SocketBus(addresses, b"key") for _ in range(2)]
+        threads: list[tuple[int, bool]] = []
+        for worker, bus in enumerate(buses):
+            bus.serve(worker, lambda method, payload: None)
+            bus.subscribe(
+                "updates",
+                lambda m, w=worker: threads.append((w, current_thread() is thread)),
+            )
+
+        # Publishers deliver to their own subscribers directly, without a request
+        thread = current_thread()
+        buses[0].publish("updates", {"id": 1})
+        self.assertCountEqual([(0, True), (1, False)], threads)
+
+    def test_bus_errors(self) -> None:
+        addresses = [("localhost", free_port())]
+        for name, bus in [
+            ("local", LocalBus()),
+            ("socket", SocketBus(addresses, b"key")),
+        ]:
+            with self.subTest(name):
+                bus.serve(0, lambda method, payload: 1 // payload)
+                self.assertRaises(ZeroDivisionError, bus.call, 0, "get", 0)
+                self.assertEqual(1, bus.call(0, "get", 1))
+
+    def test_socket_bus_key(self) -> None:
+        addresses = [("localhost", free_port())]
+        SocketBus(addresses, b"key").serve(0, lambda method, payload: payload)
+
+        # Connections with another key are closed before any message is read
+        self.assertRaises(EOFError, SocketBus(addresses, b"other").call, 0, "get", 1)
+        self.assertEqual(1, SocketBus(addresses, b"key").call(0, "get", 1))
+
+    def test_socket_bus_malformed(self) -> None:
+        addresses = [("localhost", free_port())]
+        SocketBus(addresses, b"key").serve(0, lambda method, payload: payload)
+
+        # Connections sending a message that cannot be unpickled are closed
+        channel = _Channel(socket.create_connection(addresses[0]))
+        channel.send_bytes(hmac.digest(b"key", channel.recv_bytes(), "sha256"))
+        channel.send_bytes(b"not a pickle")
+        self.assertRaises(EOFError, channel.recv_bytes)
+        channel.close()
+
+        # Messages cut short by a closed connection are not received
+        left, right = socket.socketpair()
+        left.sendall(_Channel.HEADER.pack(8) + b"cut")
+        left.close()
+        channel = _Channel(right)
+        self.assertRaises(EOFError, channel.recv_bytes)
+        channel.close()
+
+
+class WorkerTests(TestCase):
+    def test_match_affinity(self) -> None:
+        bus = LocalBus()
+        workers = [MatchService(2, worker, 2, bus) for worker in range(2)]
+
+        # Ids encode the worker that created the match
+        ids = [[s.create({"seats": 4}).json()["id"] for _ in range(3)] for s in workers]
+        self.assertListEqual([[0, 2, 4], [1, 3, 5]], ids)
+
+        # Either worker serves every match, with the state of its owner
+        for match_id in [0, 1]:
+            for pid in range(4):
+                payload = {"matchId": match_id, "playerName": f"Player{pid}"}
+                event = JoinEvent(f"sid{pid}", payload)
+                updates = list(workers[pid % 2].join(event) or [])
+                self.assertIn("join", [update.name for update in updates])
+            self.assertEqual(4, len(workers[1 - match_id].get(match_id)["players"]))
+        self.assertIsNone(workers[0].get(7))
+
+        # Updates of forwarded events are serialized by the owner and addressed to
+        # the socket that sent them
+        names = []
+        for pid in range(4):
+            payload = {"matchId": 1, "playerId": pid}
+            for update in workers[0].draw(PlayerEvent(f"sid{pid}", payload)) or []:
+                self.assertIsInstance(update.info, ForwardedUpdate)
+                self.assertIn(update.to, [f"sid{pid}", "1"])
+                names.append(update.name)
+        self.assertIn("draw", names)
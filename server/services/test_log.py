@@ -0,0 +1,121 @@
+import os
+import os.path as PATH
+import pickle
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from abstractions import JoinEvent, PlayerEvent
+from services.log import MatchLog
+from services.match import MatchService
+
+
+# Under gevent, a heartbeat greenlet keeps running while the log syncs slow writes.
+# Run in its own process, as patching affects the whole process.
+GEVENT = """
+from gevent import monkey
+
+monkey.patch_all()
+
+import os
+import sys
+import gevent
+from services.log import MatchLog
+from services.match import MatchService
+
+sleep = monkey.get_original("time", "sleep")
+os.fsync = lambda fd: sleep(0.5)
+beats = []
+gevent.spawn(lambda: [(beats.append(0), gevent.sleep(0.01)) for _ in range(100)])
+gevent.sleep(0)
+MatchService(2, log=MatchLog(sys.argv[1])).create({"seats": 4})
+print(len(beats))
+"""
+
+
+# Updates of the given number of events of the player and bots of the match
+def resume(service: MatchService, match_id: int, events: int) -> list[tuple]:
+    payload = {"matchId": match_id, "playerId": 0}
+    updates = []
+    for _ in range(events):
+        room = service.act(match_id) or service.draw(PlayerEvent("sid", payload))
+        updates += [(u.name, u.to, u.json()) for u in room or []]
+    return updates
+
+
+# Service of a log in the directory, with matches of a player and bots drawing the
+# given number of events
+def play(directory: str, matches: int, events: int, snapshot=500) -> MatchService:
+    service = MatchService(2, log=MatchLog(directory, False, snapshot))
+    for seed in range(matches):
+        match_id = service.create({"seats": 4, "bots": 3}, seed).json()["id"]
+        service.join(JoinEvent("sid", {"matchId": match_id, "playerName": "Player"}))
+        resume(service, match_id, events)
+    return service
+
+
+class MatchLogTests(TestCase):
+    def test_recovery(self) -> None:
+        for name, matches, events, snapshot, processes in [
+            ("log", 3, 60, 500, 1),
+            ("snapshots", 3, 100, 25, 1),
+            ("processes", 2 * MatchLog.CHUNK, 5, 500, 2),
+        ]:
+            with self.subTest(name), TemporaryDirectory() as directory:
+                service = play(directory, matches, events, snapshot)
+                log = MatchLog(directory, False, snapshot, processes)
+                recovered = MatchService(2, log=log)
+
+                # Recovered matches continue as if there was no crash
+                for match_id in range(matches):
+                    expected = service.get(match_id), resume(service, match_id, 5)
+                    actual = recovered.get(match_id), resume(recovered, match_id, 5)
+                    self.assertEqual(expected, actual)
+
+                # Matches created after recovery get new ids
+                self.assertEqual(matches, recovered.create({"seats": 4}).json()["id"])
+
+    def test_snapshot_compacts_log(self) -> None:
+        with TemporaryDirectory() as directory:
+            play(directory, 1, 100, 25)
+            self.assertTrue(PATH.exists(PATH.join(directory, "0.snap")))
+            with open(PATH.join(directory, "0.snap"), "rb") as file:
+                seq, _ = pickle.load(file)
+            self.assertGreaterEqual(seq, 75)
+
+            # Only the records after the snapshot remain in the log
+            records = os.path.getsize(PATH.join(directory, "0.wal"))
+            self.assertLess(records, os.path.getsize(PATH.join(directory, "0.snap")))
+
+    def test_torn_record(self) -> None:
+        with TemporaryDirectory() as directory:
+            service = play(directory, 1, 30)
+
+            # A crash while writing a record leaves a partial record at the end
+            with open(PATH.join(directory, "0.wal"), "ab") as file:
+                file.write(b"\x00\x00\x01\x00\x12\x34")
+            recovered = MatchService(2, log=MatchLog(directory, False))
+            self.assertEqual(resume(service, 0, 10), resume(recovered, 0, 10))
+
+    def test_gevent(self) -> None:
+        with TemporaryDirectory() as directory:
+            beats = subprocess.run(
+                [sys.executable, "-c", GEVENT, directory],
+                capture_output=True,
+                check=True,
+                text=True,
+                cwd=PATH.dirname(PATH.dirname(__file__)),
+            ).stdout
+            self.assertGreater(int(beats), 10)
+
+    def test_failed_writes(self) -> None:
+        with TemporaryDirectory() as directory:
+            path = PATH.join(directory, "log")
+            service = MatchService(2, log=MatchLog(path, False))
+
+            # Writes to a removed directory fail, syncs raise rather than wait
+            os.rmdir(path)
+            with self.assertLogs(level="ERROR"):
+                self.assertRaises(RuntimeError, service.create, {"seats": 4})
+            self.assertRaises(RuntimeError, service.create, {"seats": 4})
@@ -0,0 +1,55 @@
+from threading import Thread
+from unittest import TestCase
+
+from abstractions import JoinEvent, PlayerEvent
+from core.match import Match, MatchSettings
+from services.match import MatchService
+
+
+class MatchServiceTests(TestCase):
+    def test_concurrent_events(self) -> None:
+        service = MatchService(4)
+        match_id = service.create({"seats": 4}, 0).json()["id"]
+        for pid in range(4):
+            payload = {"matchId": match_id, "playerName": f"Player{pid}"}
+            service.join(JoinEvent(f"sid{pid}", payload))
+
+        # Every player keeps drawing, also out of turn, until the deck is drawn
+        drawn = [0] * 4
+
+        def draw(pid: int) -> None:
+            payload = {"matchId": match_id, "playerId": pid}
+            for _ in range(10_000):
+                if sum(drawn) == 108:
+                    return
+                for update in service.draw(PlayerEvent(f"sid{pid}", payload)) or []:
+                    if update.name == "draw" and not update.cast:
+                        drawn[pid] += len(update.info.cards)
+
+        threads = [Thread(target=draw, args=(pid,)) for pid in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Draws on turn are processed once each: 25 cards each and the kitty
+        self.assertListEqual([25, 25, 25, 33], sorted(drawn))
+
+    def test_seed_not_from_settings(self) -> None:
+        # Settings come from players, who must not be able to choose the deck
+        settings = MatchSettings({"seats": 4, "seed": 0})
+        self.assertNotEqual(Match(0, settings).seed, Match(1, settings).seed)
+        self.assertEqual(7, Match(0, settings, 7).seed)
+
+    def test_think_time_bounds(self) -> None:
+        # Bots are driven by sleeping the think time, which must be a duration
+        for think_time, expected in [
+            (2.5, 2.5),
+            (-1, 0.0),
+            (1e9, 60.0),
+            ("nan", 1.0),
+            ("inf", 1.0),
+        ]:
+            with self.subTest(think_time=think_time):
+                settings = MatchSettings({"thinkTime": think_time})
+                self.assertEqual(expected, settings.think_time)
@@ -0,0 +1,143 @@
+from random import Random
+from time import perf_counter_ns
+from typing import Callable
+
+from abstractions import (
+    Cards,
+    CardsEvent,
+    Event,
+    JoinEvent,
+    PlayerError,
+    PlayerEvent,
+    Room,
+    Update,
+)
+from core import Player
+from core.game import Game
+from core.match import Match, MatchSettings
+from core.updates import GamePhase, MatchPhase
+from simulation.policies import POLICIES
+
+PHASES = ["draw", "bid", "kitty", "play", "next"]
+
+
+# Counts and timings of simulated matches, merged across workers
+class Stats:
+    def __init__(self) -> None:
+        self.matches = 0
+        self.games = 0
+        self.updates = 0
+        # Events and nanoseconds spent in match calls of each phase
+        self.events = {phase: 0 for phase in PHASES}
+        self.elapsed = {phase: 0 for phase in PHASES}
+        # Decisions of policies and nanoseconds spent making them
+        self.decisions = 0
+        self.thinking = 0
+        # Sampled updates as sent to players
+        self.samples: list[tuple[str, dict]] = []
+
+    def merge(self, other: "Stats") -> None:
+        self.matches += other.matches
+        self.games += other.games
+        self.updates += other.updates
+        for phase in PHASES:
+            self.events[phase] += other.events[phase]
+            self.elapsed[phase] += other.elapsed[phase]
+        self.decisions += other.decisions
+        self.thinking += other.thinking
+        self.samples.extend(other.samples)
+
+    def json(self) -> dict:
+        return {
+            "matches": self.matches,
+            "games": self.games,
+            "updates": self.updates,
+            "events": self.events,
+            "elapsed": self.elapsed,
+            "decisions": self.decisions,
+            "thinking": self.thinking,
+        }
+
+
+# Room that discards updates, keeping a sample of them serialized
+class SimulationRoom(Room):
+    def __init__(self, event: Event, stats: Stats, rate: float, rng: Random) -> None:
+        super().__init__(event)
+        self.__stats = stats
+        self.__rate = rate
+        self.__rng = rng
+
+    def __add(self, name: str, update: Update) -> None:
+        self.__stats.updates += 1
+        if self.__rate and self.__rng.random() < self.__rate:
+            self.__stats.samples.append((name, update.json()))
+
+    def reply(self, name: str, update: Update) -> None:
+        self.__add(name, update)
+
+    def secret(self, name: str, update: Update) -> None:
+        self.__add(name, update)
+
+    def public(self, name: str, update: Update) -> None:
+        self.__add(name, update)
+
+
+# Play a match to the end, or to the given number of games, with every seat
+# played by the named policy. Matches are reproducible from the seed.
+def simulate(
+    seed: int, policy: str, seats: int = 4, rate: float = 0.0, games: int = 0
+) -> Stats:
+    stats, rng = Stats(), Random(seed)
+    match = Match(0, MatchSettings({"seats": seats}), seed)
+    room = SimulationRoom(Event("", {"matchId": 0}), stats, rate, rng)
+
+    def call(phase: str, method: Callable, event: Event) -> None:
+        start = perf_counter_ns()
+        try:
+            method(event, room)
+        finally:
+            stats.elapsed[phase] += perf_counter_ns() - start
+            stats.events[phase] += 1
+
+    def decide(method: Callable[[Game, Player], Cards], pid: int) -> Cards:
+        start = perf_counter_ns()
+        try:
+            return method(game, match.players[pid])
+        finally:
+            stats.thinking += perf_counter_ns() - start
+            stats.decisions += 1
+
+    for i in range(seats):
+        match.join(JoinEvent("", {"matchId": 0, "playerName": f"Bot{i}"}), room)
+    policies = {p.pid: POLICIES[policy](Random(rng.random())) for p in match.players}
+
+    while match.phase != MatchPhase.ENDED and not (games and stats.games == games):
+        if (game := match.game) is None:
+            break
+        pid = game.active_pid
+        payload = {"matchId": 0, "playerId": pid}
+
+        if game.phase == GamePhase.DRAW:
+            call("draw", match.draw, PlayerEvent("", payload))
+            if cards := decide(policies[pid].bid, pid):
+                payload["cards"] = [card.json() for card in cards]
+                try:
+                    call("bid", match.bid, CardsEvent("", payload))
+                except PlayerError:
+                    pass
+        elif game.phase == GamePhase.KITTY:
+            cards = decide(policies[pid].kitty, pid)
+            payload["cards"] = [card.json() for card in cards]
+            call("kitty", match.kitty, CardsEvent("", payload))
+        elif game.phase == GamePhase.PLAY:
+            cards = decide(policies[pid].play, pid)
+            payload["cards"] = [card.json() for card in cards]
+            call("play", match.play, CardsEvent("", payload))
+            stats.games += game.phase == GamePhase.END
+        else:
+            for other in match.players:
+                event = PlayerEvent("", {"matchId": 0, "playerId": other.pid})
+                call("next", match.next, event)
+
+    stats.matches += 1
+    return stats
@@ -0,0 +1,58 @@
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from os import cpu_count
+from time import perf_counter
+
+from simulation import PHASES, Stats, simulate
+from simulation.policies import POLICIES
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Headless simulation of complete matches.")
+    parser.add_argument("--matches", type=int, default=100, help="Matches to play.")
+    parser.add_argument("--workers", type=int, default=cpu_count(), help="Processes.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first match.")
+    parser.add_argument("--seats", type=int, default=4, help="Players per match.")
+    parser.add_argument("--games", type=int, default=0, help="Games per match cap.")
+    parser.add_argument("--policy", choices=list(POLICIES), default="random")
+    parser.add_argument(
+        "--sample", type=float, default=0.0, help="Fraction of updates kept."
+    )
+    args = parser.parse_args()
+
+    stats = Stats()
+    start = perf_counter()
+    play = partial(
+        simulate,
+        policy=args.policy,
+        seats=args.seats,
+        rate=args.sample,
+        games=args.games,
+    )
+    with ProcessPoolExecutor(args.workers) as pool:
+        seeds = range(args.seed, args.seed + args.matches)
+        chunksize = max(1, args.matches // (4 * (args.workers or 1)))
+        for result in pool.map(play, seeds, chunksize=chunksize):
+            stats.merge(result)
+    elapsed = perf_counter() - start
+
+    print(
+        f"{stats.matches} matches, {stats.games} games, {stats.updates} updates "
+        f"in {elapsed:.2f}s: {stats.games / elapsed:.1f} games/s "
+        f"with {args.workers} workers"
+    )
+    total = sum(stats.elapsed.values()) or 1
+    for phase in PHASES:
+        events, elapsed_ns = stats.events[phase], stats.elapsed[phase]
+        mean = elapsed_ns / events / 1000 if events else 0
+        print(
+            f"{phase:>6}: {events} events, {mean:.1f}us per event, "
+            f"{100 * elapsed_ns / total:.1f}% of engine time"
+        )
+    if stats.decisions:
+        print(
+            f"{stats.decisions} policy decisions, "
+            f"{stats.thinking / stats.decisions / 1000:.1f}us per decision"
+        )
+    if stats.samples:
+        print(f"{len(stats.samples)} updates sampled, first: {stats.samples[0]}")
@@ -0,0 +1,79 @@
+from abc import ABC, abstractmethod
+from random import Random
+
+from abstractions import Cards
+from core import KITTY_SIZE, Player, Trump
+from core.bots import Bot
+from core.game import Game
+
+
+# Decides the actions of a simulated player
+class Policy(ABC):
+    def __init__(self, rng: Random) -> None:
+        # Inputs
+        self._rng = rng
+
+    # Cards to bid after the player draws, if any
+    def bid(self, game: Game, player: Player) -> Cards:
+        drawn = player.hand[-1:]
+        return drawn if game.order.trump_type(drawn) == Trump.SINGLE else []
+
+    @abstractmethod
+    def kitty(self, game: Game, player: Player) -> Cards: ...
+
+    @abstractmethod
+    def play(self, game: Game, player: Player) -> Cards: ...
+
+    # Cards that can be played as a single: any card to lead, and cards in the lead
+    # suit to follow if the player has any
+    def _singles(self, game: Game, player: Player) -> Cards:
+        if (trick := game.trick) is None or (lead := trick.lead) is None:
+            return player.hand
+        cards = player.cards_in_suit(game.order, lead.suit, lead.trumps)
+        return list(cards) or player.hand
+
+
+# Bids every trump rank card drawn, discards and plays the lowest cards. Only single
+# cards are led, so every trick is played with single cards.
+class LowestPolicy(Policy):
+    def kitty(self, game: Game, player: Player) -> Cards:
+        return sorted(player.hand, key=game.order.of)[-KITTY_SIZE:]
+
+    def play(self, game: Game, player: Player) -> Cards:
+        return [max(self._singles(game, player), key=game.order.of)]
+
+
+# Bids some trump rank cards drawn, discards random cards and plays random legal plays
+class RandomPolicy(Policy):
+    def bid(self, game: Game, player: Player) -> Cards:
+        return super().bid(game, player) if self._rng.random() < 0.5 else []
+
+    def kitty(self, game: Game, player: Player) -> Cards:
+        return self._rng.sample(player.hand, KITTY_SIZE)
+
+    def play(self, game: Game, player: Player) -> Cards:
+        return game.legal(player.pid).sample(self._rng)
+
+
+# Decides like the bots of matches
+class BotPolicy(Policy):
+    def __init__(self, rng: Random) -> None:
+        super().__init__(rng)
+        # Private
+        self.__bot = Bot()
+
+    def bid(self, game: Game, player: Player) -> Cards:
+        return self.__bot.bid(game, player)
+
+    def kitty(self, game: Game, player: Player) -> Cards:
+        return self.__bot.kitty(game, player)
+
+    def play(self, game: Game, player: Player) -> Cards:
+        return self.__bot.play(game, player)
+
+
+POLICIES: dict[str, type[Policy]] = {
+    "lowest": LowestPolicy,
+    "random": RandomPolicy,
+    "bot": BotPolicy,
+}
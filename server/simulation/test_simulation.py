@@ -0,0 +1,34 @@
+from unittest import TestCase
+
+from simulation import simulate
+
+
+class SimulationTests(TestCase):
+    def test_simulate_game(self) -> None:
+        # Lowest plays single cards, random and bots also play pairs and tractors
+        for policy, singles in [("lowest", True), ("random", False), ("bot", False)]:
+            with self.subTest(policy):
+                stats = simulate(3, policy, games=1, rate=0.05)
+
+                self.assertEqual(1, stats.matches)
+                self.assertEqual(1, stats.games)
+                # Cards are drawn one by one then the kitty at once
+                self.assertEqual(101, stats.events["draw"])
+                self.assertEqual(singles, stats.events["play"] == 100)
+                self.assertEqual(1, stats.events["kitty"])
+                self.assertTrue(stats.samples)
+                # Policies decide bids after every draw, the kitty and plays
+                decisions = sum(stats.events[p] for p in ["draw", "kitty", "play"])
+                self.assertEqual(decisions, stats.decisions)
+
+                # Matches are reproducible from the seed
+                other = simulate(3, policy, games=1, rate=0.05)
+                self.assertDictEqual(
+                    stats.json(),
+                    {
+                        **other.json(),
+                        "elapsed": stats.elapsed,
+                        "thinking": stats.thinking,
+                    },
+                )
+                self.assertListEqual(stats.samples, other.samples)
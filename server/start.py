@@ -1,11 +1,4 @@
-import logging
-import os.path as PATH
 from argparse import ArgumentParser
-from os import environ as ENV
-
-from servers.http import init_http
-from servers.socket import init_sockets
-from services.match import MatchService
 
 if __name__ == "__main__":
     # Server configuration
@@ -18,24 +11,88 @@ if __name__ == "__main__":
         required=False,
         help="If set, print detailed debug logging.",
     )
+    parser.add_argument(
+        "--async-mode",
+        choices=["threading", "gevent"],
+        default="threading",
+        help="Werkzeug with a thread per socket for development, or gevent with "
+        "a greenlet per socket for production.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes of the deployment, each started separately "
+        "with its own --worker.",
+    )
+    parser.add_argument(
+        "--worker",
+        type=int,
+        default=0,
+        help="Index of this worker, which serves on PORT + worker and owns the "
+        "matches whose id modulo workers is its index.",
+    )
+    parser.add_argument(
+        "--bus-port",
+        type=int,
+        default=6001,
+        help="Workers connect to each other on localhost at BUS_PORT + worker, "
+        "authenticated with the BUS_KEY environment variable.",
+    )
+    parser.add_argument(
+        "--log",
+        metavar="DIRECTORY",
+        default=None,
+        help="If set, log the events of matches to the directory, and recover the "
+        "matches of its logs on start.",
+    )
     args = parser.parse_args()
 
+    # Greenlets only yield on patched blocking calls, so the standard library must
+    # be patched before anything else imports it
+    if args.async_mode == "gevent":
+        from gevent import monkey
+
+        monkey.patch_all()
+
+    import logging
+    import os.path as PATH
+    from os import environ as ENV
+
+    from servers.http import init_http
+    from servers.socket import init_sockets
+    from services.bus import SocketBus
+    from services.log import MatchLog
+    from services.match import MatchService
+
     logging.basicConfig(
         level=logging.DEBUG if args.debug else logging.INFO,
         format="%(asctime)s [%(levelname)s] {%(filename)s:%(lineno)d}: %(message)s",
     )
 
-    # Initialize services
-    match_service = MatchService()
+    # Initialize services. Workers forward the events of matches they do not own
+    # to their owner, and broadcast updates to the sockets of every worker.
+    bus = None
+    if args.workers > 1:
+        addresses = [("localhost", args.bus_port + i) for i in range(args.workers)]
+        bus = SocketBus(addresses, ENV["BUS_KEY"].encode())
+    log = None
+    if args.log is not None:
+        log = MatchLog(PATH.join(args.log, str(args.worker)))
+    match_service = MatchService(
+        worker=args.worker, workers=args.workers, bus=bus, log=log
+    )
 
     # Initialize servers
     http = init_http(
         match_service, PATH.join(PATH.dirname(PATH.abspath(__file__)), "build")
     )
 
-    socketio = init_sockets(http, match_service)
+    socketio = init_sockets(http, match_service, args.async_mode, bus)
 
     # Start servers
-    socketio.run(
-        http, host="0.0.0.0", port=ENV.get("PORT", 5001), allow_unsafe_werkzeug=True
-    )
+    port = int(ENV.get("PORT", 5001)) + args.worker
+    if args.async_mode == "threading":
+        socketio.run(http, host="0.0.0.0", port=port, allow_unsafe_werkzeug=True)
+    else:
+        socketio.run(http, host="0.0.0.0", port=port)
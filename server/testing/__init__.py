@@ -11,5 +11,5 @@ JB = "J1"
 def initialize(cards: list[str]) -> Cards:
     card_list = []
     for card in cards:
-        card_list.append(Card(len(card_list), Suit(card[0]), int(card[1:])))
+        card_list.append(Card.intern(len(card_list), Suit(card[0]), int(card[1:])))
     return card_list